@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+İstemci başlangıç süresi benchmark'ı: sunucu çalışırken Explorer'ın başlattığı
+"file_noter.py --view <yol>" sürecinin baştan sona süresini ölçer.
+
+  soğuk: bayt kodu önbelleği olmadan (__pycache__ silinmiş, -B), ilk kurulum gibi
+  sıcak: önbellek hazırken, normal kullanım
+
+Karşılaştırma için eski istemcinin ödediği ek yük de ölçülür: Tk/SQLite ve
+arayüz kodunu yükleyip init_db() çalıştırmak (import note_app).
+
+Kullanım: python benchmarks/bench_client_startup.py [--runs 20]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from bench_common import REPO_DIR
+import note_ipc
+
+LEGACY_IMPORTS = "import note_app, note_store; note_store.init_db()"
+
+
+def clear_bytecode():
+    shutil.rmtree(os.path.join(REPO_DIR, '__pycache__'), ignore_errors=True)
+
+
+def time_process(cmd, env, runs, cold):
+    timings = []
+    for _ in range(runs):
+        if cold:
+            clear_bytecode()
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, cwd=REPO_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label, timings):
+    print(f"{label:<34} p50={statistics.median(timings):7.1f} ms  min={min(timings):7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20, help="Ölçüm başına süreç sayısı")
+    args = parser.parse_args()
+
+    # İsteği kabul eden ama pencere açmayan süreç içi sunucu
+    server = note_ipc.IpcServer(lambda message: "queued", port=0)
+    server.bind()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as appdata:
+        env = dict(os.environ, FILENOTER_PORT=str(server.address[1]), APPDATA=appdata)
+        client = [sys.executable, 'file_noter.py', '--view', 'C:\\Belgeler\\rapor.docx']
+        legacy = [sys.executable, '-c', LEGACY_IMPORTS]
+        baseline = [sys.executable, '-c', 'pass']
+
+        report("python (boş süreç)", time_process(baseline, env, args.runs, cold=False))
+        report("istemci, soğuk", time_process(client, dict(env, PYTHONDONTWRITEBYTECODE='1'), args.runs, cold=True))
+        time_process(client, env, 1, cold=False) # Önbelleği ısıt
+        report("istemci, sıcak", time_process(client, env, args.runs, cold=False))
+        report("eski istemci yükü (Tk+SQLite), sıcak", time_process(legacy, env, args.runs, cold=False))
+    server.stop()
+
+
+if __name__ == '__main__':
+    main()
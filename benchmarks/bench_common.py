@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark'ların ortak yardımcıları: sentetik notlar, geçici veritabanı,
+süre/bellek ölçümü ve sürümler arasında karşılaştırılabilir JSON sonuçları.
+
+Sentetik notlar sabit tohumla üretilir; aynı parametreler her çalıştırmada
+aynı veritabanını kurar. Yol derinliği 1-8 klasör arasında değişir. Not
+boyları çoğunlukla kısadır (birkaç kelime); ~%20'si birkaç yüz kelime,
+~%1'i 4-64 KB'lık uzun notlardır.
+"""
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+import note_store
+
+SEED = 42
+WORDS = ("rapor", "fatura", "sözleşme", "proje", "taslak", "yedek", "müşteri", "toplantı",
+         "bütçe", "sunum", "arşiv", "görev", "teslim", "kontrol", "güncelleme", "ödeme")
+EXTENSIONS = (".txt", ".docx", ".xlsx", ".pdf", ".png", "")
+
+
+# --- Sentetik veri ---
+
+def synthetic_notes(count, seed=SEED):
+    """(dosya_yolu, not_metni, değiştirme_zamanı) üretir; belleğe liste kurmaz."""
+    rng = random.Random(seed)
+    for i in range(count):
+        folder = "\\".join(rng.choice(WORDS) for _ in range(rng.randint(1, 8)))
+        path = f"C:\\Users\\test\\{folder}\\dosya_{i}{rng.choice(EXTENSIONS)}"
+        size = rng.random()
+        words = rng.randint(3, 30) if size < 0.8 else rng.randint(50, 300)
+        text = " ".join(rng.choice(WORDS) for _ in range(words)) + f" {2000 + i % 25}"
+        if size > 0.99: # Uzun not: metin tekrarlanarak 4-64 KB'a büyütülür
+            text = (text + "\n") * max(1, rng.randint(4096, 65536) // len(text))
+        yield path, text, 1700000000.0 + i
+
+
+def populate(count, seed=SEED, sample=1000, batch_size=note_store.TRANSFER_BATCH):
+    """
+    Açık veritabanına 'count' sentetik not ekler (import_notes ile). Okuma
+    ölçümleri için eklenen yollardan rastgele 'sample' tanesini döndürür.
+    """
+    picker = random.Random(seed + 1)
+    picked = []
+
+    def rows():
+        for n, row in enumerate(synthetic_notes(count, seed)):
+            if len(picked) < sample:
+                picked.append(row[0])
+            else: # Rezervuar örnekleme: tüm yollar belleğe alınmaz
+                j = picker.randrange(n + 1)
+                if j < sample:
+                    picked[j] = row[0]
+            yield row
+
+    note_store.import_notes(rows(), 'skip', batch_size)
+    picker.shuffle(picked)
+    return picked
+
+
+@contextmanager
+def temp_store(name='bench.db'):
+    """Geçici klasörde boş bir not veritabanı açar; veritabanı yolunu verir, çıkışta siler."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, name)
+        note_store.set_db_path(db_path)
+        note_store.init_db()
+        try:
+            yield db_path
+        finally:
+            note_store.close_all()
+
+
+# --- Ölçüm ---
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def summarize(seconds):
+    """Süre listesinin (saniye) özeti, ms cinsinden."""
+    ms = [value * 1000 for value in seconds]
+    return {'count': len(ms), 'mean_ms': round(statistics.fmean(ms), 3), 'p50_ms': round(percentile(ms, 50), 3),
+            'p90_ms': round(percentile(ms, 90), 3), 'p99_ms': round(percentile(ms, 99), 3),
+            'max_ms': round(max(ms), 3)}
+
+
+def time_calls(func, repeat):
+    """func()'u 'repeat' kez çalıştırır; süre özetini döndürür."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def throughput(func, ops):
+    """func(i)'yi i=0..ops-1 için çağırır; saniyedeki işlem sayısını döndürür."""
+    start = time.perf_counter()
+    for i in range(ops):
+        func(i)
+    return round(ops / (time.perf_counter() - start), 1)
+
+
+def peak_memory(func):
+    """func()'u tracemalloc açıkken bir kez çalıştırır; Python tarafı tepe bellek (MB)."""
+    tracemalloc.start()
+    try:
+        func()
+        return round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+    finally:
+        tracemalloc.stop()
+
+
+# --- Sonuç dosyaları ---
+
+def environment():
+    """Sonuçların hangi sürüm ve ortamda alındığı."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': commit, 'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version, 'platform': platform.platform(), 'fts5': note_store.HAS_FTS}
+
+
+def write_results(path, params, results):
+    """Sonuçları ortam bilgisiyle JSON olarak yazar."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'params': params, 'results': results}, f,
+                  ensure_ascii=False, indent=1)
+
+
+def _flatten(value, prefix=""):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, value
+
+
+def compare(base_path, results):
+    """Önceki bir sonuç dosyasıyla ortak sayısal ölçümleri yan yana yazdırır."""
+    with open(base_path, encoding='utf-8') as f:
+        base = json.load(f)
+    old = dict(_flatten(base['results']))
+    print(f"\nKarşılaştırma: {base_path} ({base['environment'].get('commit')})")
+    print(f"{'ölçüm':<52} {'önce':>12} {'şimdi':>12} {'fark':>8}")
+    for name, value in _flatten(results):
+        if name in old and not name.endswith('.count'):
+            change = f"{(value - old[name]) / old[name] * 100:+.0f}%" if old[name] else ""
+            print(f"{name:<52} {old[name]:>12} {value:>12} {change:>8}")
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Büyük not metinlerinin sıkıştırılması (note_blob + codec) için boyut/hız benchmark'ı.
+
+Sentetik veritabanı (bkz. bench_common.synthetic_notes) önce sıkıştırma kapalıyken
+kurulur ve ölçülür; sonra göçün yaptığı gibi compress_notes() ile mevcut büyük
+notlar parça parça sıkıştırılır ve aynı ölçümler tekrarlanır (burada FTS dizini
+varken; gerçek göçte dizin sıkıştırmadan sonra kurulur, bu yüzden göç daha hızlıdır).
+Her codec ayrı bir veritabanında denenir.
+
+Ölçülenler: veritabanının dolu sayfa boyutu, uzun/kısa not okuma (get_note) hızı,
+get_all_notes süresi, compress_notes hızı ve uzun not kaydetme hızı. Göçün
+doğruluğu tests/test_migrations.py'de denetlenir.
+
+Kullanım:
+    python benchmarks/bench_compression.py [--count 10000] [--codecs zlib,lzma] [--output sonuc.json]
+"""
+import argparse
+import json
+import sys
+import time
+
+import bench_common
+import note_store
+
+SAMPLE = 1000 # Okuma ölçümlerinde kullanılan yol sayısı
+
+
+def used_mb(conn):
+    """Veritabanında dolu sayfaların boyutu (boş sayfalar VACUUM'a kadar dosyada kalır)."""
+    page_size, pages, free = (conn.execute(f"PRAGMA {name}").fetchone()[0]
+                              for name in ('page_size', 'page_count', 'freelist_count'))
+    return round(page_size * (pages - free) / 1024 / 1024, 2)
+
+
+def measure(long_paths, short_paths, ops, repeat):
+    conn = note_store.get_connection()
+    return {
+        'db_used_mb': used_mb(conn),
+        'compressed_notes': conn.execute("SELECT count(*) FROM notes WHERE codec != 0").fetchone()[0],
+        'get_long_note_ops_s': bench_common.throughput(
+            lambda i: note_store.get_note(long_paths[i % len(long_paths)]), ops),
+        'get_short_note_ops_s': bench_common.throughput(
+            lambda i: note_store.get_note(short_paths[i % len(short_paths)]), ops),
+        'list_notes': bench_common.time_calls(note_store.list_notes, repeat),
+        'get_all_notes': bench_common.time_calls(note_store.get_all_notes, repeat),
+    }
+
+
+def run_codec(codec, args):
+    note_store.COMPRESS_THRESHOLD = sys.maxsize # Doldururken kapalı: eski (düz metin) veritabanı
+    with bench_common.temp_store(f"bench_compression_{codec}.db"):
+        bench_common.populate(args.count, args.seed, sample=0)
+        conn = note_store.get_connection()
+        long_paths = [row[0] for row in conn.execute(
+            "SELECT file_path FROM notes WHERE note_size > ? ORDER BY id LIMIT ?", (args.threshold, SAMPLE))]
+        short_paths = [row[0] for row in conn.execute(
+            "SELECT file_path FROM notes WHERE note_size <= ? ORDER BY id LIMIT ?", (args.threshold, SAMPLE))]
+        if not long_paths:
+            return {'skipped': f"{args.threshold} bayttan uzun not yok (--count'u artırın)"}
+        result = {'long_notes': conn.execute("SELECT count(*) FROM notes WHERE note_size > ?",
+                                             (args.threshold,)).fetchone()[0]}
+        result['plain'] = measure(long_paths, short_paths, args.ops, args.repeat)
+
+        note_store.COMPRESS_THRESHOLD = args.threshold
+        note_store.COMPRESS_CODEC = codec
+        start = time.perf_counter()
+        compressed = note_store.compress_notes(args.batch_size)
+        elapsed = time.perf_counter() - start
+        result['migration'] = {'notes': compressed, 'seconds': round(elapsed, 3),
+                               'notes_per_s': round(compressed / elapsed, 1) if elapsed else None}
+        result['compressed'] = measure(long_paths, short_paths, args.ops, args.repeat)
+
+        text = note_store.get_note(long_paths[0])
+        result['save_long_note_ops_s'] = bench_common.throughput(
+            lambda i: note_store.save_note(long_paths[i % len(long_paths)], text + str(i)), args.ops // 10 or 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=10000, help="Sentetik not sayısı")
+    parser.add_argument('--codecs', default="zlib,lzma", help=f"Virgülle ayrılmış ({', '.join(note_store.CODECS)})")
+    parser.add_argument('--threshold', type=int, default=note_store.COMPRESS_THRESHOLD,
+                        help="Sıkıştırma eşiği (UTF-8 bayt)")
+    parser.add_argument('--batch-size', type=int, default=note_store.TRANSFER_BATCH, help="Göçte grup boyu")
+    parser.add_argument('--ops', type=int, default=2000, help="Hız ölçümlerinde işlem sayısı")
+    parser.add_argument('--repeat', type=int, default=3, help="Liste ölçümlerinde tekrar")
+    parser.add_argument('--seed', type=int, default=bench_common.SEED, help="Sentetik veri tohumu")
+    parser.add_argument('--output', metavar='DOSYA', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    results = {}
+    for codec in (name.strip() for name in args.codecs.split(",") if name.strip()):
+        print(f"{codec}:", flush=True)
+        results[codec] = run_codec(codec, args)
+        print(f"  {json.dumps(results[codec], ensure_ascii=False)}", flush=True)
+
+    if args.output:
+        bench_common.write_results(args.output, vars(args), results)
+        print(f"Sonuçlar yazıldı: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
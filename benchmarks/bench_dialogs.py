@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Not penceresi açılış gecikmesi benchmark'ı: isteğin sunucuya gelişinden not
+ekleme/görüntüleme penceresinin ekranda görünmesine (<Map>) kadar geçen süre.
+
+Aynı ölçüm önce pencere havuzu kapalıyken (DIALOG_POOL_SIZE = 0, her istekte
+pencere baştan kurulur) sonra havuz açıkken yapılır. --view gerçek istek
+işleyicisinden (handle_request) geçer; GUI kuyruğunun GUI_POLL_MS'lik bekleme
+süresi de dahildir. --add penceresi aynı kuyruktan açılır, ancak istekleri
+toplayan ADD_BATCH_WINDOW_MS beklemesi hariç tutulur. Pencere görünür görünmez
+ölçülür; notun yüklenmesi (ui.*_dialog_open) ayrıca raporlanır. Sonda iki
+ölçümün p50/p99 değerleri yan yana (önce -> sonra) tablo olarak yazdırılır.
+
+Ekran gerekir: Linux'ta DISPLAY yoksa Xvfb varsa başlatılır, o da yoksa atlanır.
+
+Kullanım:
+    python benchmarks/bench_dialogs.py [--repeat 50] [--pool-size 2] [--output sonuc.json]
+"""
+import argparse
+import json
+import time
+
+import bench_common
+import bench_suite
+import note_stats
+import note_store
+
+WAIT_TIMEOUT = 30.0 # Bir pencerenin görünmesi/yüklenmesi için en fazla bekleme (sn)
+
+
+def _count(name):
+    return note_stats.snapshot()['timings'].get(name, {}).get('count', 0)
+
+
+def _open_dialogs(root):
+    import tkinter as tk
+    return [child for child in root.winfo_children() if isinstance(child, tk.Toplevel) and child.winfo_ismapped()]
+
+
+def _reset_pools(root, size):
+    """Havuzları boşaltır ve 'size' kadar pencereyle (sunucu açılışındaki gibi) yeniden doldurur."""
+    import note_app
+    note_app.DIALOG_POOL_SIZE = size
+    for pool in note_app.dialog_pools.values():
+        while pool:
+            pool.pop().destroy()
+    started = time.perf_counter()
+    for kind, pool in note_app.dialog_pools.items():
+        while len(pool) < size:
+            pool.append(note_app.DIALOG_BUILDERS[kind](root))
+    root.update()
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def measure(root, kind, paths, repeat):
+    """Pencereyi 'repeat' kez açıp kapatır; görünme ve yüklenme sürelerinin özetini döndürür."""
+    import note_app
+
+    def wait_for(name, done):
+        deadline = time.perf_counter() + WAIT_TIMEOUT
+        while _count(name) < done:
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"{name} zaman aşımına uğradı")
+            root.update()
+            time.sleep(0.001)
+
+    note_stats.reset()
+    for i in range(repeat):
+        path = paths[i % len(paths)]
+        if kind == 'view':
+            note_app.handle_request({'action': '--view', 'file_path': path}) # IPC thread'inin yaptığı
+        else:
+            note_app.gui_queue.put((note_app.show_add_note_dialog_internal, (root, path, time.perf_counter())))
+        wait_for(f'ui.{kind}_dialog_visible', i + 1)
+        wait_for(f'ui.{kind}_dialog_open', i + 1)
+        for dialog in _open_dialogs(root):
+            root.tk.eval(dialog.protocol("WM_DELETE_WINDOW")) # Kullanıcının kapatması gibi
+        root.update()
+    timings = note_stats.snapshot()['timings']
+    return {'visible': timings[f'ui.{kind}_dialog_visible'], 'loaded': timings[f'ui.{kind}_dialog_open']}
+
+
+def print_comparison(results):
+    """Havuzsuz (önce) ve havuzlu (sonra) p50/p99 sürelerini tablo olarak yazdırır."""
+    before, after = results['no_pool'], results['pool']
+    print("ölçüm\tp50_ms önce -> sonra\tp99_ms önce -> sonra")
+    for kind in ('view', 'add'):
+        for stage in ('visible', 'loaded'):
+            old, new = before[kind][stage], after[kind][stage]
+            print(f"ui.{kind}_dialog_{stage}\t{old['p50_ms']} -> {new['p50_ms']}\t{old['p99_ms']} -> {new['p99_ms']}")
+
+
+def run(args):
+    import tkinter as tk
+    import note_app
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        return {'skipped': f"Tk açılamadı: {e}"}
+    root.withdraw()
+    note_app.setup_styles(root)
+    note_app.app_root = root
+    note_app.shutdown_event.clear()
+    note_app.process_gui_queue() # DB sonuçlarını ve istekleri Tk thread'ine taşıyan döngü
+    results = {}
+    try:
+        with bench_common.temp_store("bench_dialogs.db"):
+            paths = bench_common.populate(args.count, args.seed)
+            note_store.noted_paths.load()
+            for label, size in (('no_pool', 0), ('pool', args.pool_size)):
+                result = {'pool_size': size, 'pool_fill_ms': _reset_pools(root, size)}
+                for kind in ('view', 'add'):
+                    result[kind] = measure(root, kind, paths, args.repeat)
+                results[label] = result
+                print(f"  {label}: {json.dumps(result, ensure_ascii=False)}", flush=True)
+            _reset_pools(root, 0)
+    finally:
+        note_app.stop_db_worker()
+        note_app.shutdown_event.set() # process_gui_queue kendini yeniden kurmasın
+        note_app.app_root = None
+        root.destroy()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=1000, help="Sentetik not sayısı")
+    parser.add_argument('--repeat', type=int, default=50, help="Pencere türü başına açılış sayısı")
+    parser.add_argument('--pool-size', type=int, default=2, help="Havuz açıkken tür başına pencere")
+    parser.add_argument('--seed', type=int, default=bench_common.SEED, help="Sentetik veri tohumu")
+    parser.add_argument('--output', metavar='DOSYA', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    display, skip_reason = bench_suite.start_display()
+    try:
+        results = {'skipped': skip_reason} if skip_reason else run(args)
+    finally:
+        if display is not None:
+            display.terminate()
+    if 'skipped' in results:
+        print(f"Atlanıyor: {results['skipped']}")
+    else:
+        print_comparison(results)
+
+    if args.output:
+        bench_common.write_results(args.output, vars(args), results)
+        print(f"Sonuçlar yazıldı: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+IPC yük testi: çok sayıda eş zamanlı istemciyle sunucuya istek gönderir,
+saniyedeki kabul edilen istek sayısını ve gecikme yüzdeliklerini ölçer.
+
+Varsayılan olarak süreç içinde, gerçek protokolü konuşan ama GUI açmayan bir
+note_ipc.IpcServer başlatılır. --port verilirse çalışan bir FileNoter sunucusu
+hedeflenir (o durumda --action --has-note gibi GUI açmayan bir eylem seçin).
+
+Kullanım:
+    python benchmarks/bench_ipc_load.py [--clients 500] [--requests 20] [--mode connect|persistent]
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+
+from bench_common import summarize
+import note_ipc
+
+
+async def run_client(host, port, action, requests, mode, latencies, failures):
+    """Explorer benzeri istemci: 'connect' modunda her istek için yeni bağlantı açar."""
+    reader = writer = None
+    for i in range(requests):
+        message = note_ipc.encode_message({'id': i + 1, 'action': action,
+                                           'file_path': f"C:\\yuk\\testi\\dosya_{i}.txt"})
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(message)
+            await writer.drain()
+            reply = json.loads(await reader.readline())
+            if not reply.get('ok'):
+                failures.append(reply.get('error'))
+        except (OSError, ValueError) as e:
+            failures.append(str(e))
+            writer = None
+            continue
+        latencies.append(time.perf_counter() - start)
+        if mode == 'connect':
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(host, port, action, clients, requests, mode):
+    latencies, failures = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, action, requests, mode, latencies, failures)
+                           for _ in range(clients)))
+    return latencies, failures, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=500, help="Eş zamanlı istemci sayısı")
+    parser.add_argument('--requests', type=int, default=20, help="İstemci başına istek sayısı")
+    parser.add_argument('--mode', choices=('connect', 'persistent'), default='connect',
+                        help="connect: her istek yeni bağlantı (Explorer), persistent: tek bağlantı")
+    parser.add_argument('--backlog', type=int, default=note_ipc.LISTEN_BACKLOG, help="Dinleme kuyruğu")
+    parser.add_argument('--port', type=int, help="Çalışan sunucunun portu (verilmezse süreç içi sunucu)")
+    parser.add_argument('--action', default='--has-note', help="Gönderilecek eylem")
+    args = parser.parse_args()
+
+    server = None
+    host, port = note_ipc.HOST, args.port
+    if port is None:
+        # GUI yerine sabit yanıt veren handler: sunucu döngüsünün kendi maliyeti ölçülür
+        server = note_ipc.IpcServer(lambda message: False, port=0, backlog=args.backlog)
+        server.bind()
+        port = server.address[1]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    latencies, failures, elapsed = asyncio.run(
+        run_load(host, port, args.action, args.clients, args.requests, args.mode))
+    if server:
+        server.stop()
+
+    total = len(latencies)
+    print(f"istemci={args.clients} istek/istemci={args.requests} mod={args.mode} backlog={args.backlog}")
+    print(f"başarılı: {total}  başarısız: {len(failures)}  süre: {elapsed:.2f} sn")
+    if latencies:
+        summary = summarize(latencies)
+        print(f"verim: {total / elapsed:.0f} istek/sn")
+        print(f"gecikme ms  p50={summary['p50_ms']:.2f}  p99={summary['p99_ms']:.2f}  maks={summary['max_ms']:.2f}")
+    if failures:
+        print("ilk hatalar:", failures[:3])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Tam metin arama benchmark'ı: sentetik bir veritabanında note_store.search_notes
+gecikmesini ölçer (arama kutusunda yazarken yapılan önek aramaları).
+
+Kullanım: python benchmarks/bench_search.py [--notes 1000000] [--repeat 20]
+"""
+import argparse
+import time
+
+import bench_common # Sentetik notlar bench_common.WORDS kelimelerinden ve yıllardan oluşur
+import note_store
+
+# Yazarken oluşan önekler: kısa/uzun, tek ve çok kelimeli
+QUERIES = ("ra", "rap", "rapor", "fat", "söz", "proje tas", "müşteri öde", "arşiv 2019", "x9z")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--notes', type=int, default=1000000, help="Sentetik not sayısı")
+    parser.add_argument('--repeat', type=int, default=20, help="Sorgu başına tekrar")
+    args = parser.parse_args()
+
+    with bench_common.temp_store('search.db'):
+        start = time.perf_counter()
+        bench_common.populate(args.notes)
+        print(f"Doldurma: {time.perf_counter() - start:.1f} sn (FTS5: {note_store.HAS_FTS})\n")
+
+        print(f"{'sorgu':<14} {'sonuç':>6} {'p50 ms':>8} {'maks ms':>8}")
+        for query in QUERIES:
+            results = note_store.search_notes(query)
+            timings = bench_common.time_calls(lambda: note_store.search_notes(query), args.repeat)
+            print(f"{query:<14} {len(results):>6} {timings['p50_ms']:>8.2f} {timings['max_ms']:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
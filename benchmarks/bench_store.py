@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Not deposu benchmark'ı: her çağrıda bağlantı açıp kapatan eski yöntem ile
+note_store'un kalıcı (WAL) bağlantılarını karşılaştırır.
+
+Kullanım: python benchmarks/bench_store.py [--ops 2000]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+
+import bench_common
+import note_store
+
+
+def legacy_save(db_path, file_path, note_text):
+    """file_noter.py'nin eski kaydetme yöntemi: her çağrıda connect/commit/close."""
+    conn = sqlite3.connect(db_path, timeout=1.0)
+    try:
+        conn.execute("INSERT OR REPLACE INTO notes (file_path, note_text) VALUES (?, ?)",
+                     (file_path, note_text))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def legacy_get(db_path, file_path):
+    conn = sqlite3.connect(db_path, timeout=1.0)
+    try:
+        row = conn.execute("SELECT note_text FROM notes WHERE file_path = ?", (file_path,)).fetchone()
+        return row[0] if row else ""
+    finally:
+        conn.close()
+
+
+def measure(label, func, ops):
+    rate = bench_common.throughput(func, ops)
+    print(f"{label:<28} {rate:>10.0f} işlem/sn  ({ops / rate:.3f} sn)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--ops', type=int, default=2000, help="Ölçüm başına işlem sayısı")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, 'legacy.db')
+        conn = sqlite3.connect(legacy_db)
+        conn.execute("CREATE TABLE notes (file_path TEXT PRIMARY KEY, note_text TEXT)")
+        conn.close()
+
+        pooled_db = os.path.join(tmp, 'pooled.db')
+        note_store.set_db_path(pooled_db)
+        note_store.init_db()
+
+        path = lambda i: f"C:\\Users\\test\\Belgeler\\dosya_{i}.txt"
+        text = "Örnek not metni " * 8
+
+        old_save = measure("eski save (connect/kapat)", lambda i: legacy_save(legacy_db, path(i), text), args.ops)
+        new_save = measure("note_store.save_note", lambda i: note_store.save_note(path(i), text), args.ops)
+        old_get = measure("eski get (connect/kapat)", lambda i: legacy_get(legacy_db, path(i)), args.ops)
+        new_get = measure("note_store.get_note", lambda i: note_store.get_note(path(i)), args.ops)
+        note_store.close_all()
+
+    print(f"\nKaydetme hızlanması: {new_save / old_save:.1f}x, okuma hızlanması: {new_get / old_get:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
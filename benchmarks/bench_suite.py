@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Tekrarlanabilir benchmark takımı. Her boyut için sentetik bir veritabanı kurar
+(bkz. bench_common.synthetic_notes) ve şunları ölçer:
+
+  store  save_note / get_note / has_note hızı, save_note_texts toplu yazma
+  list   get_all_notes ve list_notes (Tüm Notlar listesi) süresi ve bellek tepesi
+  gui    AllNotesWindow.refresh_list süresi (ekran gerekir; Linux'ta DISPLAY
+         yoksa Xvfb varsa başlatılır, o da yoksa atlanır)
+  ipc    server_listener'a karşı gidiş-dönüş gecikmesi ve eş zamanlı istemci yükü
+
+Sonuçlar --output ile JSON olarak yazılır; --compare önceki bir sonuç
+dosyasıyla ortak ölçümleri yan yana gösterir.
+
+Kullanım:
+    python benchmarks/bench_suite.py [--sizes 1000,10000,100000] [--output sonuc.json]
+    python benchmarks/bench_suite.py --sizes 1000000 --skip gui,ipc --compare onceki.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+import bench_common
+import bench_ipc_load
+import note_ipc
+import note_stats
+import note_store
+
+PARTS = ('store', 'list', 'gui', 'ipc')
+GUI_WAIT_TIMEOUT = 120.0 # Bir liste yenilemesinin en fazla beklenme süresi (sn)
+
+
+def bench_store(paths, ops):
+    new_path = lambda i: f"C:\\Users\\test\\yeni\\dosya_{i}.txt"
+    text = "Örnek not metni " * 8
+    batch = {new_path(ops + i): text for i in range(1000)}
+    start = time.perf_counter()
+    note_store.save_note_texts(batch)
+    batch_elapsed = time.perf_counter() - start
+    return {
+        'save_note_new_ops_s': bench_common.throughput(lambda i: note_store.save_note(new_path(i), text), ops),
+        'save_note_update_ops_s': bench_common.throughput(
+            lambda i: note_store.save_note(paths[i % len(paths)], text + str(i)), ops),
+        'get_note_ops_s': bench_common.throughput(lambda i: note_store.get_note(paths[i % len(paths)]), ops),
+        'get_note_missing_ops_s': bench_common.throughput(lambda i: note_store.get_note(new_path(-i - 1)), ops),
+        'has_note_ops_s': bench_common.throughput(lambda i: note_store.has_note(paths[i % len(paths)]), ops),
+        'save_note_texts_1000_ms': round(batch_elapsed * 1000, 3),
+    }
+
+
+def bench_list(paths, repeat):
+    folder = os.path.dirname(paths[0])
+    return {
+        'get_all_notes': dict(bench_common.time_calls(note_store.get_all_notes, repeat),
+                              peak_mb=bench_common.peak_memory(note_store.get_all_notes)),
+        'list_notes': dict(bench_common.time_calls(note_store.list_notes, repeat),
+                           peak_mb=bench_common.peak_memory(note_store.list_notes)),
+        'list_folder_notes': bench_common.time_calls(lambda: note_store.list_folder_notes(folder), repeat),
+    }
+
+
+def start_display():
+    """
+    Tk için ekran hazırlar: Linux'ta DISPLAY yoksa ve Xvfb kuruluysa sanal ekran
+    başlatılır. (Xvfb süreci veya None, atlama nedeni veya None) döndürür.
+    """
+    if not sys.platform.startswith('linux') or os.environ.get('DISPLAY'):
+        return None, None
+    xvfb = shutil.which('Xvfb')
+    if not xvfb:
+        return None, "ekran yok (DISPLAY ayarlı değil ve Xvfb bulunamadı)"
+    display = f":{100 + os.getpid() % 400}"
+    process = subprocess.Popen([xvfb, display, '-screen', '0', '1280x1024x24', '-nolisten', 'tcp'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(50): # Sunucu soketi hazır olana kadar bekle
+        if os.path.exists(f"/tmp/.X11-unix/X{display[1:]}"):
+            break
+        time.sleep(0.1)
+    os.environ['DISPLAY'] = display
+    return process, None
+
+
+def _refresh_count():
+    return note_stats.snapshot()['timings'].get('ui.refresh_list', {}).get('count', 0)
+
+
+def bench_gui(repeat):
+    """AllNotesWindow'u açar ve refresh_list'i (DB thread'i + çizim dahil) 'repeat' kez ölçer."""
+    import tkinter as tk
+    import note_app
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        return {'skipped': f"Tk açılamadı: {e}"}
+    root.withdraw()
+    note_app.setup_styles(root)
+    note_app.app_root = root
+    note_app.shutdown_event.clear()
+    note_app.process_gui_queue() # DB sonuçlarını Tk thread'ine taşıyan döngü (GUI_POLL_MS'de bir)
+
+    def wait_for_refresh(done):
+        deadline = time.perf_counter() + GUI_WAIT_TIMEOUT
+        while _refresh_count() < done:
+            if time.perf_counter() > deadline:
+                raise TimeoutError("Liste yenilemesi zaman aşımına uğradı")
+            root.update()
+            time.sleep(0.001)
+
+    try:
+        note_stats.reset()
+        start = time.perf_counter()
+        window = note_app.AllNotesWindow(root)
+        wait_for_refresh(1)
+        open_ms = round((time.perf_counter() - start) * 1000, 3)
+        note_stats.reset()
+        for i in range(repeat):
+            window.refresh_list()
+            wait_for_refresh(i + 1)
+        result = dict(note_stats.snapshot()['timings']['ui.refresh_list'], window_open_ms=open_ms)
+        window.on_close()
+        return result
+    finally:
+        note_app.stop_db_worker()
+        note_app.shutdown_event.set() # process_gui_queue kendini yeniden kurmasın
+        note_app.all_notes_window = None
+        note_app.app_root = None
+        root.destroy()
+
+
+def bench_ipc(paths, repeat, clients, requests):
+    """Gerçek istek işleyicisiyle çalışan server_listener'a karşı istemci ölçümleri."""
+    import note_app
+    server = note_ipc.IpcServer(note_app.handle_request, port=0)
+    server.bind()
+    note_app.ipc_server = server
+    note_app.shutdown_event.clear()
+    thread = threading.Thread(target=note_app.server_listener, daemon=True)
+    thread.start()
+    port = server.address[1]
+    results = {}
+    try:
+        with note_ipc.IpcClient(port=port) as client:
+            for action in ('--has-note', '--get'):
+                timings = []
+                for i in range(repeat):
+                    start = time.perf_counter()
+                    client.request(action, file_path=paths[i % len(paths)])
+                    timings.append(time.perf_counter() - start)
+                results[f"round_trip_{action.lstrip('-')}"] = bench_common.summarize(timings)
+            listing = paths[:1000] # Explorer klasör listesi gibi tek toplu istek
+            results['has_note_batch_1000'] = bench_common.time_calls(
+                lambda: client.request("--has-note", file_paths=listing), max(1, repeat // 20))
+
+        latencies, failures, elapsed = asyncio.run(
+            bench_ipc_load.run_load(note_ipc.HOST, port, '--has-note', clients, requests, 'connect'))
+        results['burst'] = dict(bench_common.summarize(latencies) if latencies else {},
+                                clients=clients, failures=len(failures),
+                                requests_per_s=round(len(latencies) / elapsed, 1))
+    finally:
+        server.stop()
+        thread.join(timeout=5.0)
+        note_app.ipc_server = None
+    return results
+
+
+def db_size(db_path):
+    """Veritabanı ve henüz aktarılmamış WAL dosyasının toplam boyutu (bayt)."""
+    return sum(os.path.getsize(path) for path in (db_path, db_path + "-wal") if os.path.exists(path))
+
+
+def run_size(count, args, parts, skip_reason):
+    result = {}
+    with bench_common.temp_store(f"bench_{count}.db") as db_path:
+        start = time.perf_counter()
+        paths = bench_common.populate(count, args.seed)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        note_store.noted_paths.load() # Sunucu açılışta yükler; --has-note bundan yanıtlanır
+        result['populate'] = {'notes_per_s': round(count / elapsed, 1), 'seconds': round(elapsed, 2),
+                              'db_mb': round(db_size(db_path) / 1024 / 1024, 2),
+                              'noted_paths_load_ms': round((time.perf_counter() - start) * 1000, 3)}
+        print(f"  doldurma: {elapsed:.1f} sn, {result['populate']['db_mb']} MB", flush=True)
+        for part in parts:
+            if part == 'gui' and skip_reason:
+                result[part] = {'skipped': skip_reason}
+            elif part == 'store':
+                result[part] = bench_store(paths, args.ops)
+            elif part == 'list':
+                result[part] = bench_list(paths, args.repeat)
+            elif part == 'gui':
+                result[part] = bench_gui(args.repeat)
+            else:
+                result[part] = bench_ipc(paths, args.ops, args.clients, args.requests)
+            print(f"  {part}: {json.dumps(result[part], ensure_ascii=False)}", flush=True)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default="1000,10000,100000", help="Virgülle ayrılmış not sayıları (1k-1M)")
+    parser.add_argument('--skip', default="", help=f"Atlanacak bölümler ({', '.join(PARTS)})")
+    parser.add_argument('--ops', type=int, default=2000, help="Hız ölçümlerinde işlem sayısı")
+    parser.add_argument('--repeat', type=int, default=5, help="Liste ölçümlerinde tekrar")
+    parser.add_argument('--clients', type=int, default=100, help="IPC yükünde eş zamanlı istemci")
+    parser.add_argument('--requests', type=int, default=20, help="IPC yükünde istemci başına istek")
+    parser.add_argument('--seed', type=int, default=bench_common.SEED, help="Sentetik veri tohumu")
+    parser.add_argument('--output', metavar='DOSYA', help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--compare', metavar='DOSYA', help="Karşılaştırılacak önceki sonuç dosyası")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    skipped = {part.strip() for part in args.skip.split(",") if part.strip()}
+    parts = [part for part in PARTS if part not in skipped]
+    display, skip_reason = start_display() if 'gui' in parts else (None, None)
+    if skip_reason:
+        print(f"gui atlanıyor: {skip_reason}")
+
+    results = {}
+    try:
+        for count in sizes:
+            print(f"{count} not:", flush=True)
+            results[str(count)] = run_size(count, args, parts, skip_reason)
+    finally:
+        if display is not None:
+            display.terminate()
+
+    if args.output:
+        bench_common.write_results(args.output, dict(vars(args), sizes=sizes, parts=parts), results)
+        print(f"Sonuçlar yazıldı: {args.output}")
+    if args.compare:
+        bench_common.compare(args.compare, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Dışa/içe aktarma benchmark'ı: sentetik notları JSONL ve CSV olarak dışa
+aktarır, sonra her çakışma politikasıyla geri içe aktarır. Saniyedeki satır
+sayısı ve en yüksek Python bellek kullanımı (tracemalloc) ölçülür; bellek
+not sayısıyla büyümemelidir.
+
+Kullanım: python benchmarks/bench_transfer.py [--notes 200000] [--batch-size 5000]
+"""
+import argparse
+import os
+import time
+
+import bench_common
+import note_store
+import note_transfer
+
+
+def measure(label, count, func):
+    """func'u iki kez çalıştırır: süre için ve (tracemalloc açık) bellek için."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = bench_common.peak_memory(func)
+    print(f"{label:<28} {count / elapsed:>10.0f} satır/sn  ({elapsed:6.2f} sn)  bellek tepe {peak:6.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--notes', type=int, default=200000, help="Sentetik not sayısı")
+    parser.add_argument('--batch-size', type=int, default=note_store.TRANSFER_BATCH, help="Transaction başına satır")
+    args = parser.parse_args()
+
+    with bench_common.temp_store('transfer.db') as db_path:
+        tmp = os.path.dirname(db_path)
+        start = time.perf_counter()
+        bench_common.populate(args.notes, batch_size=args.batch_size)
+        print(f"Doldurma: {args.notes} not, {time.perf_counter() - start:.1f} sn\n")
+
+        for fmt in note_transfer.FORMATS:
+            path = os.path.join(tmp, f"notlar.{fmt}")
+            measure(f"dışa aktar ({fmt})", args.notes, lambda: note_transfer.export_notes(path, fmt))
+            print(f"{'':<28} dosya {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+
+        path = os.path.join(tmp, "notlar.jsonl")
+        for policy in note_transfer.CONFLICT_POLICIES:
+            measure(f"içe aktar (jsonl, {policy})", args.notes,
+                    lambda: note_transfer.import_notes(path, on_conflict=policy, batch_size=args.batch_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Explorer simge/sütun eklentisi yerine geçen yerel test istemcisi.
+
+Bir klasör listesindeki tüm yolları tek bir toplu --has-note isteğiyle sorar
+(eklentinin yapacağı gibi) ve notlu olanları işaretler. İstek başına gecikme
+ve yol başına süre ölçülür.
+
+Varsayılan olarak geçici bir veritabanı ve süreç içinde gerçek istek
+işleyicisiyle (note_app.handle_request, GUI açmadan) bir sunucu kurulur; her
+klasörde dosyaların bir kısmına not eklenir ve yanıtlar doğrulanır.
+--port verilirse çalışan FileNoter sunucusu hedeflenir; KLASÖR verilirse
+sentetik liste yerine o klasörün gerçek girdileri sorulur.
+
+Kullanım:
+    python benchmarks/overlay_client.py [--notes 100000] [--files 2000] [--listings 50]
+    python benchmarks/overlay_client.py --port 61073 "C:\\Kullanıcılar\\ben\\Belgeler"
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from bench_common import percentile
+import note_ipc
+
+
+def query_listing(client, paths):
+    """Klasör listesini tek istekte sorar: [True/False, ...]."""
+    reply = client.request("--has-note", file_paths=paths)
+    if not reply.get('ok'):
+        raise RuntimeError(reply.get('error'))
+    return reply['result']
+
+
+def badge_folder(client, folder):
+    """Gerçek bir klasörün girdilerini işaretleyerek yazdırır."""
+    names = sorted(os.listdir(folder))
+    start = time.perf_counter()
+    flags = query_listing(client, [os.path.join(folder, name) for name in names])
+    elapsed = time.perf_counter() - start
+    for name, noted in zip(names, flags):
+        print(f"{'●' if noted else ' '} {name}")
+    print(f"\n{len(names)} girdi, {sum(flags)} notlu; istek {elapsed * 1000:.2f} ms")
+
+
+def start_local_server(notes, files, listings):
+    """Geçici veritabanı + süreç içi sunucu; (sunucu, [(yollar, beklenen)]) döndürür."""
+    import note_app # tkinter modülü yüklenir ama pencere açılmaz
+    import note_store
+
+    note_store.set_db_path(os.path.join(tempfile.mkdtemp(), 'overlay.db'))
+    note_store.init_db()
+    rng = random.Random(0)
+    folders = [f"C:\\Users\\test\\Belgeler\\klasor_{i}" for i in range(max(1, notes // files))]
+    cases = []
+    for index, folder in enumerate(folders):
+        paths = [f"{folder}\\dosya_{j}.txt" for j in range(files)]
+        noted = [rng.random() < 0.5 for _ in paths]
+        note_store.import_notes(((path, "not", None) for path, flag in zip(paths, noted) if flag))
+        if index < listings:
+            # Explorer yolları farklı büyük/küçük harfle de gönderebilir
+            cases.append(([path.upper() if j % 2 else path for j, path in enumerate(paths)], noted))
+
+    start = time.perf_counter()
+    count = note_store.noted_paths.load()
+    print(f"Notlu yol kümesi: {count} yol, {time.perf_counter() - start:.2f} sn")
+
+    server = note_ipc.IpcServer(note_app.handle_request, port=0)
+    server.bind()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('folder', nargs='?', metavar='KLASÖR', help="Girdileri sorulacak gerçek klasör")
+    parser.add_argument('--port', type=int, help="Çalışan FileNoter sunucusunun portu")
+    parser.add_argument('--notes', type=int, default=100000, help="Sentetik yol sayısı (yaklaşık yarısı notlu)")
+    parser.add_argument('--files', type=int, default=2000, help="Klasör başına dosya")
+    parser.add_argument('--listings', type=int, default=50, help="Sorulacak klasör listesi sayısı")
+    args = parser.parse_args()
+
+    server = None
+    if args.port is None:
+        server, cases = start_local_server(args.notes, args.files, args.listings)
+        port = server.listen_socket.getsockname()[1]
+    else:
+        port, cases = args.port, []
+
+    with note_ipc.IpcClient(port=port) as client:
+        if args.folder:
+            badge_folder(client, args.folder)
+        elif cases:
+            latencies, wrong = [], 0
+            for paths, expected in cases:
+                start = time.perf_counter()
+                flags = query_listing(client, paths)
+                latencies.append(time.perf_counter() - start)
+                wrong += sum(1 for got, want in zip(flags, expected) if got != want)
+            paths = sum(len(paths) for paths, _ in cases)
+            print(f"{len(cases)} liste x {args.files} yol: istek p50 {percentile(latencies, 50) * 1000:.2f} ms, "
+                  f"p99 {percentile(latencies, 99) * 1000:.2f} ms, "
+                  f"yol başına {sum(latencies) / paths * 1e6:.2f} µs, yanlış yanıt {wrong}")
+
+    if server is not None:
+        import note_store
+        sample = cases[0][0] if cases else []
+        start = time.perf_counter()
+        note_store.has_notes(sample)
+        elapsed = time.perf_counter() - start
+        print(f"Sunucu içinde arama (IPC/JSON hariç): yol başına {elapsed / max(1, len(sample)) * 1e6:.2f} µs")
+        server.stop()
+        note_store.close_all()
+
+
+if __name__ == '__main__':
+    main()
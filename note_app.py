@@ -0,0 +1,2300 @@
+# -*- coding: utf-8 -*-
+"""
+FileNoter sunucusu ve arayüzü. Bu modül sadece sunucu olacak süreçte yüklenir;
+isteği çalışan sunucuya ileten istemciler (file_noter.py) Tk ve SQLite yüklemez.
+"""
+import tkinter as tk
+from tkinter import ttk # ttk widget'larını kullanacağız
+from tkinter import messagebox, scrolledtext, Listbox, Scrollbar, Frame, Label # Frame ve Label'ı ttk ile değiştireceğiz
+import tkinter.font as tkFont # Fontları ayarlamak için
+import sys
+import os
+import sqlite3
+import socket
+import threading
+import queue # IPC thread'inden Tk thread'ine bloklamadan iş aktarmak için
+import time
+import subprocess # Dosya konumunu açmak için
+from bisect import bisect_left, bisect_right # Sıralı liste modelinde ikili arama
+from concurrent.futures import Future # DB thread'inde çalışan işlerin sonucu
+
+import note_store # Kalıcı bağlantılı not deposu
+import note_ipc # Satır tabanlı JSON IPC protokolü
+import note_stats # Sıcak yolların süre histogramları ve sayaçları ('--stats')
+
+try:
+    # Windows'a özgü özellikler için
+    import ctypes
+    HAS_CTYPES = True
+except ImportError:
+    HAS_CTYPES = False
+
+# --- Ayarlar ---
+PORT = note_ipc.PORT
+HOST = note_ipc.HOST
+LISTEN_BACKLOG = note_ipc.LISTEN_BACKLOG # Aynı anda bekleyebilecek bağlantı sayısı
+GUI_POLL_MS = 20 # IPC'den gelen GUI işleri kuyruğunun kontrol aralığı (ms)
+SEARCH_DELAY_MS = 150 # Arama kutusunda yazma durduktan sonra aramaya kadar bekleme (ms)
+ADD_BATCH_WINDOW_MS = 250 # Art arda gelen --add isteklerini tek pencerede toplama süresi (ms)
+AUTOSAVE_DELAY_MS = 800 # Not penceresinde yazma durduktan sonra otomatik kayda kadar bekleme (ms)
+WRITE_FLUSH_MS = 1000 # Bekleyen not yazmalarının tek transaction ile diske yazılma aralığı (ms)
+FILE_CHECK_DELAY_MS = 5000 # Sunucu açıldıktan sonra taşınan/kayıp dosya taramasının başlama gecikmesi (ms)
+MISSING_FG = '#d9534f' # Dosyası bulunamayan notların liste rengi
+MUTED_FG = '#808080' # Not penceresindeki klasör notu başlıkları
+LOADING_TEXT = "Yükleniyor..." # Veritabanından okunurken metin alanlarında ve listede gösterilir
+NOTE_DIALOG_SIZE = (500, 400) # Not ekleme/görüntüleme pencerelerinin açılış boyutu
+DIALOG_POOL_SIZE = 2 # Sunucunun önceden kurup gizli tuttuğu not penceresi sayısı (her tür için; 0: havuz kapalı)
+DIALOG_POOL_FILL_MS = 1000 # Açılışta ve havuz boşalınca pencerelerin kurulmaya başlama gecikmesi (ms)
+PREVIEW_BYTES = 64 * 1024 # "Tüm Notlar" önizlemesinde büyük notların ilk gösterilen kısmı ("Devamını Yükle")
+STATS_LOG = os.environ.get('FILENOTER_LOG') # Ölçüm günlüğü dosyası ("1": uygulama klasöründe filenoter.log)
+STATS_LOG_INTERVAL_MS = 10 * 60 * 1000 # Günlük açıksa ölçüm özetinin yazılma aralığı (ms)
+
+DB_PATH = note_store.DB_PATH
+
+# --- Global Değişkenler ---
+app_root = None # Arka planda çalışacak ana Tkinter örneği
+ipc_server = None # Olay güdümlü IPC sunucusu (note_ipc.IpcServer)
+listener_thread = None # Sunucuyu dinleyen thread
+gui_queue = queue.SimpleQueue() # IPC thread'inden Tk thread'ine gönderilen (fonksiyon, argümanlar)
+shutdown_event = threading.Event() # Sunucu thread'ini durdurmak için olay
+all_notes_window = None # Aktif "Tüm Notlar" penceresini takip et (sadece bir tane)
+pending_add_paths = [] # Toplanmayı bekleyen --add yolları (sadece Tk thread'inde değişir)
+add_batch_timer = None # Toplu --add penceresini açacak 'after' zamanlayıcısı
+batch_add_dialog = None # Açık çoklu not penceresi (yeni gelen yollar buna eklenir)
+file_check_running = False # Taşınan/kayıp dosya taraması sürüyor mu
+pending_writes = {} # Tüm not pencerelerinin henüz yazılmamış notları: dosya_yolu -> metin (sonuncusu geçerli)
+pending_tags = {} # Henüz yazılmamış etiket değişiklikleri: dosya_yolu -> [etiket, ...] (metinlerle aynı transaction'da)
+write_flush_timer = None # Bekleyen yazmaları kaydedecek 'after' zamanlayıcısı
+writes_in_flight = [] # DB thread'ine verilmiş not yazmalarının Future'ları (bitenler _writes_pending'de atılır)
+write_error_shown = False # Toplu yazma hatası kullanıcıya gösterildi mi (başarılı yazmada sıfırlanır)
+db_requests = queue.SimpleQueue() # DB thread'ine giden (Future, fonksiyon, argümanlar, kuyruğa_girme); None durdurur
+db_thread = None # Arayüzün veritabanı işlerini çalıştıran thread (run_db ilk çağrıda başlatır)
+dialog_pools = {'add': [], 'view': []} # Önceden kurulmuş, gizli (withdraw) not pencereleri
+pool_fill_timer = None # Havuzları tamamlayacak 'after' zamanlayıcısı
+
+# --- Stil ve Font Ayarları ---
+DEFAULT_FONT = None
+LABEL_FONT = None
+TEXT_FONT = None
+BG_COLOR = None # Tema arka plan rengini saklamak için
+FG_COLOR = None # Tema ön plan rengini saklamak için
+
+def setup_styles(root):
+    """Uygulama için ttk stillerini ve fontları ayarlar."""
+    global DEFAULT_FONT, LABEL_FONT, TEXT_FONT, BG_COLOR, FG_COLOR
+
+    style = ttk.Style(root)
+    # Mevcut işletim sistemine uygun bir tema seçmeye çalış
+    available_themes = style.theme_names()
+    # print("Available themes:", available_themes) # Hangi temaların olduğunu görmek için
+    if 'vista' in available_themes:
+        style.theme_use('vista')
+    elif 'clam' in available_themes:
+        style.theme_use('clam')
+    # Diğer temaları deneyebilirsiniz: 'alt', 'default', 'classic', 'winnative', 'xpnative'
+
+    # Fontları tanımla
+    DEFAULT_FONT = tkFont.nametofont("TkDefaultFont")
+    LABEL_FONT = tkFont.Font(family=DEFAULT_FONT.actual("family"), size=DEFAULT_FONT.actual("size"))
+    TEXT_FONT = tkFont.Font(family=DEFAULT_FONT.actual("family"), size=DEFAULT_FONT.actual("size"))
+
+    # Temanın arka plan ve ön plan renklerini al (ScrolledText ve Listbox için)
+    try:
+        BG_COLOR = style.lookup('TFrame', 'background')
+        FG_COLOR = style.lookup('TLabel', 'foreground') # Genellikle metin rengi
+    except tk.TclError:
+        # Tema renklerini alamazsak varsayılan kullan
+        BG_COLOR = 'SystemWindow'
+        FG_COLOR = 'SystemWindowText'
+
+    # Butonlara biraz iç boşluk ekle
+    style.configure('TButton', padding=(10, 5))
+
+# --- Veritabanı İşlemleri ---
+# Asıl sorgular note_store modülünde. Arayüzün tüm veritabanı işleri tek bir DB
+# thread'inde sırayla çalışır (run_db); Tk thread'i hiçbir sorguyu beklemez, sonuç
+# gui_queue üzerinden Tk thread'ine teslim edilir. İşler sırayla çalıştığı için önce
+# gönderilen yazma, sonra gönderilen okumadan önce biter.
+
+def init_db():
+    """Veritabanını ve 'notes' tablosunu oluşturur (eğer yoksa)."""
+    try:
+        note_store.init_db()
+    except sqlite3.Error as e:
+        _show_startup_error(f"Kritik Veritabanı hatası: {e}\nVeritabanı yolu: {DB_PATH}")
+        sys.exit(1)
+
+def db_worker():
+    """DB thread'i: db_requests kuyruğundaki işleri sırayla çalıştırır (None gelince biter)."""
+    while True:
+        item = db_requests.get()
+        if item is None:
+            break
+        future, func, args, queued_at = item
+        if not future.set_running_or_notify_cancel():
+            continue
+        start = time.perf_counter()
+        note_stats.record('db.queue_wait', start - queued_at)
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            note_stats.incr('db.errors')
+            future.set_exception(e)
+        note_stats.record(f"db.{func.__name__}", time.perf_counter() - start)
+    note_store.release_connection()
+
+def submit_db(func, *args):
+    """
+    func(*args)'ı DB thread'inde sıraya koyar ve Future döndürür; sonuç Tk'ye
+    taşınmaz (IPC yanıtları Future bitince IPC thread'inden gönderilir).
+    """
+    global db_thread
+    if db_thread is None:
+        db_thread = threading.Thread(target=db_worker, daemon=True)
+        db_thread.start()
+    future = Future()
+    db_requests.put((future, func, args, time.perf_counter()))
+    return future
+
+def run_db(func, *args, on_done=None, on_error=None, owner=None, error_message="Veritabanı hatası"):
+    """
+    func(*args)'ı DB thread'inde çalıştırır ve Future döndürür. Bitince Tk
+    thread'inde on_done(sonuç) çağrılır; hata olursa on_error(hata) (verilmediyse
+    hata gösterilir). owner penceresi o sırada kapanmışsa sonuç atılır.
+    """
+    future = submit_db(func, *args)
+    future.add_done_callback(lambda f: gui_queue.put((_resolve_db_future, (f, on_done, on_error, owner, error_message))))
+    return future
+
+def _resolve_db_future(future, on_done, on_error, owner, error_message):
+    """DB işinin sonucunu (Tk thread'inde) sahibine teslim eder."""
+    if owner is not None and not owner.winfo_exists():
+        return
+    error = future.exception()
+    if error is None:
+        if on_done:
+            on_done(future.result())
+    elif on_error:
+        on_error(error)
+    else:
+        print(f"{error_message}: {error}")
+        show_error(f"{error_message}: {error}", parent=owner or app_root)
+
+def stop_db_worker(timeout=10.0):
+    """Kuyruktaki işler bitince DB thread'ini durdurur (kapanışta)."""
+    global db_thread
+    if db_thread is None:
+        return
+    db_requests.put(None)
+    db_thread.join(timeout=timeout)
+    if db_thread.is_alive():
+        print("Uyarı: DB thread'i zaman aşımında bitmedi.")
+    db_thread = None
+
+def queue_note_write(file_path, note_text):
+    """
+    Notu yazma kuyruğuna bırakır (Tk thread'inde). Kuyruk WRITE_FLUSH_MS'de bir
+    tek transaction ile yazılır; aynı yol için sadece son metin yazılır.
+    """
+    global write_flush_timer
+    pending_writes[file_path] = note_text
+    if write_flush_timer is None and app_root:
+        write_flush_timer = app_root.after(WRITE_FLUSH_MS, flush_note_writes)
+
+def queue_note_tags(file_path, tags):
+    """Notun etiketlerini yazma kuyruğuna bırakır; metinle birlikte (ondan sonra) yazılır."""
+    global write_flush_timer
+    pending_tags[file_path] = list(tags)
+    if write_flush_timer is None and app_root:
+        write_flush_timer = app_root.after(WRITE_FLUSH_MS, flush_note_writes)
+
+def flush_note_writes():
+    """
+    Bekleyen tüm not (ve etiket) yazmalarını DB thread'inde tek transaction ile kaydeder
+    ve bitince listeyi bir kez günceller. Future (bekleyen yoksa None) döndürür.
+    Yazılamazsa notlar kuyruğa geri konur ve WRITE_FLUSH_MS sonra tekrar denenir.
+    """
+    global write_flush_timer
+    if write_flush_timer is not None:
+        app_root.after_cancel(write_flush_timer) # Doğrudan çağrıldıysa zamanlayıcı iptal
+        write_flush_timer = None
+    if not pending_writes and not pending_tags:
+        return None
+    notes, tags = dict(pending_writes), dict(pending_tags)
+    pending_writes.clear()
+    pending_tags.clear()
+
+    def on_done(_):
+        global write_error_shown
+        write_error_shown = False
+        print(f"{len(notes.keys() | tags.keys())} not kaydedildi (toplu yazma).")
+        _apply_note_changes([(path, note_text or None) for path, note_text in notes.items()])
+
+    def on_error(error):
+        global write_error_shown, write_flush_timer
+        print(f"Notlar kaydedilemedi, tekrar denenecek: {error}")
+        for path, note_text in notes.items():
+            pending_writes.setdefault(path, note_text) # Daha yeni metin gelmediyse bu yazılır
+        for path, names in tags.items():
+            pending_tags.setdefault(path, names)
+        if not write_error_shown: # Kilit sürdükçe her denemede pencere açma
+            write_error_shown = True
+            show_error(f"Notlar kaydedilirken hata oluştu: {error}", parent=app_root)
+        if write_flush_timer is None and app_root and not shutdown_event.is_set():
+            write_flush_timer = app_root.after(WRITE_FLUSH_MS, flush_note_writes)
+
+    future = run_db(note_store.save_note_texts, notes, tags, on_done=on_done, on_error=on_error)
+    writes_in_flight.append(future)
+    return future
+
+def save_notes(file_paths, note_text):
+    """Aynı notu birden çok dosya yoluna tek transaction ile kaydeder (veya siler)."""
+    print(f"{len(file_paths)} dosya için not {'kaydediliyor' if note_text else 'siliniyor'}.")
+    changes = [(path, note_text or None) for path in file_paths]
+    future = run_db(note_store.save_notes, file_paths, note_text, on_done=lambda _: _apply_note_changes(changes),
+                    error_message="Notlar kaydedilirken/silinirken hata oluştu")
+    writes_in_flight.append(future)
+    return future
+
+def _writes_pending():
+    """
+    Bellekteki noted_paths kümesine henüz yansımamış bir not yazması (kuyrukta
+    bekleyen veya DB thread'inde süren) var mı? Future, noted_paths güncellendikten
+    sonra biter.
+    """
+    writes_in_flight[:] = [future for future in writes_in_flight if not future.done()]
+    return bool(pending_writes or writes_in_flight)
+
+def get_note(file_path, on_done, on_error=None, owner=None):
+    """
+    Notu okur ve on_done(metin) çağırır (yoksa boş string). Henüz yazılmamış
+    (otomatik kayıt kuyruğundaki) metin veritabanındakinden önce gelir.
+    """
+    return run_db(note_store.get_note, file_path, on_done=lambda text: on_done(pending_writes.get(file_path, text)),
+                  on_error=on_error, owner=owner, error_message="Not okunurken hata oluştu")
+
+def stream_note(file_path, on_chunk, on_end, limit=None, on_error=None, owner=None):
+    """
+    Notu DB thread'inde note_store.NOTE_CHUNK_BYTES'lık parçalar halinde okur
+    (note_store.NoteReader). Her parça Tk thread'inde on_chunk(metin, reader) ile
+    verilir; sonraki parça ancak o zaman istenir, parçalar arasında Tk olayları
+    işlenir (sonuçlar process_gui_queue döngüsüyle gelir). on_chunk False
+    döndürürse okuma bırakılır. Not bitince veya 'limit' bayt okununca
+    on_end(reader) çağrılır; reader.done değilse okuma continue_note_stream ile
+    sürdürülür. Kuyruktaki yazılmamış metin önce gelir. Küçük notlar tek DB
+    işinde okunur.
+    """
+    def start(result):
+        reader, text = result
+        _deliver_note_chunk(reader, text, on_chunk, on_end, limit, on_error, owner) # İlk parça: konum 0'dan
+    return run_db(note_store.open_note_reader, file_path, pending_writes.get(file_path), _chunk_size(0, limit),
+                  on_done=start, on_error=on_error, owner=owner, error_message="Not okunurken hata oluştu")
+
+def continue_note_stream(reader, on_chunk, on_end, limit=None, on_error=None, owner=None):
+    """stream_note()'un 'limit' yüzünden durduğu okumayı sürdürür (örn. "Devamını Yükle")."""
+    _request_note_chunk(reader, on_chunk, on_end, reader.position + limit if limit else None, on_error, owner)
+
+def _chunk_size(position, stop_at):
+    """Sonraki parçanın boyu: sınır varsa onu aşmayacak kadar."""
+    if stop_at is None:
+        return note_store.NOTE_CHUNK_BYTES
+    return max(1, min(note_store.NOTE_CHUNK_BYTES, stop_at - position))
+
+def _request_note_chunk(reader, on_chunk, on_end, stop_at, on_error, owner):
+    run_db(reader.read_chunk, _chunk_size(reader.position, stop_at),
+           on_done=lambda text: _deliver_note_chunk(reader, text, on_chunk, on_end, stop_at, on_error, owner),
+           on_error=on_error, owner=owner, error_message="Not okunurken hata oluştu")
+
+def _deliver_note_chunk(reader, text, on_chunk, on_end, stop_at, on_error, owner):
+    if text and on_chunk(text, reader) is False:
+        return # Artık gösterilmiyor (örn. başka not seçildi)
+    if reader.done or (stop_at is not None and reader.position >= stop_at):
+        on_end(reader)
+    else:
+        _request_note_chunk(reader, on_chunk, on_end, stop_at, on_error, owner)
+
+def get_ancestor_notes(file_path, on_done, owner=None):
+    """Yolu içeren klasörlerin notlarını [(klasör_yolu, metin), ...] (kökten yola doğru) on_done'a verir."""
+    return run_db(note_store.ancestor_notes, file_path, on_done=on_done, owner=owner,
+                  error_message="Klasör notları okunurken hata oluştu")
+
+def get_note_tags(file_path, on_done, on_error=None, owner=None):
+    """Notun etiketlerini on_done([etiket, ...]) ile verir; kuyruktaki değişiklikler önce gelir."""
+    return run_db(note_store.get_note_tags, file_path,
+                  on_done=lambda tags: on_done(pending_tags.get(file_path, tags)), on_error=on_error, owner=owner,
+                  error_message="Etiketler okunurken hata oluştu")
+
+def note_history(file_path, on_done, owner=None):
+    """Notun eski sürümlerini yeniden eskiye (kayıt_zamanı, değiştirilme_zamanı, metin) olarak on_done'a verir."""
+    return run_db(note_store.note_history, file_path, on_done=on_done, owner=owner,
+                  error_message="Not geçmişi okunurken hata oluştu")
+
+def list_notes(folder, recursive, on_done, owner=None, tags=(), match_all=True):
+    """
+    Notları path_key sırasıyla (dosya_yolu, boyut_bayt, değiştirme_zamanı, dosya_var_mı,
+    path_key) satırları olarak on_done'a verir (metinler hariç). dosya_var_mı son dosya
+    taramasının sonucudur. folder verilirse sadece o klasör ve (recursive ise) alt
+    klasörlerindeki notlar; tags verilirse sadece bu etiketlerin hepsini (match_all)
+    veya birini taşıyanlar.
+    """
+    if tags:
+        return run_db(note_store.list_filtered_notes, folder, recursive, tags, match_all, on_done=on_done,
+                      owner=owner, error_message="Notlar okunurken hata oluştu")
+    if folder:
+        return run_db(note_store.list_folder_notes, folder, recursive, on_done=on_done, owner=owner,
+                      error_message="Notlar okunurken hata oluştu")
+    return run_db(note_store.list_notes, on_done=on_done, owner=owner, error_message="Tüm notlar okunurken hata oluştu")
+
+def tag_facets(folder, recursive, tags, match_all, on_done, owner=None):
+    """Etiket paneli için [(etiket, süzülmüş listedeki not sayısı), ...] okur (bkz. note_store.tag_facets)."""
+    return run_db(note_store.tag_facets, folder, recursive, tags, match_all, on_done=on_done, owner=owner,
+                  error_message="Etiketler okunurken hata oluştu")
+
+def search_notes(query, on_done, owner=None):
+    """Not metni ve dosya yollarında arar; eşleşen yolları alaka sırasıyla on_done'a verir."""
+    # Yazarken hatalı sorgular olabilir; hata penceresi açılmaz, sonuç boş sayılır
+    def on_error(error):
+        print(f"Arama hatası: {error}")
+        on_done([])
+    return run_db(note_store.search_notes, query, on_done=on_done, on_error=on_error, owner=owner)
+
+def delete_note(file_path):
+    """Belirtilen dosya yolu için notu veritabanından siler; liste silme bitince güncellenir."""
+    print(f"Veritabanından siliniyor: '{file_path}'")
+    return run_db(note_store.delete_note, file_path, on_done=lambda _: _apply_note_changes([(file_path, None)]),
+                  error_message="Not silinirken hata oluştu")
+
+
+# --- GUI Yardımcı Fonksiyonları ---
+
+def _center_window(win, width=None, height=None):
+    """Verilen pencereyi ekranda ortalar (boyut verilmezse mevcut boyutu korunur)."""
+    if width is None:
+        win.update_idletasks()
+        width = win.winfo_width()
+        height = win.winfo_height()
+    x = (win.winfo_screenwidth() // 2) - (width // 2)
+    y = (win.winfo_screenheight() // 2) - (height // 2)
+    win.geometry(f'{width}x{height}+{x}+{y}')
+
+def _short_file_name(file_path):
+    """Başlıklar için dosya adı; çok uzunsa ortası kısaltılır."""
+    file_name = os.path.basename(file_path)
+    if len(file_name) > 40:
+        file_name = file_name[:18] + "..." + file_name[-18:]
+    return file_name
+
+def _format_size(num_bytes):
+    """Bayt sayısını okunabilir hale getirir (örn. 12.3 KB)."""
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024 or unit == "MB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+def _replace_text(text_area, text):
+    """Salt okunur (DISABLED) metin alanının içeriğini değiştirir."""
+    text_area.config(state=tk.NORMAL)
+    text_area.delete("1.0", tk.END)
+    text_area.insert("1.0", text)
+    text_area.config(state=tk.DISABLED)
+
+def _append_text(text_area, text):
+    """Salt okunur metin alanının sonuna ekler (parça parça yüklenen notlar)."""
+    text_area.config(state=tk.NORMAL)
+    text_area.insert(tk.END, text)
+    text_area.config(state=tk.DISABLED)
+
+def _load_percent(reader):
+    """Parça parça okunan notun yüklenen yüzdesi (ilerleme çubukları için)."""
+    return reader.position * 100 / reader.size if reader.size else 100
+
+def _set_dark_title_bar(window_handle):
+    """Windows'ta başlık çubuğunu koyu yapmayı dener."""
+    if sys.platform == 'win32' and HAS_CTYPES:
+        try:
+            HWND = window_handle
+            if HWND:
+                attribute = 20 # DWMWA_USE_IMMERSIVE_DARK_MODE
+                value = 1 # 1 for dark, 0 for light
+                ctypes.windll.dwmapi.DwmSetWindowAttribute(HWND, attribute, ctypes.byref(ctypes.c_int(value)), ctypes.sizeof(ctypes.c_int))
+        except Exception as e:
+            # pass # Başarısız olursa önemli değil
+            # print(f"DEBUG: Dark title bar failed: {e}")
+            pass
+
+# Not ekleme/görüntüleme pencereleri her açılışta baştan kurulmaz: sunucu her türden
+# DIALOG_POOL_SIZE kadarını gizli tutar, istek gelince biri doldurulup gösterilir ve
+# kapanınca havuza geri döner. Havuz boşalınca (aynı anda birden çok pencere açıkken)
+# eksikler biraz sonra, Tk boştayken kurulur; fazlası kapanınca yok edilir.
+
+def _take_dialog(kind, parent_root):
+    """Havuzdan hazır bir pencere alır; havuz boşsa (veya üst pencere farklıysa) yenisini kurar."""
+    if parent_root is app_root:
+        pool = dialog_pools[kind]
+        while pool:
+            dialog = pool.pop()
+            if dialog.winfo_exists():
+                if not pool:
+                    schedule_pool_fill()
+                return dialog
+        schedule_pool_fill()
+    return DIALOG_BUILDERS[kind](parent_root)
+
+def _release_dialog(kind, dialog):
+    """Kapanan pencereyi gizleyip havuza geri koyar; havuz doluysa veya kapanıyorsak yok eder."""
+    dialog.session += 1 # Önceki açılışın geç gelen DB sonuçları atılsın (bkz. _if_current)
+    pool = dialog_pools[kind]
+    if dialog.master is not app_root or len(pool) >= DIALOG_POOL_SIZE or shutdown_event.is_set():
+        dialog.destroy()
+        return
+    for child in dialog.winfo_children():
+        if isinstance(child, tk.Toplevel): # Örn. açık kalmış "Not Geçmişi"
+            child.destroy()
+    dialog.withdraw()
+    pool.append(dialog)
+
+def _if_current(dialog, func):
+    """
+    func'ı yalnızca pencere hâlâ aynı açılıştaysa çağıran sarmalayıcı. Havuzdaki
+    pencere kapanıp başka bir not için açıldığında önceki açılışın DB sonuçları
+    atılır (akış parçalarında False okumayı durdurur).
+    """
+    session = dialog.session
+    return lambda *args: func(*args) if dialog.session == session else False
+
+def schedule_pool_fill():
+    """Eksik havuz pencerelerinin DIALOG_POOL_FILL_MS sonra kurulmasını sağlar."""
+    global pool_fill_timer
+    if pool_fill_timer is None and DIALOG_POOL_SIZE > 0 and app_root:
+        pool_fill_timer = app_root.after(DIALOG_POOL_FILL_MS, fill_dialog_pools)
+
+def fill_dialog_pools():
+    """Havuzlara bir pencere kurar; eksik kaldıysa sıradakini Tk boşta kalınca kurar."""
+    global pool_fill_timer
+    pool_fill_timer = None
+    if not app_root or shutdown_event.is_set():
+        return
+    for kind, pool in dialog_pools.items():
+        if len(pool) < DIALOG_POOL_SIZE:
+            started = time.perf_counter()
+            pool.append(DIALOG_BUILDERS[kind](app_root))
+            note_stats.record(f'ui.{kind}_dialog_build', time.perf_counter() - started)
+            pool_fill_timer = app_root.after_idle(fill_dialog_pools)
+            return
+
+
+# --- GUI Ana Fonksiyonları (Sunucu tarafından çağrılır) ---
+
+def show_add_note_dialog_internal(parent_root, file_path, requested_at=None):
+    """
+    Not ekleme/düzenleme penceresini gösterir. Pencere havuzdan alınır (bkz.
+    DIALOG_POOL_SIZE) ve hemen açılır; not DB thread'inde okunurken metin alanında
+    LOADING_TEXT görünür. requested_at: açılışın istendiği an (perf_counter).
+    """
+    _take_dialog('add', parent_root).open_note(file_path, requested_at)
+
+def _build_add_note_dialog(parent_root):
+    """
+    Not ekleme/düzenleme Toplevel penceresini gizli olarak kurar (ttk ve stil ile).
+    dialog.open_note(dosya_yolu) pencereyi o notla doldurup gösterir; kapanınca
+    pencere havuza geri döner (_release_dialog).
+    """
+    file_path = None
+    opened_at = shown_since = None # Açılış anı / görünene kadar ölçülen istek anı
+    current_note = None # Pencere açılırkenki not (okunana kadar None)
+
+    dialog = tk.Toplevel(parent_root)
+    dialog.withdraw() # open_note'a kadar gizli
+    dialog.session = 0 # Her açılış ve kapanışta artar (bkz. _if_current)
+    dialog.geometry("{}x{}".format(*NOTE_DIALOG_SIZE)) # Biraz daha geniş ve yüksek
+    dialog.minsize(400, 300)
+    dialog.configure(bg=BG_COLOR) # Toplevel arka planını tema ile uyumlu yap
+
+    try:
+        hwnd = int(dialog.frame(), 16)
+        _set_dark_title_bar(hwnd)
+    except: pass
+
+    # Ana Çerçeve (Padding eklemek için)
+    main_frame = ttk.Frame(dialog, padding=(15, 15, 15, 10)) # Kenarlara daha fazla boşluk
+    main_frame.pack(expand=True, fill="both")
+
+    # Widget'ları oluştur ve yerleştir
+    label = ttk.Label(main_frame, font=LABEL_FONT, wraplength=450) # Uzun dosya adları için satır kaydırma
+    label.pack(pady=(0, 10), anchor='w') # Altına boşluk
+
+    # ScrolledText için çerçeve (kenarlık veya farklı arka plan gerekirse)
+    text_container_frame = ttk.Frame(main_frame, relief="solid", borderwidth=1) # İnce bir kenarlık
+    text_container_frame.pack(expand=True, fill="both", pady=(0, 10)) # Altına boşluk
+
+    text_area = scrolledtext.ScrolledText(
+        text_container_frame,
+        wrap=tk.WORD,
+        height=10,
+        width=50,
+        font=TEXT_FONT,
+        bg=BG_COLOR, # Tema arka planı
+        fg=FG_COLOR, # Tema metin rengi
+        padx=5, # Metin alanı içine boşluk
+        pady=5,
+        relief=tk.FLAT, # Kendi kenarlığını kaldır
+        borderwidth=0
+    )
+    text_area.pack(expand=True, fill="both")
+    text_area.insert(tk.INSERT, LOADING_TEXT)
+    text_area.config(state=tk.DISABLED) # Not okunana kadar yazılamaz
+
+    # Etiketler (virgülle ayrılmış); metinle birlikte otomatik kaydedilir
+    tags_frame = ttk.Frame(main_frame)
+    tags_frame.pack(fill=tk.X, pady=(0, 15))
+    ttk.Label(tags_frame, text="Etiketler:").pack(side=tk.LEFT, padx=(0, 5))
+    tags_var = tk.StringVar(dialog)
+    tags_entry = ttk.Entry(tags_frame, textvariable=tags_var)
+    tags_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+    tags_entry.state(['disabled']) # Not okunana kadar
+
+    # Butonlar için çerçeve
+    button_frame = ttk.Frame(main_frame)
+    # button_frame.pack(pady=(10, 0), fill=tk.X, anchor='e') # Sağa yaslı
+    button_frame.pack(fill=tk.X, anchor='se') # Sağa ve alta yaslı
+
+    # Ayırıcı (opsiyonel)
+    # sep = ttk.Separator(button_frame, orient='horizontal')
+    # sep.pack(fill='x', pady=(0, 10))
+
+    # Otomatik kayıt: yazma AUTOSAVE_DELAY_MS durunca metin ortak yazma kuyruğuna
+    # bırakılır (bkz. queue_note_write); birden çok pencere tek transaction'da yazılır.
+    saved_note = None # En son kuyruğa bırakılan metin
+    current_tags = saved_tags = [] # Açılıştaki / en son kuyruğa bırakılan etiketler
+    autosave_timer = None
+
+    # Not parça parça yüklenir (büyük notlarda ilerleme çubuğu görünür), bitene kadar
+    # düzenlenemez. Etiketler metinden önce istenir; DB işleri sırayla çalıştığından
+    # metnin son parçasından önce gelmiş olurlar.
+    loaded_tags = []
+    chunks_shown = False
+
+    def load():
+        nonlocal chunks_shown
+        chunks_shown = False
+        current = lambda func: _if_current(dialog, func)
+        get_note_tags(file_path, current(on_tags_loaded), on_error=current(on_load_error), owner=dialog)
+        stream_note(file_path, current(on_chunk), current(on_loaded), on_error=current(on_load_error), owner=dialog)
+
+    def on_tags_loaded(tags):
+        loaded_tags[:] = tags
+
+    def on_chunk(text, reader):
+        nonlocal chunks_shown
+        if not chunks_shown: # İlk parça LOADING_TEXT'in yerini alır
+            chunks_shown = True
+            _replace_text(text_area, "")
+            if not reader.done:
+                load_progress.pack(side=tk.LEFT, padx=(10, 0))
+        _append_text(text_area, text)
+        load_progress['value'] = _load_percent(reader)
+
+    def on_loaded(reader):
+        nonlocal current_note, saved_note, current_tags, saved_tags
+        load_progress.pack_forget()
+        tags_var.set(", ".join(loaded_tags)) # current_note None iken: otomatik kayıt tetiklenmez
+        tags_entry.state(['!disabled'])
+        current_tags = saved_tags = list(loaded_tags)
+        text_area.config(state=tk.NORMAL)
+        if not chunks_shown: # Not yok
+            text_area.delete("1.0", tk.END)
+        current_note = saved_note = text_area.get("1.0", "end-1c")
+        text_area.edit_modified(False) # Parçaların eklenmesi değişiklik sayılmaz
+        text_area.focus_set()
+        for button in (save_button, history_button):
+            button.state(['!disabled'])
+        note_stats.record('ui.add_dialog_open', time.perf_counter() - opened_at) # Açılıştan not görünene kadar
+
+    def on_load_error(error):
+        if isinstance(error, note_store.NoteChangedError) and current_note is None:
+            print(f"Not okunurken değişti, yeniden yükleniyor: {file_path}")
+            _replace_text(text_area, LOADING_TEXT)
+            load()
+            return
+        show_error(f"Not okunurken hata oluştu: {error}", parent=parent_root)
+        _release_dialog('add', dialog)
+
+    def autosave():
+        nonlocal saved_note, saved_tags, autosave_timer
+        autosave_timer = None
+        new_note = text_area.get("1.0", tk.END).strip()
+        new_tags = note_store.parse_tags(tags_var.get())
+        if not new_note or (new_note == saved_note and new_tags == saved_tags):
+            return # Boş not otomatik kaydedilmez; silmek için Kaydet
+        if new_note != saved_note:
+            queue_note_write(file_path, new_note)
+            saved_note = new_note
+        if new_tags != saved_tags:
+            queue_note_tags(file_path, new_tags)
+            saved_tags = new_tags
+        autosave_label.config(text=f"Otomatik kaydedildi {time.strftime('%H:%M:%S')}")
+
+    def cancel_autosave():
+        nonlocal autosave_timer
+        if autosave_timer is not None:
+            dialog.after_cancel(autosave_timer)
+            autosave_timer = None
+
+    def schedule_autosave():
+        nonlocal autosave_timer
+        cancel_autosave()
+        autosave_timer = dialog.after(AUTOSAVE_DELAY_MS, autosave)
+
+    def on_modified(event=None):
+        if current_note is None or not text_area.edit_modified():
+            return
+        text_area.edit_modified(False) # Sonraki değişiklikte olay tekrar gelsin
+        schedule_autosave()
+
+    def on_tags_modified(*args):
+        if current_note is not None:
+            schedule_autosave()
+
+    text_area.edit_modified(False)
+    text_area.bind('<<Modified>>', on_modified)
+    tags_var.trace_add('write', on_tags_modified)
+
+    # Kapatma ve kaydetme fonksiyonları
+    def on_save():
+        if current_note is None:
+            return # Not henüz okunmadı
+        cancel_autosave()
+        queue_note_write(file_path, text_area.get("1.0", tk.END).strip())
+        new_tags = note_store.parse_tags(tags_var.get())
+        if new_tags != saved_tags:
+            queue_note_tags(file_path, new_tags)
+        flush_note_writes() # Açık kayıt beklemez; yazılamazsa kuyrukta kalır ve tekrar denenir
+        _release_dialog('add', dialog)
+
+    def on_cancel():
+        # Otomatik kaydedilmiş değişiklikler geri alınır (pencere açılırkenki not)
+        cancel_autosave()
+        if current_note is not None and saved_note != current_note:
+            queue_note_write(file_path, current_note)
+        if current_note is not None and saved_tags != current_tags:
+            queue_note_tags(file_path, current_tags)
+        _release_dialog('add', dialog)
+
+    def on_close():
+        # Pencere kapatılınca son değişiklikler de otomatik kaydedilir
+        cancel_autosave()
+        if current_note is not None:
+            autosave()
+        _release_dialog('add', dialog)
+
+    def restore(note_text):
+        # Eski sürüm düzenleyiciye yüklenir; kaydedilene kadar hiçbir şey değişmez
+        text_area.delete("1.0", tk.END)
+        text_area.insert("1.0", note_text)
+        text_area.focus_set()
+
+    # Butonlar (ttk.Button kullanarak ve sağa yaslayarak)
+    history_button = ttk.Button(button_frame, text="Geçmiş...",
+                                command=lambda: show_note_history_dialog(dialog, file_path, restore))
+    history_button.pack(side=tk.LEFT)
+    autosave_label = ttk.Label(button_frame, text="")
+    autosave_label.pack(side=tk.LEFT, padx=(10, 0))
+    load_progress = ttk.Progressbar(button_frame, mode='determinate', length=100) # Sadece büyük notlar yüklenirken
+    cancel_button = ttk.Button(button_frame, text="İptal", command=on_cancel, width=10)
+    cancel_button.pack(side=tk.RIGHT, padx=(5, 0)) # Sağında boşluk yok
+    save_button = ttk.Button(button_frame, text="Kaydet", command=on_save, width=10, style="Accent.TButton") # Varsa vurgulu stil dene
+    save_button.pack(side=tk.RIGHT, padx=(0, 5)) # Sağına boşluk
+    for button in (save_button, history_button):
+        button.state(['disabled']) # Not okunana kadar
+
+    # Olaylar ve kısayollar
+    dialog.protocol("WM_DELETE_WINDOW", on_close)
+    dialog.bind('<Control-Return>', lambda e: on_save())
+    dialog.bind('<Control-s>', lambda e: on_save()) # Ctrl+S ile kaydet
+    dialog.bind('<Escape>', lambda e: on_cancel())
+
+    def on_map(event):
+        nonlocal shown_since
+        if event.widget is dialog and shown_since is not None:
+            note_stats.record('ui.add_dialog_visible', time.perf_counter() - shown_since) # İstekten görünene kadar
+            shown_since = None
+
+    dialog.bind('<Map>', on_map)
+
+    def open_note(path, requested_at=None):
+        nonlocal file_path, opened_at, shown_since, current_note, saved_note, current_tags, saved_tags
+        cancel_autosave()
+        dialog.session += 1
+        file_path = path
+        opened_at = time.perf_counter()
+        shown_since = requested_at or opened_at
+        current_note = saved_note = None
+        current_tags = saved_tags = []
+        loaded_tags.clear()
+
+        dialog.title(f"'{_short_file_name(file_path)}' için Not")
+        label.config(text=f"'{os.path.basename(file_path)}' dosyası için notunuz:")
+        _replace_text(text_area, LOADING_TEXT)
+        text_area.edit_modified(False)
+        tags_var.set("") # current_note None: otomatik kayıt tetiklenmez
+        tags_entry.state(['disabled'])
+        for button in (save_button, history_button):
+            button.state(['disabled'])
+        autosave_label.config(text="")
+        load_progress.pack_forget()
+
+        _center_window(dialog, *NOTE_DIALOG_SIZE)
+        dialog.attributes("-topmost", True)
+        dialog.deiconify()
+        dialog.lift()
+        dialog.after(100, lambda: dialog.attributes("-topmost", False))
+        load()
+
+    dialog.open_note = open_note
+    return dialog
+
+def show_note_history_dialog(parent, file_path, on_restore):
+    """
+    Notun eski sürümlerini listeler; seçilen sürüm önizlenir ve "Bu Sürümü Yükle"
+    ile on_restore(metin) çağrılır (not düzenleme penceresine yüklenir). Geçmiş
+    DB thread'inde okunur, pencere okuma bitince açılır.
+    """
+    note_history(file_path, lambda history: _show_note_history(parent, file_path, history, on_restore), owner=parent)
+
+def _show_note_history(parent, file_path, history, on_restore):
+    if not history:
+        messagebox.showinfo("Not Geçmişi", "Bu not için kayıtlı eski sürüm yok.", parent=parent)
+        return
+
+    dialog = tk.Toplevel(parent)
+    dialog.title(f"'{os.path.basename(file_path)}' Not Geçmişi")
+    dialog.geometry("600x400")
+    dialog.minsize(450, 300)
+    dialog.configure(bg=BG_COLOR)
+    dialog.transient(parent)
+
+    try:
+        hwnd = int(dialog.frame(), 16)
+        _set_dark_title_bar(hwnd)
+    except: pass
+
+    main_frame = ttk.Frame(dialog, padding=(15, 15, 15, 10))
+    main_frame.pack(expand=True, fill="both")
+
+    # Sürüm listesi (sol) ve seçili sürümün metni (sağ)
+    content_frame = ttk.Frame(main_frame)
+    content_frame.pack(expand=True, fill="both", pady=(0, 15))
+    version_listbox = Listbox(
+        content_frame,
+        width=24,
+        exportselection=False,
+        font=TEXT_FONT,
+        bg=BG_COLOR,
+        fg=FG_COLOR,
+        relief=tk.FLAT,
+        borderwidth=0
+    )
+    version_listbox.pack(side=tk.LEFT, fill="y", padx=(0, 10))
+    for saved_at, _, note_text in history:
+        label = time.strftime('%d.%m.%Y %H:%M', time.localtime(saved_at))
+        version_listbox.insert(tk.END, f"{label}  {_format_size(len(note_text.encode('utf-8')))}" if note_text
+                               else f"{label}  (silinmiş)")
+
+    text_container_frame = ttk.Frame(content_frame, relief="solid", borderwidth=1)
+    text_container_frame.pack(side=tk.LEFT, expand=True, fill="both")
+    text_area = scrolledtext.ScrolledText(
+        text_container_frame,
+        wrap=tk.WORD,
+        font=TEXT_FONT,
+        bg=BG_COLOR,
+        fg=FG_COLOR,
+        padx=5,
+        pady=5,
+        relief=tk.FLAT,
+        borderwidth=0
+    )
+    text_area.pack(expand=True, fill="both")
+
+    def selected_text():
+        selection = version_listbox.curselection()
+        return history[selection[0]][2] if selection else None
+
+    def on_select(event=None):
+        text_area.config(state=tk.NORMAL)
+        text_area.delete("1.0", tk.END)
+        text_area.insert("1.0", selected_text() or "")
+        text_area.config(state=tk.DISABLED)
+
+    def on_restore_clicked():
+        note_text = selected_text()
+        if note_text is None:
+            return
+        on_restore(note_text)
+        dialog.destroy()
+
+    version_listbox.bind('<<ListboxSelect>>', on_select)
+    version_listbox.bind('<Double-Button-1>', lambda e: on_restore_clicked())
+    version_listbox.selection_set(0)
+    on_select()
+
+    button_frame = ttk.Frame(main_frame)
+    button_frame.pack(fill=tk.X, anchor='se')
+    close_button = ttk.Button(button_frame, text="Kapat", command=dialog.destroy, width=10)
+    close_button.pack(side=tk.RIGHT, padx=(5, 0))
+    restore_button = ttk.Button(button_frame, text="Bu Sürümü Yükle", command=on_restore_clicked, style="Accent.TButton")
+    restore_button.pack(side=tk.RIGHT, padx=(0, 5))
+
+    dialog.protocol("WM_DELETE_WINDOW", dialog.destroy)
+    dialog.bind('<Escape>', lambda e: dialog.destroy())
+    dialog.bind('<Return>', lambda e: on_restore_clicked())
+
+    _center_window(dialog)
+    dialog.lift()
+    version_listbox.focus_set()
+
+def show_batch_add_note_dialog_internal(parent_root, file_paths):
+    """Birden çok dosyaya aynı notu uygulayan Toplevel penceresini gösterir."""
+    global batch_add_dialog
+    paths = list(file_paths)
+
+    dialog = tk.Toplevel(parent_root)
+    dialog.geometry("550x480")
+    dialog.minsize(400, 350)
+    dialog.configure(bg=BG_COLOR)
+    dialog.attributes("-topmost", True)
+    batch_add_dialog = dialog
+
+    try:
+        hwnd = int(dialog.frame(), 16)
+        _set_dark_title_bar(hwnd)
+    except: pass
+
+    main_frame = ttk.Frame(dialog, padding=(15, 15, 15, 10))
+    main_frame.pack(expand=True, fill="both")
+
+    label = ttk.Label(main_frame, font=LABEL_FONT)
+    label.pack(pady=(0, 5), anchor='w')
+
+    # Seçili dosyaların listesi
+    list_frame = ttk.Frame(main_frame)
+    list_frame.pack(fill="x", pady=(0, 10))
+    list_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
+    path_listbox = Listbox(
+        list_frame,
+        height=5,
+        yscrollcommand=list_scrollbar.set,
+        font=TEXT_FONT,
+        bg=BG_COLOR,
+        fg=FG_COLOR,
+        relief=tk.FLAT,
+        borderwidth=0
+    )
+    list_scrollbar.config(command=path_listbox.yview)
+    list_scrollbar.pack(side=tk.RIGHT, fill="y")
+    path_listbox.pack(side=tk.LEFT, expand=True, fill="x")
+
+    text_container_frame = ttk.Frame(main_frame, relief="solid", borderwidth=1)
+    text_container_frame.pack(expand=True, fill="both", pady=(0, 15))
+
+    text_area = scrolledtext.ScrolledText(
+        text_container_frame,
+        wrap=tk.WORD,
+        height=10,
+        width=50,
+        font=TEXT_FONT,
+        bg=BG_COLOR,
+        fg=FG_COLOR,
+        padx=5,
+        pady=5,
+        relief=tk.FLAT,
+        borderwidth=0
+    )
+    text_area.pack(expand=True, fill="both")
+    text_area.focus_set()
+
+    def add_paths(new_paths):
+        """Pencere açıkken gelen yeni --add yollarını listeye ekler."""
+        known = set(paths)
+        for path in new_paths:
+            if path not in known:
+                known.add(path)
+                paths.append(path)
+                path_listbox.insert(tk.END, path)
+        dialog.title(f"{len(paths)} Dosya için Not")
+        label.config(text=f"Seçili {len(paths)} dosyanın tümü için notunuz:")
+
+    paths.clear()
+    add_paths(file_paths)
+    dialog.add_paths = add_paths
+
+    button_frame = ttk.Frame(main_frame)
+    button_frame.pack(fill=tk.X, anchor='se')
+
+    def on_close():
+        global batch_add_dialog
+        if batch_add_dialog is dialog:
+            batch_add_dialog = None
+        dialog.destroy()
+
+    def on_save():
+        new_note = text_area.get("1.0", tk.END).strip()
+        if not new_note and not messagebox.askyesno(
+                "Onay", f"Not boş. Seçili {len(paths)} dosyanın notları silinecek.\n\nEmin misiniz?",
+                icon='warning', parent=dialog):
+            return
+        save_notes(paths, new_note)
+        on_close()
+
+    cancel_button = ttk.Button(button_frame, text="İptal", command=on_close, width=10)
+    cancel_button.pack(side=tk.RIGHT, padx=(5, 0))
+    save_button = ttk.Button(button_frame, text="Tümüne Kaydet", command=on_save, style="Accent.TButton")
+    save_button.pack(side=tk.RIGHT, padx=(0, 5))
+
+    dialog.protocol("WM_DELETE_WINDOW", on_close)
+    dialog.bind('<Control-Return>', lambda e: on_save())
+    dialog.bind('<Control-s>', lambda e: on_save())
+    dialog.bind('<Escape>', lambda e: on_close())
+
+    _center_window(dialog)
+    dialog.lift()
+    dialog.after(100, lambda: dialog.attributes("-topmost", False))
+
+def queue_add_request(file_paths):
+    """
+    --add isteklerini kısa bir süre toplar. Explorer'da çoklu seçimde her dosya
+    için ayrı süreç başlar; bu istekler tek bir pencerede birleştirilir.
+    (Tk thread'inde çalışır.)
+    """
+    global add_batch_timer
+    if batch_add_dialog and batch_add_dialog.winfo_exists():
+        batch_add_dialog.add_paths(file_paths) # Açık toplu pencereye ekle
+        return
+
+    pending_add_paths.extend(file_paths)
+    # Her yeni istek süreyi yeniden başlatır; istekler kesilince pencere açılır
+    if add_batch_timer is not None:
+        app_root.after_cancel(add_batch_timer)
+    add_batch_timer = app_root.after(ADD_BATCH_WINDOW_MS, flush_add_requests)
+
+def flush_add_requests():
+    """Toplanan --add yolları için tek (veya çoklu) not penceresi açar."""
+    global add_batch_timer
+    add_batch_timer = None
+    paths = list(dict.fromkeys(pending_add_paths)) # Tekrarları at, sırayı koru
+    pending_add_paths.clear()
+    if len(paths) == 1:
+        show_add_note_dialog_internal(app_root, paths[0])
+    elif paths:
+        show_batch_add_note_dialog_internal(app_root, paths)
+
+
+def show_view_note_dialog_internal(parent_root, file_path, requested_at=None):
+    """
+    Notu görüntüleme penceresini gösterir. Pencere havuzdan alınır (bkz.
+    DIALOG_POOL_SIZE) ve hemen açılır, not DB thread'inde okunur. Yolu içeren
+    klasörlere bırakılmış notlar da (en yakın klasör önce) notun altında
+    gösterilir; hiçbiri yoksa pencere bilgi mesajıyla kapanır. requested_at:
+    isteğin geldiği an (perf_counter; IPC'de handle_request damgalar).
+    """
+    noted_paths = note_store.noted_paths
+    if noted_paths.loaded and not _writes_pending() and file_path not in noted_paths \
+            and not noted_paths.select_keys(note_store.ancestor_keys(file_path)):
+        # Bellekteki küme ne dosyanın ne de klasörlerinin notu olduğunu biliyor; veritabanını beklemeye gerek yok
+        # (yazılmayı bekleyen not varsa küme eksik olabilir, not her zamanki gibi okunur)
+        messagebox.showinfo(f"'{_short_file_name(file_path)}' için Not", f"Bu dosya için kayıtlı bir not bulunamadı.", parent=parent_root)
+        return
+    _take_dialog('view', parent_root).open_note(file_path, requested_at)
+
+def _build_view_note_dialog(parent_root):
+    """
+    Notu görüntüleme Toplevel penceresini gizli olarak kurar (ttk ve stil ile);
+    dialog.open_note(dosya_yolu) doldurup gösterir, kapanınca havuza döner.
+    """
+    file_path = None
+    opened_at = shown_since = None # Açılış anı / görünene kadar ölçülen istek anı
+
+    dialog = tk.Toplevel(parent_root)
+    dialog.withdraw() # open_note'a kadar gizli
+    dialog.session = 0 # Her açılış ve kapanışta artar (bkz. _if_current)
+    dialog.geometry("{}x{}".format(*NOTE_DIALOG_SIZE))
+    dialog.minsize(400, 300)
+    dialog.configure(bg=BG_COLOR)
+
+    try:
+        hwnd = int(dialog.frame(), 16)
+        _set_dark_title_bar(hwnd)
+    except: pass
+
+    main_frame = ttk.Frame(dialog, padding=(15, 15, 15, 10))
+    main_frame.pack(expand=True, fill="both")
+
+    # Sadece okunabilir metin alanı
+    text_container_frame = ttk.Frame(main_frame, relief="solid", borderwidth=1)
+    text_container_frame.pack(expand=True, fill="both", pady=(0, 15))
+
+    text_area = scrolledtext.ScrolledText(
+        text_container_frame,
+        wrap=tk.WORD,
+        height=10,
+        width=50,
+        font=TEXT_FONT,
+        bg=BG_COLOR,
+        fg=FG_COLOR,
+        padx=5,
+        pady=5,
+        relief=tk.FLAT,
+        borderwidth=0
+    )
+    text_area.pack(expand=True, fill="both")
+    text_area.tag_configure('folder', font=LABEL_FONT, foreground=MUTED_FG) # Klasör notu başlıkları
+    text_area.insert(tk.INSERT, LOADING_TEXT)
+    text_area.config(state=tk.DISABLED) # Düzenlemeyi engelle
+
+    # Klasör notları önce istenir (DB işleri sırayla çalışır, notun son parçasından önce
+    # gelirler); dosyanın notu parça parça eklenir, büyük notlarda ilerleme çubuğu görünür.
+    folder_notes = []
+    chunks_shown = False
+
+    def load():
+        nonlocal chunks_shown
+        chunks_shown = False
+        current = lambda func: _if_current(dialog, func)
+        get_ancestor_notes(file_path, current(on_folders_loaded), owner=dialog)
+        stream_note(file_path, current(on_chunk), current(on_loaded), on_error=current(on_load_error), owner=dialog)
+
+    def on_folders_loaded(notes):
+        folder_notes[:] = notes
+
+    def on_chunk(text, reader):
+        nonlocal chunks_shown
+        if not chunks_shown: # İlk parça LOADING_TEXT'in yerini alır
+            chunks_shown = True
+            _replace_text(text_area, "")
+            if not reader.done:
+                load_progress.pack(side=tk.LEFT)
+        _append_text(text_area, text)
+        load_progress['value'] = _load_percent(reader)
+
+    def on_loaded(reader):
+        load_progress.pack_forget()
+        if not chunks_shown and not folder_notes:
+            _release_dialog('view', dialog)
+            messagebox.showinfo(f"'{_short_file_name(file_path)}' için Not", f"Bu dosya için kayıtlı bir not bulunamadı.", parent=parent_root)
+            return
+        text_area.config(state=tk.NORMAL)
+        if not chunks_shown:
+            text_area.delete("1.0", tk.END)
+            text_area.insert(tk.END, "Bu dosyanın kendi notu yok.", 'folder')
+        for folder_path, folder_note in reversed(folder_notes): # En yakın klasör önce
+            text_area.insert(tk.END, f"\n\nKlasör notu: {folder_path}\n", 'folder')
+            text_area.insert(tk.END, folder_note)
+        text_area.config(state=tk.DISABLED)
+        note_stats.record('ui.view_dialog_open', time.perf_counter() - opened_at)
+
+    def on_load_error(error):
+        if isinstance(error, note_store.NoteChangedError): # Okunurken kaydedildi: baştan oku
+            _replace_text(text_area, LOADING_TEXT)
+            load()
+            return
+        show_error(f"Not okunurken hata oluştu: {error}", parent=parent_root)
+        _release_dialog('view', dialog)
+
+    def on_close():
+        _release_dialog('view', dialog)
+
+    # Kapat butonu için çerçeve
+    button_frame = ttk.Frame(main_frame)
+    button_frame.pack(fill=tk.X, anchor='se')
+
+    close_button = ttk.Button(button_frame, text="Kapat", command=on_close, width=10)
+    close_button.pack(side=tk.RIGHT)
+    load_progress = ttk.Progressbar(button_frame, mode='determinate', length=100) # Sadece büyük notlar yüklenirken
+
+    dialog.protocol("WM_DELETE_WINDOW", on_close)
+    dialog.bind('<Escape>', lambda e: on_close())
+
+    def on_map(event):
+        nonlocal shown_since
+        if event.widget is dialog and shown_since is not None:
+            note_stats.record('ui.view_dialog_visible', time.perf_counter() - shown_since) # İstekten görünene kadar
+            shown_since = None
+
+    dialog.bind('<Map>', on_map)
+
+    def open_note(path, requested_at=None):
+        nonlocal file_path, opened_at, shown_since
+        dialog.session += 1
+        file_path = path
+        opened_at = time.perf_counter()
+        shown_since = requested_at or opened_at
+        folder_notes.clear()
+
+        dialog.title(f"'{_short_file_name(file_path)}' Notu")
+        _replace_text(text_area, LOADING_TEXT)
+        text_area.yview_moveto(0)
+        load_progress.pack_forget()
+
+        _center_window(dialog, *NOTE_DIALOG_SIZE)
+        dialog.attributes("-topmost", True)
+        dialog.deiconify()
+        dialog.lift()
+        dialog.after(100, lambda: dialog.attributes("-topmost", False))
+        load()
+
+    dialog.open_note = open_note
+    return dialog
+
+
+DIALOG_BUILDERS = {'add': _build_add_note_dialog, 'view': _build_view_note_dialog} # Havuz türleri
+
+
+EMPTY_LIST_TEXT = "(Kayıtlı not bulunamadı)"
+
+class NoteListModel:
+    """
+    "Tüm Notlar" listesinin sıralı dizini. Yollar kanonik anahtarlarıyla (path_key)
+    birlikte paralel listelerde tutulur; sıralamayı veritabanı dizini yapar. Tek
+    bir not eklenip silindiğinde konum ikili arama ile bulunur, liste baştan kurulmaz.
+    """
+    def __init__(self, sort_key=note_store.path_key):
+        self.sort_key = sort_key
+        self._keys = []
+        self._paths = []
+
+    def load(self, rows):
+        """Listeyi anahtara göre sıralı (anahtar, yol) çiftleriyle baştan kurar."""
+        self._keys, self._paths = [], []
+        for key, path in rows:
+            self._keys.append(key)
+            self._paths.append(path)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __getitem__(self, index):
+        return self._paths[index]
+
+    def index_of(self, path):
+        """Yolun (farklı yazılmış olsa da) listedeki sırasını döndürür (yoksa -1)."""
+        key = self.sort_key(path)
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return index
+        return -1
+
+    def insert(self, path):
+        """Yolu sıralı konumuna ekler; (sıra, yeni_mi) döndürür."""
+        index = self.index_of(path)
+        if index != -1:
+            return index, False
+        key = self.sort_key(path)
+        index = bisect_right(self._keys, key)
+        self._keys.insert(index, key)
+        self._paths.insert(index, path)
+        return index, True
+
+    def remove(self, path):
+        """Yolu listeden çıkarır; eski sırasını döndürür (yoksa -1)."""
+        index = self.index_of(path)
+        if index != -1:
+            del self._keys[index]
+            del self._paths[index]
+        return index
+
+
+class SearchResultModel:
+    """Arama sonuçları; VirtualListbox için NoteListModel gibi davranır ama FTS sırasını korur."""
+    def __init__(self, paths):
+        self._paths = list(paths)
+        self._index = {path: i for i, path in enumerate(self._paths)}
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __getitem__(self, index):
+        return self._paths[index]
+
+    def index_of(self, path):
+        return self._index.get(path, -1)
+
+
+class VirtualListbox(ttk.Frame):
+    """
+    Sadece görünen satırları çizen liste. İçteki Listbox ekrana sığan kadar
+    satır tutar; kaydırma ve seçim model üzerindeki sıra ile yapılır, bu yüzden
+    100 binlerce notta bile çizim maliyeti pencere yüksekliğiyle sınırlıdır.
+    """
+    def __init__(self, parent, model, on_select=None, empty_text="", row_style=None, **listbox_options):
+        super().__init__(parent)
+        self.model = model
+        self.on_select = on_select # Seçim değiştiğinde çağrılır
+        self.row_style = row_style # row_style(yol) -> itemconfig seçenekleri veya None
+        self.empty_text = empty_text
+        self.top = 0 # Görünen ilk satırın model sırası
+        self.selected = -1 # Seçili satırın model sırası
+        font = listbox_options.get('font') or "TkDefaultFont"
+        self._font = font if isinstance(font, tkFont.Font) else tkFont.nametofont(font)
+
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.listbox = Listbox(self, exportselection=False, activestyle='none', **listbox_options)
+        self.listbox.grid(row=0, column=0, sticky='nsew')
+        self.scrollbar.grid(row=0, column=1, sticky='ns')
+
+        # Listbox'ın kendi seçim/kaydırma davranışı yerine modeli kullan ("break")
+        self.listbox.bind("<Configure>", lambda e: self.render())
+        self.listbox.bind("<Button-1>", self._on_click)
+        self.listbox.bind("<B1-Motion>", lambda e: "break")
+        self.listbox.bind("<MouseWheel>", lambda e: self._scroll_by(-3 if e.delta > 0 else 3, 'units'))
+        self.listbox.bind("<Button-4>", lambda e: self._scroll_by(-3, 'units')) # X11
+        self.listbox.bind("<Button-5>", lambda e: self._scroll_by(3, 'units'))
+        self.listbox.bind("<Up>", lambda e: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self._move_selection(1))
+        self.listbox.bind("<Prior>", lambda e: self._move_selection(-self.visible_rows()))
+        self.listbox.bind("<Next>", lambda e: self._move_selection(self.visible_rows()))
+        self.listbox.bind("<Home>", lambda e: self._move_selection(-len(self.model)))
+        self.listbox.bind("<End>", lambda e: self._move_selection(len(self.model)))
+
+    def set_model(self, model):
+        """Gösterilen modeli değiştirir (örn. tüm notlar <-> arama sonuçları)."""
+        self.model = model
+        self.top = 0
+        self.selected = -1
+        self.render()
+
+    def bind_rows(self, sequence, func):
+        """İç Listbox'a olay bağlar (çift tık, sağ tık vb.)."""
+        self.listbox.bind(sequence, func)
+
+    def visible_rows(self):
+        """Ekrana sığan satır sayısı."""
+        row_height = self._font.metrics('linespace') + 1 + 2 * int(self.listbox.cget('selectborderwidth'))
+        return max(1, self.listbox.winfo_height() // row_height)
+
+    def render(self):
+        """Görünen satırları modelden yeniden çizer."""
+        rows = self.visible_rows()
+        count = len(self.model)
+        self.top = max(0, min(self.top, count - rows))
+        self.listbox.delete(0, tk.END)
+        if count == 0:
+            if self.empty_text:
+                self.listbox.insert(tk.END, self.empty_text)
+            self.scrollbar.set(0.0, 1.0)
+            return
+        end = min(count, self.top + rows + 1) # Yarım görünen son satır için +1
+        self.listbox.insert(tk.END, *(self.model[i] for i in range(self.top, end)))
+        if self.row_style:
+            for row, i in enumerate(range(self.top, end)):
+                options = self.row_style(self.model[i])
+                if options:
+                    self.listbox.itemconfig(row, **options)
+        if self.top <= self.selected < end:
+            self.listbox.selection_set(self.selected - self.top)
+        self.scrollbar.set(self.top / count, min(1.0, (self.top + rows) / count))
+
+    def index_at(self, y):
+        """Y koordinatındaki satırın model sırası (boş alan ise -1)."""
+        if not len(self.model):
+            return -1
+        nearest = self.listbox.nearest(y)
+        bbox = self.listbox.bbox(nearest)
+        if nearest < 0 or not bbox or y > bbox[1] + bbox[3] + 2:
+            return -1
+        return self.top + nearest
+
+    def selected_path(self):
+        """Seçili satırın yolu (seçim yoksa None)."""
+        if 0 <= self.selected < len(self.model):
+            return self.model[self.selected]
+        return None
+
+    def select(self, index, notify=True):
+        """Satırı seçer, görünür alana kaydırır ve isteğe bağlı on_select çağırır."""
+        count = len(self.model)
+        self.selected = max(-1, min(index, count - 1))
+        if self.selected != -1:
+            self.see(self.selected)
+        self.render()
+        if notify and self.on_select:
+            self.on_select()
+
+    def see(self, index):
+        rows = self.visible_rows()
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + rows:
+            self.top = index - rows + 1
+
+    def row_inserted(self, index):
+        """Modelde 'index' sırasına satır eklendikten sonra görünümü kaydırır."""
+        if index <= self.selected:
+            self.selected += 1
+        if index < self.top:
+            self.top += 1 # Görünen satırlar yerinde kalsın
+        self.render()
+
+    def row_removed(self, index):
+        """Modelden 'index' sırasındaki satır silindikten sonra görünümü düzeltir."""
+        if index < self.selected:
+            self.selected -= 1
+        elif index == self.selected:
+            # Silinen yerine aynı sıradaki (yoksa son) satır seçilir
+            self.selected = min(self.selected, len(self.model) - 1)
+        if index < self.top:
+            self.top -= 1
+        self.render()
+
+    def _on_click(self, event):
+        self.listbox.focus_set()
+        index = self.index_at(event.y)
+        if index != -1:
+            self.select(index)
+        return "break"
+
+    def _move_selection(self, delta):
+        if len(self.model):
+            self.select(max(0, self.selected + delta))
+        return "break"
+
+    def _scroll_by(self, amount, what):
+        step = self.visible_rows() if what == 'pages' else 1
+        self.top += int(amount) * step
+        self.render()
+        return "break"
+
+    def _on_scrollbar(self, *args):
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * len(self.model))
+            self.render()
+        elif args[0] == 'scroll':
+            self._scroll_by(args[1], args[2])
+
+
+class AllNotesWindow(tk.Toplevel):
+    """Tüm notları listeleyen ve yöneten pencere sınıfı (ttk ve stil ile)."""
+    def __init__(self, parent, folder=None):
+        global all_notes_window, style # Stili globalden veya parent'tan almamız gerekebilir
+        if all_notes_window and all_notes_window.winfo_exists():
+            print("Mevcut 'Tüm Notlar' penceresine odaklanılıyor.")
+            if folder != all_notes_window.folder:
+                all_notes_window.set_folder(folder)
+            all_notes_window.lift()
+            all_notes_window.focus_set()
+            self.after(0, self.destroy)
+            return
+
+        super().__init__(parent)
+        all_notes_window = self
+        self.parent = parent
+        self.folder = folder # Sadece bu klasörün notları gösterilir (None: tüm notlar)
+        self.notes_meta = {} # dosya_yolu -> (boyut_bayt, değiştirme_zamanı, dosya_var_mı); metinler burada tutulmaz
+        self.list_request = 0 # Son liste/arama isteğinin numarası; eski yanıtlar yok sayılır
+        self.search_request = 0
+        self.facet_request = 0
+        self.preview_request = 0 # Önizlemesi yüklenen seçimin numarası; eski parçalar atılır
+        self.body_cache = note_store.BodyCache() # Seçildikçe okunan not metinleri
+        self.selected_tags = [] # Etiket süzgeci (boşsa süzülmez)
+        self.facet_names = [] # Etiket panelindeki satırların etiket adları
+
+        # Stili al (setup_styles çağrılmış olmalı)
+        try:
+            self.style = ttk.Style(self)
+            # Temanın renklerini tekrar alalım, Toplevel için farklı olabilir
+            self.bg_color = self.style.lookup('TFrame', 'background')
+            self.fg_color = self.style.lookup('TLabel', 'foreground')
+            self.select_bg = self.style.lookup('TListbox', 'selectbackground', default='#0078D7')
+            self.select_fg = self.style.lookup('TListbox', 'selectforeground', default='white')
+            self.focus_color = self.style.lookup('TButton', 'focuscolor', default='blue')
+        except Exception: # Eğer stil alınamazsa varsayılan renkler kullanılır
+             self.bg_color = BG_COLOR or 'SystemWindow'
+             self.fg_color = FG_COLOR or 'SystemWindowText'
+             self.select_bg = '#0078D7'
+             self.select_fg = 'white'
+             self.focus_color = 'blue'
+
+
+        self.geometry("750x550") # Biraz daha büyük
+        self.minsize(550, 350)
+        self.configure(bg=self.bg_color) # Arka plan rengini ayarla
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.attributes("-topmost", True)
+
+        try:
+            hwnd = int(self.frame(), 16)
+            _set_dark_title_bar(hwnd)
+        except: pass
+
+        # --- Klasör Kapsamı (--view-all <klasör>) ---
+        self.scope_frame = ttk.Frame(self, padding=(10, 10, 10, 0))
+        self.scope_label = ttk.Label(self.scope_frame, text="", font=LABEL_FONT)
+        self.scope_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Button(self.scope_frame, text="Tüm Notlar", command=lambda: self.set_folder(None)).pack(side=tk.RIGHT)
+        self.recursive_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(self.scope_frame, text="Alt klasörler", variable=self.recursive_var,
+                        command=self.refresh_list).pack(side=tk.RIGHT, padx=(0, 10))
+
+        # --- Ana Çerçeve ve İç Düzen ---
+        main_frame = ttk.Frame(self, padding=(10, 10, 10, 5))
+        main_frame.pack(expand=True, fill="both")
+        self.main_frame = main_frame
+
+        main_frame.columnconfigure(0, weight=3) # Sol sütun (liste)
+        main_frame.columnconfigure(1, weight=0) # Ayırıcı
+        main_frame.columnconfigure(2, weight=4) # Sağ sütun (metin alanı)
+        main_frame.rowconfigure(1, weight=1)    # Widget'ların olduğu satır dikeyde genişlesin
+
+        # --- Etiketler ---
+        ttk.Label(main_frame, text="Not Alınan Dosyalar:", font=LABEL_FONT).grid(row=0, column=0, sticky='nw', pady=(0, 5))
+        ttk.Label(main_frame, text="Seçili Dosyanın Notu:", font=LABEL_FONT).grid(row=0, column=2, sticky='nw', pady=(0, 5))
+
+        # --- Sol Taraf: Dosya Listesi ---
+        list_frame = ttk.Frame(main_frame)
+        list_frame.grid(row=1, column=0, sticky='nsew', padx=(0, 5)) # Sağa boşluk
+        list_frame.rowconfigure(2, weight=1)
+        list_frame.columnconfigure(0, weight=1)
+
+        # Arama kutusu (yazdıkça sonuçlar güncellenir)
+        search_frame = ttk.Frame(list_frame)
+        search_frame.grid(row=0, column=0, sticky='ew', pady=(0, 5))
+        search_frame.columnconfigure(1, weight=1)
+        ttk.Label(search_frame, text="Ara:").grid(row=0, column=0, padx=(0, 5))
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        self.search_entry.grid(row=0, column=1, sticky='ew')
+        self.search_job = None # Bekleyen 'after' arama işi
+        self.search_var.trace_add("write", lambda *args: self.schedule_search())
+        self.search_entry.bind("<Escape>", lambda e: self.search_var.set(""))
+
+        # Etiket süzgeci: seçilen etiketlerin hepsini (VE) veya birini (VEYA) taşıyan
+        # notlar listelenir; parantez içindeki sayılar süzülmüş listeye göredir
+        self.facet_frame = ttk.Frame(list_frame)
+        self.facet_frame.grid(row=1, column=0, sticky='ew', pady=(0, 5))
+        self.facet_frame.columnconfigure(0, weight=1)
+        facet_header = ttk.Frame(self.facet_frame)
+        facet_header.grid(row=0, column=0, columnspan=2, sticky='ew', pady=(0, 2))
+        ttk.Label(facet_header, text="Etiketler:").pack(side=tk.LEFT)
+        self.match_all_var = tk.BooleanVar(value=True)
+        ttk.Radiobutton(facet_header, text="VE", variable=self.match_all_var, value=True,
+                        command=self.on_facet_mode).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Radiobutton(facet_header, text="VEYA", variable=self.match_all_var, value=False,
+                        command=self.on_facet_mode).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(facet_header, text="Temizle", command=self.clear_tag_filter).pack(side=tk.RIGHT)
+        self.facet_list = Listbox(
+            self.facet_frame,
+            height=4,
+            selectmode=tk.MULTIPLE,
+            exportselection=False,
+            font=TEXT_FONT,
+            bg=self.bg_color,
+            fg=self.fg_color,
+            selectbackground=self.select_bg,
+            selectforeground=self.select_fg,
+            highlightthickness=0,
+            relief=tk.FLAT,
+            borderwidth=0
+        )
+        self.facet_list.grid(row=1, column=0, sticky='ew')
+        facet_scrollbar = ttk.Scrollbar(self.facet_frame, orient='vertical', command=self.facet_list.yview)
+        facet_scrollbar.grid(row=1, column=1, sticky='ns')
+        self.facet_list.config(yscrollcommand=facet_scrollbar.set)
+        self.facet_list.bind('<<ListboxSelect>>', self.on_facet_select)
+        self.facet_frame.grid_remove() # Hiç etiket yoksa gizli
+
+        self.model = NoteListModel()
+        self.note_list = VirtualListbox(
+            list_frame,
+            self.model,
+            on_select=self.on_listbox_select,
+            empty_text=EMPTY_LIST_TEXT,
+            row_style=self.row_style,
+            font=TEXT_FONT,
+            bg=self.bg_color, # Tema arka planı
+            fg=self.fg_color, # Tema metin rengi
+            highlightthickness=1,
+            highlightbackground=self.bg_color, # Kenarlık rengi
+            highlightcolor=self.focus_color, # Odak rengi
+            selectbackground=self.select_bg, # Seçim arka planı
+            selectforeground=self.select_fg, # Seçim metin rengi
+            relief=tk.FLAT,
+            borderwidth=0
+        )
+        self.note_list.grid(row=2, column=0, sticky='nsew')
+
+        # --- Dikey Ayırıcı ---
+        sep = ttk.Separator(main_frame, orient='vertical')
+        sep.grid(row=1, column=1, sticky='ns', padx=5)
+
+        # --- Sağ Taraf: Not Görüntüleyici ---
+        # Note_frame'i oluştur ve grid ile yerleştir
+        note_frame = ttk.Frame(main_frame)
+        note_frame.grid(row=1, column=2, sticky='nsew', padx=(5, 0)) # Sola boşluk
+        # note_frame'in içindeki satır ve sütunların genişlemesini sağla
+        note_frame.rowconfigure(0, weight=1)
+        note_frame.columnconfigure(0, weight=1)
+
+        # ScrolledText için container (kenarlık vs. için)
+        # Bu container'ı note_frame içinde grid ile yerleştir
+        text_container_frame = ttk.Frame(note_frame, relief="solid", borderwidth=1)
+        text_container_frame.grid(row=0, column=0, columnspan=2, sticky='nsew')
+
+        # text_container_frame'in de içindekilerin genişlemesi için konfigüre et
+        text_container_frame.rowconfigure(0, weight=1)
+        text_container_frame.columnconfigure(0, weight=1)
+
+        # ScrolledText widget'ını oluştur
+        self.note_text_area = scrolledtext.ScrolledText(
+            text_container_frame, # Parent olarak container'ı ver
+            wrap=tk.WORD,
+            height=10, # Başlangıç yüksekliği
+            width=40,  # Başlangıç genişliği
+            font=TEXT_FONT,
+            bg=self.bg_color,
+            fg=self.fg_color,
+            padx=5,
+            pady=5,
+            relief=tk.FLAT,
+            borderwidth=0,
+            state=tk.DISABLED # Başlangıçta sadece okunabilir
+        )
+        # ScrolledText'i text_container_frame içinde grid ile yerleştir
+        self.note_text_area.grid(row=0, column=0, sticky='nsew') # container içinde tek eleman
+
+        # Seçili notun boyutu ve son değiştirme zamanı
+        self.note_info_label = ttk.Label(note_frame, text="")
+        self.note_info_label.grid(row=1, column=0, sticky='w', pady=(5, 0))
+        # Büyük notlarda önizleme kısaltılır; kalanı istenince parça parça yüklenir
+        self.load_more_button = ttk.Button(note_frame, text="Devamını Yükle")
+        self.load_more_button.grid(row=1, column=1, sticky='e', pady=(5, 0))
+        self.load_more_button.grid_remove()
+        self.load_progress = ttk.Progressbar(note_frame, mode='determinate', length=100)
+        self.load_progress.grid(row=1, column=1, sticky='e', pady=(5, 0))
+        self.load_progress.grid_remove()
+
+        # --- Alt Butonlar ---
+        button_frame = ttk.Frame(self, padding=(10, 5, 10, 10))
+        button_frame.pack(fill=tk.X)
+
+        refresh_button = ttk.Button(button_frame, text="Yenile", command=self.refresh_list, width=10)
+        refresh_button.pack(side=tk.LEFT, padx=(0,5))
+        remove_button = ttk.Button(button_frame, text="Kaldır", command=self.remove_selected_note, width=10)
+        remove_button.pack(side=tk.LEFT, padx=(0, 5))
+        edit_button = ttk.Button(button_frame, text="Düzenle", command=self.edit_selected_note, width=10)
+        edit_button.pack(side=tk.LEFT, padx=(0, 5))
+        check_button = ttk.Button(button_frame, text="Dosyaları Denetle",
+                                  command=lambda: start_file_check_job(notify=True))
+        check_button.pack(side=tk.LEFT, padx=(0, 5))
+        relink_button = ttk.Button(button_frame, text="Taşınanları Bul", command=self.find_moved_notes)
+        relink_button.pack(side=tk.LEFT, padx=(0, 5))
+        purge_button = ttk.Button(button_frame, text="Kayıpları Temizle", command=self.purge_orphan_notes)
+        purge_button.pack(side=tk.LEFT)
+        close_button = ttk.Button(button_frame, text="Kapat", command=self.on_close, width=10)
+        close_button.pack(side=tk.RIGHT)
+
+        # --- Olay Bağlantıları ---
+        self.note_list.bind_rows("<Double-Button-1>", self.edit_selected_note)
+        self.note_list.bind_rows("<Button-3>", self.on_right_click)
+        self.note_list.bind_rows("<Delete>", self.remove_selected_note)
+
+        # --- Başlangıç ---
+        self.set_folder(folder) # Başlığı ayarlar ve listeyi yükler
+        _center_window(self)
+        self.lift()
+        self.after(100, lambda: self.attributes("-topmost", False))
+
+    def set_folder(self, folder):
+        """Gösterilen kapsamı değiştirir: bir klasörün notları veya (None) tüm notlar."""
+        self.folder = folder or None
+        if self.folder:
+            self.title(f"FileNoter Notları - {self.folder}")
+            self.scope_label.config(text=f"Klasör: {self.folder}")
+            self.scope_frame.pack(fill=tk.X, before=self.main_frame)
+        else:
+            self.title("Tüm FileNoter Notları")
+            self.scope_frame.pack_forget()
+        self.refresh_list()
+
+    def in_scope(self, file_path):
+        """Yol bu pencerenin gösterdiği kapsamda mı? (Etiket süzgecinde: yüklenen listede mi?)"""
+        if self.selected_tags:
+            return file_path in self.notes_meta
+        return not self.folder or note_store.path_in_folder(file_path, self.folder, self.recursive_var.get())
+
+    def refresh_list(self):
+        """
+        Listeyi veritabanından baştan yükler (Yenile butonu). Satırlar DB thread'inde
+        okunur; liste boşsa o sırada LOADING_TEXT gösterilir.
+        """
+        print("Liste yenileniyor...")
+        self.list_request += 1
+        request = self.list_request
+        started_at = time.perf_counter()
+        if not len(self.note_list.model):
+            self.note_list.empty_text = LOADING_TEXT
+            self.note_list.render()
+        list_notes(self.folder, self.recursive_var.get(),
+                   lambda rows: self.on_list_loaded(request, rows, started_at), owner=self,
+                   tags=self.selected_tags, match_all=self.match_all_var.get())
+        self.refresh_facets()
+
+    def refresh_facets(self):
+        """Etiket panelini ve sayıları (kapsam ve seçili etiketlere göre) DB thread'inde yeniden okur."""
+        self.facet_request += 1
+        request = self.facet_request
+        tag_facets(self.folder, self.recursive_var.get(), self.selected_tags, self.match_all_var.get(),
+                   lambda facets: self.on_facets_loaded(request, facets), owner=self)
+
+    def on_facets_loaded(self, request, facets):
+        """Etiket panelini kurar; seçili etiketler ve kaydırma konumu korunur."""
+        if request != self.facet_request:
+            return
+        selected_keys = {note_store.tag_key(name) for name in self.selected_tags}
+        top = self.facet_list.yview()[0]
+        self.facet_list.delete(0, tk.END)
+        self.facet_names = [name for name, _ in facets]
+        for index, (name, count) in enumerate(facets):
+            self.facet_list.insert(tk.END, f"{name} ({count})")
+            if note_store.tag_key(name) in selected_keys:
+                self.facet_list.selection_set(index)
+        self.facet_list.yview_moveto(top)
+        if facets:
+            self.facet_frame.grid()
+        else:
+            self.facet_frame.grid_remove()
+        # Seçili bir etiket artık hiçbir notta yoksa (silindi/kapsam değişti) süzgeçten çıkar
+        still_selected = [self.facet_names[index] for index in self.facet_list.curselection()]
+        if len(still_selected) != len(self.selected_tags):
+            self.selected_tags = still_selected
+            self.refresh_list()
+
+    def on_facet_select(self, event=None):
+        self.selected_tags = [self.facet_names[index] for index in self.facet_list.curselection()]
+        self.refresh_list()
+
+    def on_facet_mode(self):
+        if self.selected_tags:
+            self.refresh_list()
+
+    def clear_tag_filter(self):
+        if self.selected_tags:
+            self.facet_list.selection_clear(0, tk.END)
+            self.selected_tags = []
+            self.refresh_list()
+
+    def on_list_loaded(self, request, rows, started_at):
+        """refresh_list() sonucu geldiğinde (Tk thread'inde) listeyi kurar."""
+        if request != self.list_request:
+            return # Bu arada yeni bir yenileme istendi (örn. kapsam değişti)
+        try:
+            self._show_loaded_rows(rows)
+        finally:
+            # İstekten liste ekranda kurulana kadar (sorgu + model + çizim)
+            note_stats.record('ui.refresh_list', time.perf_counter() - started_at)
+
+    def _show_loaded_rows(self, rows):
+        """Okunan satırlarla modeli kurar; yenileme öncesi seçimi korur."""
+        selected_path = self.note_list.selected_path()
+        original_index = self.note_list.selected
+        self.note_list.empty_text = EMPTY_LIST_TEXT
+
+        self.notes_meta = {path: (size, updated_at, exists) for path, size, updated_at, exists, _ in rows}
+        self.body_cache.clear()
+        self.model.load((key, path) for path, _, _, _, key in rows) # Veritabanından sıralı gelir
+        print(f"{len(self.notes_meta)} not yüklendi.")
+        if self.search_var.get().strip():
+            self.run_search() # Arama sonuçları yeni kapsama göre yeniden alınır
+            return
+        self.note_list.model = self.model
+
+        # Yenileme öncesi seçili olanı bulmaya çalış, yoksa aynı sırayı seç
+        new_index_to_select = self.model.index_of(selected_path) if selected_path else -1
+        if new_index_to_select == -1 and original_index != -1:
+            new_index_to_select = min(original_index, len(self.model) - 1)
+
+        self.note_list.selected = -1
+        self.note_list.select(new_index_to_select) # Notu da yükler (on_listbox_select)
+
+    def apply_note_changes(self, changes):
+        """
+        Kaydetme/silme sonrası sadece değişen satırları günceller.
+        changes: [(dosya_yolu, not_metni veya silindiyse None), ...]
+        """
+        selected_path = self.note_list.selected_path()
+        showing_all = self.note_list.model is self.model
+        for file_path, note_text in changes:
+            # Aynı dosya farklı yazılmış olabilir ("C:\Foo" / "c:\foo"); listedeki yazımı kullan
+            index = self.model.index_of(file_path)
+            if index != -1:
+                file_path = self.model[index]
+            if note_text is None:
+                self.notes_meta.pop(file_path, None)
+                self.body_cache.discard(file_path)
+                index = self.model.remove(file_path)
+                if index != -1 and showing_all:
+                    self.note_list.row_removed(index)
+            elif self.in_scope(file_path):
+                exists = self.notes_meta.get(file_path, (0, 0, None))[2] # Kaydetmek dosya durumunu değiştirmez
+                self.notes_meta[file_path] = (len(note_text.encode('utf-8')), time.time(), exists)
+                self.body_cache.put(file_path, note_text)
+                index, is_new = self.model.insert(file_path)
+                if is_new and showing_all:
+                    self.note_list.row_inserted(index)
+        # Arama açıksa sonuçlar yeniden hesaplanır
+        if self.search_var.get().strip():
+            self.schedule_search()
+        # Etiketler değişmiş olabilir: süzgeç açıksa liste, değilse sadece etiket sayıları yeniden okunur
+        if self.selected_tags:
+            self.refresh_list()
+        else:
+            self.refresh_facets()
+        # Seçili not değiştiyse veya silindiyse sağdaki alanı güncelle
+        if any(path == selected_path for path, _ in changes):
+            self.on_listbox_select()
+
+    def row_style(self, file_path):
+        """Son taramada dosyası bulunamayan notları farklı renkte gösterir."""
+        meta = self.notes_meta.get(file_path)
+        if meta and meta[2] == 0:
+            return {'foreground': MISSING_FG}
+        return None
+
+    def schedule_search(self):
+        """Yazma durunca aramayı çalıştırır (her tuşta sorgu atmamak için)."""
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        """
+        Arama kutusu boşsa tüm notları, değilse arama sonuçlarını gösterir (sonuçlar
+        DB thread'inde bulunur); seçili not sonuçlarda varsa seçili kalır.
+        """
+        self.search_job = None
+        self.search_request += 1
+        request = self.search_request
+        query = self.search_var.get()
+        if not query.strip():
+            self.show_model(self.model)
+            return
+        search_notes(query, lambda paths: self.on_search_done(request, paths), owner=self)
+
+    def on_search_done(self, request, paths):
+        if request == self.search_request: # Yazmaya devam edildiyse eski sonuçlar gösterilmez
+            self.show_model(SearchResultModel(path for path in paths if self.in_scope(path)))
+
+    def show_model(self, model):
+        selected_path = self.note_list.selected_path()
+        self.note_list.set_model(model)
+        index = model.index_of(selected_path) if selected_path else -1
+        self.note_list.select(index if index != -1 else (0 if len(model) else -1))
+
+    def on_listbox_select(self, event=None):
+        """Listede seçim değiştiğinde notu sağdaki alanda gösterir."""
+        selected_path = self.note_list.selected_path()
+        self.preview_request += 1
+        self.load_more_button.grid_remove()
+        self.load_progress.grid_remove()
+        info = ""
+        note_content = ""
+        if selected_path in self.notes_meta:
+            # Metin sadece seçildiğinde (DB thread'inde) okunur; o sırada LOADING_TEXT görünür.
+            # Büyük notların sadece başı okunur (önbelleğe de alınmaz).
+            size, updated_at, exists = self.notes_meta[selected_path]
+            note_content = self.body_cache.get(selected_path) if size <= PREVIEW_BYTES else None
+            if note_content is None:
+                note_content = LOADING_TEXT
+                if size > PREVIEW_BYTES:
+                    self.load_preview(selected_path, self.preview_request)
+                else:
+                    get_note(selected_path, lambda text: self.on_body_loaded(selected_path, text), owner=self)
+            info = f"{_format_size(size)}  ·  Son değişiklik: {time.strftime('%d.%m.%Y %H:%M', time.localtime(updated_at))}"
+            if exists == 0:
+                info += "  ·  Dosya bulunamadı"
+        self.show_note_text(note_content)
+        self.note_info_label.config(text=info)
+
+    def on_body_loaded(self, file_path, note_text):
+        self.body_cache.put(file_path, note_text)
+        if self.note_list.selected_path() == file_path: # Bu arada başka satır seçilmediyse
+            self.show_note_text(note_text)
+
+    def load_preview(self, file_path, request):
+        """Büyük notun ilk PREVIEW_BYTES'ını gösterir; devamı "Devamını Yükle" ile eklenir."""
+        first = True
+
+        def on_chunk(text, reader):
+            nonlocal first
+            if request != self.preview_request:
+                return False # Bu arada başka not seçildi
+            if first:
+                first = False
+                self.show_note_text(text)
+            else:
+                _append_text(self.note_text_area, text)
+
+        def on_end(reader):
+            if request != self.preview_request or reader.done:
+                return
+            info = self.note_info_label.cget('text')
+            self.note_info_label.config(text=f"{info}  ·  İlk {_format_size(reader.position)} gösteriliyor")
+            self.load_more_button.config(command=lambda: self.load_rest(reader, request, info))
+            self.load_more_button.grid()
+
+        stream_note(file_path, on_chunk, on_end, limit=PREVIEW_BYTES,
+                    on_error=lambda error: self.on_preview_error(request, error), owner=self)
+
+    def load_rest(self, reader, request, info):
+        """Önizlemesi kısaltılmış notun kalanını parça parça ekler (ilerleme çubuğuyla)."""
+        self.load_more_button.grid_remove()
+        self.load_progress['value'] = _load_percent(reader)
+        self.load_progress.grid()
+
+        def on_chunk(text, reader):
+            if request != self.preview_request:
+                return False
+            _append_text(self.note_text_area, text)
+            self.load_progress['value'] = _load_percent(reader)
+
+        def on_end(reader):
+            self.load_progress.grid_remove()
+            self.note_info_label.config(text=info) # Artık notun tamamı gösteriliyor
+
+        continue_note_stream(reader, on_chunk, on_end,
+                             on_error=lambda error: self.on_preview_error(request, error), owner=self)
+
+    def on_preview_error(self, request, error):
+        if request != self.preview_request:
+            return
+        if isinstance(error, note_store.NoteChangedError): # Okunurken kaydedildi: baştan göster
+            self.on_listbox_select()
+            return
+        print(f"Not okunurken hata oluştu: {error}")
+        show_error(f"Not okunurken hata oluştu: {error}", parent=self)
+
+    def show_note_text(self, note_text):
+        _replace_text(self.note_text_area, note_text)
+
+
+    def edit_selected_note(self, event=None):
+        """Listeden seçili notu düzenlemek için dialog açar."""
+        selected_path = self.note_list.selected_path()
+        if not selected_path:
+            messagebox.showinfo("Bilgi", "Lütfen düzenlemek için listeden bir not seçin.", parent=self)
+            return
+
+        # Doğrudan dialog fonksiyonunu çağır
+        show_add_note_dialog_internal(self.parent, selected_path)
+
+
+    def on_right_click(self, event):
+        """Listede sağ tıklanan öğenin dosya konumunu açar."""
+        # Sağ tıklanan satırı seç (boş bir alana tıklandıysa çık)
+        index = self.note_list.index_at(event.y)
+        if index == -1:
+            return
+        if index != self.note_list.selected:
+            self.note_list.select(index)
+        selected_path = self.note_list.selected_path()
+
+        # Dosya var mı kontrol et ve aç
+        if not os.path.exists(selected_path):
+            dir_path = os.path.dirname(selected_path)
+            if os.path.isdir(dir_path):
+                if messagebox.askyesno("Dosya Bulunamadı",
+                                      f"Dosya bulunamadı:\n{selected_path}\n\nİçeren klasör açılsın mı?\n{dir_path}",
+                                      parent=self):
+                    try:
+                        os.startfile(dir_path)
+                    except Exception as e:
+                         messagebox.showerror("Hata", f"Klasör açılırken hata oluştu:\n{e}", parent=self)
+            else:
+                 messagebox.showerror("Hata", f"Dosya veya içeren klasör bulunamadı:\n{selected_path}", parent=self)
+            return
+
+        try:
+            subprocess.run(['explorer', '/select,', selected_path], check=False)
+        except FileNotFoundError:
+            messagebox.showerror("Hata", "Windows Gezgini (explorer.exe) bulunamadı.", parent=self)
+        except Exception as e:
+             messagebox.showerror("Hata", f"Dosya konumu açılırken beklenmedik bir hata oluştu:\n{e}", parent=self)
+
+
+    def remove_selected_note(self, event=None):
+        """Listeden seçili notu kaldırır."""
+        selected_path = self.note_list.selected_path()
+        if not selected_path:
+            messagebox.showinfo("Bilgi", "Lütfen kaldırmak için listeden bir not seçin.", parent=self)
+            return
+
+        file_name = os.path.basename(selected_path)
+
+        if messagebox.askyesno("Onay",
+                               f"'{file_name}' dosyası için alınan not kalıcı olarak silinecektir.\n\nEmin misiniz?",
+                               icon='warning', parent=self):
+            # Silme bitince satır listeden çıkarılır ve seçim ayarlanır (apply_note_changes içinde)
+            delete_note(selected_path)
+
+
+    def find_moved_notes(self):
+        """Taşınan dosyaların notlarını hemen arar; klasör görünümünde o klasörün altı da taranır."""
+        start_file_check_job(notify=True, relink_only=True, search_dirs=(self.folder,) if self.folder else ())
+
+    def purge_orphan_notes(self):
+        """Son dosya taramasında dosyası bulunamayan tüm notları onay alıp siler."""
+        run_db(note_store.list_orphan_paths, on_done=self.confirm_purge, owner=self,
+               error_message="Kayıp notlar okunurken hata oluştu")
+
+    def confirm_purge(self, orphans):
+        if not orphans:
+            messagebox.showinfo("Bilgi", "Dosyası bulunamayan not yok.\n"
+                                "(Liste güncel değilse önce 'Dosyaları Denetle' kullanın.)", parent=self)
+            return
+        if not messagebox.askyesno("Onay",
+                                   f"Dosyası bulunamayan {len(orphans)} not kalıcı olarak silinecektir.\n\nEmin misiniz?",
+                                   icon='warning', parent=self):
+            return
+
+        def on_purged(deleted):
+            print(f"{len(deleted)} kayıp not silindi.")
+            self.refresh_list() # Çok sayıda satır silinebilir; tek tek güncellemek yerine baştan yükle
+        run_db(note_store.purge_orphans, on_done=on_purged, owner=self,
+               error_message="Kayıp notlar silinirken hata oluştu")
+
+    def on_close(self):
+        """Pencere kapatıldığında."""
+        global all_notes_window
+        print("'Tüm Notlar' penceresi kapatılıyor.")
+        all_notes_window = None
+        self.destroy()
+
+
+# --- Hata Gösterme Fonksiyonları ---
+# (Aynı kalabilir, Toplevel ve messagebox kullanıyorlar)
+
+def show_error(message, parent=None):
+    """Çalışan uygulama sırasında genel bir hata mesajı gösterir."""
+    # Arka planda görünmez bir Toplevel oluşturarak messagebox'ı en üste taşı
+    err_win = tk.Toplevel(parent if parent and parent.winfo_exists() else None)
+    err_win.withdraw() # Pencereyi gösterme
+    err_win.attributes("-topmost", True) # Mesaj kutusunun en üstte olmasını sağla
+    messagebox.showerror("FileNoter Hatası", message, parent=err_win)
+    err_win.after(100, err_win.destroy) # Kısa bir süre sonra gizli pencereyi yok et
+
+def _show_startup_error(message):
+    """GUI öncesi veya sunucu hatası gibi durumlarda hata mesajı gösterir."""
+    temp_root = tk.Tk()
+    temp_root.withdraw()
+    temp_root.attributes("-topmost", True)
+    messagebox.showerror("FileNoter Hatası", message, parent=temp_root)
+    temp_root.destroy()
+
+
+# --- Sunucu İşlemleri (IPC) ---
+
+GUI_ACTIONS = ("--add", "--view", "--view-all")
+LIST_PAGE_SIZE = 5000 # --list yanıtı başına en fazla satır (istemci 'after' ile sonraki sayfayı ister)
+
+def handle_request(data):
+    """
+    İstemciden gelen isteği işler ve yanıtta dönecek sonucu döndürür.
+    GUI eylemleri Tk thread'ine sıraya alınır. --has-note (bellekteki noted_paths
+    kümesinden) ve --get bu thread'de yanıtlanır. Yazmalar (--set, --delete),
+    sayfalı sorgular (--list, --search) ve --notes-changed DB thread'ine verilir
+    ve Future döner; IPC sunucusu yanıtı iş bitince gönderir, o sırada diğer
+    istemcilere hizmet eder (yazma kilidi veya ağ paylaşımındaki os.stat IPC
+    döngüsünü bekletmez). --stats süre ölçümlerinin özetini döndürür. Geçersiz
+    istekte ValueError verir.
+    """
+    action = data.get('action')
+    file_path = data.get('file_path')
+    file_paths = data.get('file_paths') or ([file_path] if file_path else [])
+
+    if not action:
+        raise ValueError("Eylem belirtilmemiş")
+
+    # Okuma sorguları
+    if action == "--has-note" and file_paths:
+        return note_store.has_notes(file_paths) if 'file_paths' in data \
+            else note_store.has_note(file_paths[0])
+    if action == "--get" and file_paths:
+        # Toplu istekte notu olmayan yollar için None
+        return [note_store.get_note(path) or None for path in file_paths] if 'file_paths' in data \
+            else note_store.get_note(file_paths[0])
+    if action == "--list":
+        after, limit = data.get('after') or "", min(int(data.get('limit') or LIST_PAGE_SIZE), LIST_PAGE_SIZE)
+        if data.get('tags'): # Etiket süzgeci (match_all: hepsi / herhangi biri)
+            return submit_db(note_store.list_filtered_notes, file_paths[0] if file_paths else None,
+                             bool(data.get('recursive', True)), data['tags'],
+                             bool(data.get('match_all', True)), after, limit)
+        if file_paths:
+            return submit_db(note_store.list_folder_notes, file_paths[0], bool(data.get('recursive', True)),
+                             after, limit)
+        return submit_db(note_store.list_notes, after, limit)
+    if action == "--search":
+        return submit_db(note_store.search_notes, data.get('query') or "",
+                         min(int(data.get('limit') or note_store.SEARCH_LIMIT), LIST_PAGE_SIZE))
+
+    if action == "--stats":
+        return note_stats.snapshot()
+
+    if action == "--notes-changed":
+        # Başka bir süreç (--import, 'set --direct') veritabanına doğrudan yazdı
+        return submit_db(note_store.noted_paths.load)
+
+    # Betik yazmaları; açık "Tüm Notlar" penceresi Tk thread'inde güncellenir
+    if action == "--set" and file_paths:
+        return submit_db(ipc_save_notes, file_paths, data.get('note_text') or "")
+    if action == "--delete" and file_paths:
+        return submit_db(ipc_delete_notes, file_paths)
+
+    if action not in GUI_ACTIONS:
+        raise ValueError(f"Bilinmeyen eylem: {action}")
+    if not app_root:
+        raise ValueError("Arayüz hazır değil")
+
+    # GUI işlemlerini kuyruğa bırak; Tk thread'i process_gui_queue ile alır.
+    # (app_root.after başka thread'den çağrılınca Tk meşgulse bekler, kuyruk beklemez.)
+    if action == "--add" and file_paths:
+        gui_queue.put((queue_add_request, (file_paths,)))
+    elif action == "--view" and file_paths:
+        gui_queue.put((show_view_note_dialog_internal, (app_root, file_paths[0], time.perf_counter())))
+    elif action == "--view-all":
+        # Explorer klasör arka planından "%V" ile tıklanan klasörü gönderir
+        gui_queue.put((AllNotesWindow, (app_root, file_paths[0] if file_paths else None)))
+    else:
+        raise ValueError(f"'{action}' eylemi için dosya yolu gerekli")
+    return "queued"
+
+def ipc_save_notes(file_paths, note_text):
+    """--set: notları yazar (DB thread'inde), açık pencereleri günceller; yol sayısını döndürür."""
+    note_store.save_notes(file_paths, note_text)
+    gui_queue.put((_apply_note_changes, ([(path, note_text or None) for path in file_paths],)))
+    return len(file_paths)
+
+def ipc_delete_notes(file_paths):
+    """--delete: notları siler (DB thread'inde), açık pencereleri günceller; silinen sayıyı döndürür."""
+    deleted = note_store.delete_notes(file_paths)
+    gui_queue.put((_apply_note_changes, ([(path, None) for path in file_paths],)))
+    return deleted
+
+def _apply_note_changes(changes):
+    """IPC üzerinden yapılan değişiklikleri (Tk thread'inde) açık listeye yansıtır."""
+    if all_notes_window and all_notes_window.winfo_exists():
+        all_notes_window.apply_note_changes(changes)
+
+def load_noted_paths():
+    """--has-note sorgularını yanıtlayan bellekteki kümeyi veritabanından doldurur."""
+    start = time.perf_counter()
+    try:
+        count = note_store.noted_paths.load()
+        print(f"Notlu yol kümesi yüklendi: {count} yol, {time.perf_counter() - start:.2f} sn.")
+    except sqlite3.Error as e:
+        print(f"Notlu yol kümesi yüklenemedi (sorgular veritabanından yanıtlanacak): {e}")
+    finally:
+        note_store.release_connection()
+
+def start_file_check_job(notify=False, relink_only=False, search_dirs=()):
+    """
+    Arka planda (Tk thread'i beklemez) önce yeniden adlandırılan/taşınan
+    dosyaların notlarını yeni yollarına bağlar, sonra tüm notlu yolların hâlâ
+    var olup olmadığını tarar ve not geçmişini saklama ayarlarına göre küçültür.
+    relink_only=True ise sadece taşınanlar aranır (search_dirs de taranır).
+    notify=True ise sonuç kullanıcıya gösterilir.
+    """
+    global file_check_running
+    if file_check_running:
+        return
+    file_check_running = True
+
+    def worker():
+        moved, summary, error = [], None, None
+        try:
+            with note_stats.timer('db.file_check'):
+                moved = note_store.relink_moved_notes(search_dirs)
+                if not relink_only:
+                    summary = note_store.scan_note_paths()
+                    summary['compacted'] = note_store.compact_revisions() # Geçmiş saklama ayarlarını uygula
+        except (sqlite3.Error, OSError) as e:
+            error = e
+        finally:
+            note_store.release_connection()
+        gui_queue.put((_on_file_check_done, (moved, summary, error, notify)))
+
+    threading.Thread(target=worker, daemon=True).start()
+
+def _on_file_check_done(moved, summary, error, notify):
+    """Dosya taraması bitince (Tk thread'inde) listeyi ve kullanıcıyı günceller."""
+    global file_check_running
+    file_check_running = False
+    if error is not None:
+        print(f"Dosya taraması başarısız: {error}")
+        if notify:
+            show_error(f"Dosyalar denetlenirken hata oluştu: {error}", parent=app_root)
+        return
+    for old_path, new_path in moved:
+        print(f"Not yeni konuma bağlandı: '{old_path}' -> '{new_path}'")
+    if summary is not None: # relink_only işinde tarama yapılmaz
+        print(f"Dosya taraması: {summary['checked']} yol denetlendi, {summary['missing']} kayıp, "
+              f"{summary['unreachable']} ulaşılamadı, {summary['compacted']} eski not sürümü temizlendi.")
+    if all_notes_window and all_notes_window.winfo_exists():
+        all_notes_window.refresh_list() # Yeni yollar ve kayıp işaretleri
+    if notify:
+        parent = all_notes_window if all_notes_window and all_notes_window.winfo_exists() else app_root
+        lines = [f"{len(moved)} not yeni dosya konumuna bağlandı." if moved else "Taşınmış dosya bulunamadı."]
+        if summary is not None:
+            lines.append(f"{summary['missing']} notun dosyası bulunamadı.")
+            if summary['unreachable']:
+                lines.append(f"{summary['unreachable']} yol denetlenemedi (klasör yanıt vermedi).")
+        messagebox.showinfo("Dosya Denetimi", "\n".join(lines), parent=parent)
+
+def process_gui_queue():
+    """IPC thread'inin kuyruğa bıraktığı GUI işlerini Tk thread'inde çalıştırır."""
+    while True:
+        try:
+            func, args = gui_queue.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            func(*args)
+        except Exception as e:
+            print(f"İstek işlenirken hata: {e}")
+            show_error(f"İstek işlenirken hata: {e}", parent=app_root)
+    if app_root and not shutdown_event.is_set():
+        app_root.after(GUI_POLL_MS, process_gui_queue)
+
+def enable_stats_log():
+    """FILENOTER_LOG ayarlıysa ölçüm günlüğünü açar (pythonw altında print() çıktısı da oraya gider)."""
+    if not STATS_LOG:
+        return
+    path = os.path.join(note_store.APP_DATA_PATH, 'filenoter.log') if STATS_LOG == "1" else STATS_LOG
+    try:
+        note_stats.enable_log_file(path)
+    except OSError as e:
+        print(f"Ölçüm günlüğü açılamadı ({path}): {e}")
+        return
+    print(f"Ölçüm günlüğü: {path}")
+    app_root.after(STATS_LOG_INTERVAL_MS, log_stats)
+
+def log_stats():
+    """Ölçüm özetini dönemsel olarak günlüğe yazar."""
+    note_stats.log_snapshot()
+    if app_root and not shutdown_event.is_set():
+        app_root.after(STATS_LOG_INTERVAL_MS, log_stats)
+
+def server_listener():
+    """IPC sunucusunun olay döngüsünü çalıştırır (ayrı thread'de)."""
+    print(f"Sunucu dinlemede: {HOST}:{PORT}")
+    try:
+        ipc_server.serve_forever()
+    except Exception as e:
+        print(f"Sunucu dinleme hatası: {e}")
+        if not shutdown_event.is_set():
+            gui_queue.put((stop_server, ())) # Hata olursa sunucuyu durdurmayı dene
+    finally:
+        note_store.release_connection() # Okuma sorgularında açılan bağlantı
+    print("Sunucu dinleyici thread sonlandırıldı.")
+
+
+def start_server(initial_action=None, initial_file_paths=None):
+    """Sunucuyu başlatır (ttk stilleri ile)."""
+    global app_root, ipc_server, listener_thread, shutdown_event
+
+    # Veritabanını başlat/kontrol et (yalnızca sunucu veritabanına erişir)
+    init_db()
+    # Notlu yol kümesi arka planda yüklenir; o sırada --has-note veritabanına sorar
+    threading.Thread(target=load_noted_paths, daemon=True).start()
+
+    app_root = tk.Tk()
+    app_root.withdraw() # Ana pencereyi gizle
+    setup_styles(app_root) # ttk stillerini ve fontları ayarla
+    app_root.protocol("WM_DELETE_WINDOW", stop_server) # Gizli pencere kapatılmaya çalışılırsa durdur
+    enable_stats_log()
+
+    try:
+        ipc_server = note_ipc.IpcServer(handle_request, HOST, PORT, backlog=LISTEN_BACKLOG)
+        ipc_server.bind()
+    except socket.error as e:
+        _show_startup_error(f"Sunucu başlatılamadı (Port {PORT} kullanılıyor olabilir?):\n{e}")
+        try: app_root.destroy()
+        except: pass
+        app_root = None
+        sys.exit(1) # Başlatılamazsa çık
+
+    shutdown_event.clear()
+    listener_thread = threading.Thread(target=server_listener, daemon=True)
+    listener_thread.start()
+    app_root.after(GUI_POLL_MS, process_gui_queue)
+    app_root.after(FILE_CHECK_DELAY_MS, start_file_check_job) # Kapalıyken taşınan/silinen dosyaları yakala
+    schedule_pool_fill() # Not pencerelerini önceden kur (ilk istek de hazır pencereye düşsün)
+
+    # Eğer başlangıçta bir eylem varsa, sunucu hazır olduktan sonra işle
+    if initial_action:
+        # handle_request doğrudan çağrılabilir çünkü aynı process içindeyiz
+        # Ama yine de after ile ana döngüye bırakmak daha güvenli olabilir
+        initial_data = {'action': initial_action, 'file_paths': initial_file_paths}
+        app_root.after(100, lambda: handle_request(initial_data)) # Küçük bir gecikme
+
+    print("Tkinter ana döngüsü başlatılıyor...")
+    try:
+        app_root.mainloop()
+    except KeyboardInterrupt:
+        print("KeyboardInterrupt algılandı, kapatılıyor...")
+        # stop_server() burada zaten mainloop bittiği için çağrılmayabilir,
+        # bu yüzden mainloop sonrası garantiye alalım.
+    finally:
+        print("Tkinter ana döngüsü bitti.")
+        # Ana döngü bittiyse (normalde quit ile), sunucuyu durdur
+        if not shutdown_event.is_set(): # Eğer zaten durdurulmuyorsa
+             stop_server()
+
+
+def stop_server():
+    """Sunucuyu, dinleyici thread'i ve Tkinter uygulamasını düzgünce kapatır."""
+    global app_root, ipc_server, listener_thread, shutdown_event
+    if shutdown_event.is_set():
+        print("Kapatma işlemi zaten devam ediyor.")
+        return # Zaten kapatılıyorsa tekrar başlatma
+
+    print("Kapatma işlemi başlatılıyor...")
+    shutdown_event.set() # Önce olayı ayarla ki thread'ler durabilsin
+
+    # Olay döngüsünü durdur; soketleri döngü kendisi kapatır
+    if ipc_server:
+        ipc_server.stop()
+    if listener_thread and listener_thread.is_alive():
+        print("Dinleyici thread'in bitmesi bekleniyor...")
+        listener_thread.join(timeout=2.0)
+        if listener_thread.is_alive():
+            print("Uyarı: Dinleyici thread zaman aşımında bitmedi.")
+    listener_thread = None
+    ipc_server = None
+
+    # Bekleyen otomatik kayıtları yaz ve DB thread'inin kuyruğu bitirmesini bekle,
+    # sonra kalıcı bağlantıları kapat (WAL dosyası temizlensin)
+    try:
+        flush_note_writes()
+    except Exception as e:
+        print(f"Bekleyen notlar kaydedilemedi: {e}")
+    stop_db_worker()
+    note_store.close_all()
+    note_stats.log_snapshot() # Günlük açıksa kapanıştaki son özet
+
+    # Tkinter uygulamasını kapat
+    if app_root:
+        print("Tkinter root penceresi yok ediliyor...")
+        try:
+            # app_root.quit() # mainloop'u sonlandırır
+            app_root.destroy() # Pencereyi ve tüm alt widget'ları yok eder
+            print("Tkinter root penceresi yok edildi.")
+        except tk.TclError as e:
+            # Zaten yok edilmişse hata verebilir
+            print(f"Root pencere yok edilirken hata (normal olabilir): {e}")
+        except Exception as e:
+            print(f"Root pencere yok etme hatası: {e}")
+        finally:
+            app_root = None # Global referansı temizle
+
+    print("Kapatma işlemi tamamlandı.")
+    # Sunucu instance'ı sys.exit() ile tamamen sonlanmalı
+    sys.exit(0) # Başarılı çıkış
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+FileNoter komut satırı sorguları (betikler ve toplu işler için, arayüzsüz).
+
+    FileNoter.exe get [--json] <yol> ...
+    FileNoter.exe set <yol> ... (--text METİN | --text-file DOSYA)
+    FileNoter.exe delete <yol> ...
+    FileNoter.exe list [--json] [--folder KLASÖR [--flat]] [--tag ETİKET ... [--any]]
+    FileNoter.exe search [--json] [--limit N] <sorgu>
+    FileNoter.exe stats [--json]
+
+Her komut --direct ile sunucuyu atlayıp veritabanını doğrudan kullanabilir
+('stats' hariç: ölçümler çalışan sunucunun belleğinde tutulur).
+
+Yol olarak '-' verilirse yollar stdin'den (satır başına bir) okunur. Sunucu
+çalışıyorsa istekler IPC ile ona gider (açık pencereler de güncellenir),
+yollar yüzlerce/binlerce kişilik gruplar halinde tek bağlantıdan gönderilir.
+Sunucu yoksa veritabanı doğrudan kullanılır. tkinter hiç yüklenmez.
+
+Çıkış kodu: 0 başarılı, 1 'get' ile istenen notlardan biri yok, 2 hata.
+"""
+import argparse
+import json
+import sqlite3
+import sys
+from itertools import islice
+
+import note_ipc
+
+BATCH_SIZE = 1000 # İstek/transaction başına yol sayısı
+LIST_FIELDS = ("file_path", "note_size", "updated_at", "file_exists")
+
+
+class CommandError(Exception):
+    """Sunucunun reddettiği istek."""
+
+
+def _chunks(items, size=BATCH_SIZE):
+    """Yineleyiciyi en fazla 'size' elemanlı listelere böler (tamamı belleğe alınmaz)."""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class IpcBackend:
+    """Çalışan sunucu üzerinden çalışır; tek kalıcı bağlantı kullanır."""
+    def __init__(self, client):
+        self.client = client
+
+    def close(self):
+        self.client.close()
+
+    def _call(self, action, **fields):
+        reply = self.client.request(action, **fields)
+        if not reply.get('ok'):
+            raise CommandError(reply.get('error'))
+        return reply.get('result')
+
+    def get(self, paths):
+        for chunk in _chunks(paths):
+            yield from zip(chunk, self._call("--get", file_paths=chunk))
+
+    def set(self, paths, note_text):
+        return sum(self._call("--set", file_paths=chunk, note_text=note_text) for chunk in _chunks(paths))
+
+    def delete(self, paths):
+        return sum(self._call("--delete", file_paths=chunk) for chunk in _chunks(paths))
+
+    def list(self, folder=None, recursive=True, tags=(), match_all=True):
+        fields = {'file_paths': [folder], 'recursive': recursive} if folder else {}
+        if tags:
+            fields.update(tags=list(tags), match_all=match_all)
+        after = ""
+        while True:
+            rows = self._call("--list", after=after, **fields)
+            if not rows:
+                return
+            yield from rows
+            after = rows[-1][4] # Son satırın path_key'i: sonraki sayfa buradan başlar
+
+    def search(self, query, limit):
+        return self._call("--search", query=query, limit=limit)
+
+    def stats(self):
+        return self._call("--stats")
+
+
+class DirectBackend:
+    """Sunucu yokken veritabanını doğrudan kullanır."""
+    def __init__(self):
+        import note_store # Sadece gerektiğinde yüklenir
+        self.store = note_store
+        self.changed = False
+        note_store.init_db()
+
+    def close(self):
+        self.store.close_all()
+        if self.changed:
+            note_ipc.notify("--notes-changed") # --direct ile yazıldıysa çalışan sunucu kümesini yenilesin
+
+    def get(self, paths):
+        for path in paths:
+            yield path, self.store.get_note(path) or None
+
+    def set(self, paths, note_text):
+        count = 0
+        for chunk in _chunks(paths):
+            self.store.save_notes(chunk, note_text)
+            count += len(chunk)
+        self.changed = count > 0
+        return count
+
+    def delete(self, paths):
+        deleted = sum(self.store.delete_notes(chunk) for chunk in _chunks(paths))
+        self.changed = deleted > 0
+        return deleted
+
+    def list(self, folder=None, recursive=True, tags=(), match_all=True):
+        after = ""
+        while True:
+            if tags:
+                rows = self.store.list_filtered_notes(folder, recursive, tags, match_all, after, BATCH_SIZE)
+            elif folder:
+                rows = self.store.list_folder_notes(folder, recursive, after, BATCH_SIZE)
+            else:
+                rows = self.store.list_notes(after, BATCH_SIZE)
+            if not rows:
+                return
+            yield from rows
+            after = rows[-1][4]
+
+    def search(self, query, limit):
+        return self.store.search_notes(query, limit)
+
+    def stats(self):
+        raise CommandError("Sunucu çalışmıyor (ölçümler sunucu sürecinde tutulur)")
+
+
+def connect_backend(direct=False):
+    """Sunucu çalışıyorsa IPC, değilse (veya direct=True ise) doğrudan veritabanı."""
+    if not direct:
+        try:
+            return IpcBackend(note_ipc.IpcClient())
+        except OSError:
+            pass
+    return DirectBackend()
+
+
+def _read_paths(paths):
+    """Argümanlardaki yolları üretir; '-' yerine stdin satırları okunur."""
+    for path in paths:
+        if path == "-":
+            for line in sys.stdin:
+                line = line.rstrip("\r\n")
+                if line:
+                    yield line
+        else:
+            yield path
+
+
+def _escape(text):
+    """Düz metin çıktısında bir kaydı tek satırda tutar."""
+    return text.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
+
+
+def _write_json_items(out, items, opener="[", closer="]"):
+    """JSON dizisini/nesnesini elemanlar geldikçe yazar (tamamı belleğe alınmaz)."""
+    out.write(opener)
+    for i, item in enumerate(items):
+        out.write("," if i else "")
+        out.write(item)
+    out.write(closer + "\n")
+
+
+def run(args, backend, out):
+    """Seçilen komutu çalıştırır; çıkış kodunu döndürür."""
+    if args.command == "get":
+        missing = 0
+        single = len(args.paths) == 1 and args.paths[0] != "-"
+        results = backend.get(_read_paths(args.paths))
+        if args.json:
+            def items():
+                nonlocal missing
+                for path, note_text in results:
+                    missing += note_text is None
+                    yield f"{json.dumps(path, ensure_ascii=False)}:{json.dumps(note_text, ensure_ascii=False)}"
+            _write_json_items(out, items(), "{", "}")
+        elif single:
+            path, note_text = next(results)
+            missing = note_text is None
+            if note_text is not None:
+                out.write(note_text + "\n")
+        else:
+            for path, note_text in results:
+                missing += note_text is None
+                out.write(f"{path}\t{_escape(note_text or '')}\n")
+        return 1 if missing else 0
+
+    if args.command in ("set", "delete"):
+        paths = _read_paths(args.paths)
+        if args.command == "set":
+            note_text = args.text
+            if args.text_file is not None:
+                with open(args.text_file, encoding="utf-8") as f:
+                    note_text = f.read()
+            count = backend.set(paths, note_text or "")
+        else:
+            count = backend.delete(paths)
+        out.write(json.dumps({'count': count}) + "\n" if args.json else f"{count}\n")
+        return 0
+
+    if args.command == "list":
+        rows = backend.list(args.folder, not args.flat, args.tag or (), not args.any)
+        if args.json:
+            _write_json_items(out, (json.dumps(dict(zip(LIST_FIELDS, row)), ensure_ascii=False) for row in rows))
+        else:
+            for row in rows:
+                out.write(row[0] + "\n")
+        return 0
+
+    if args.command == "stats":
+        stats = backend.stats()
+        if args.json:
+            out.write(json.dumps(stats, ensure_ascii=False, indent=1) + "\n")
+            return 0
+        out.write(f"Çalışma süresi: {stats['uptime_s']} sn\n")
+        for name, count in stats['counters'].items():
+            out.write(f"{name}\t{count}\n")
+        out.write("ölçüm\tadet\tp50_ms\tp90_ms\tp99_ms\tmax_ms\n")
+        for name, summary in stats['timings'].items():
+            out.write(f"{name}\t{summary['count']}\t{summary['p50_ms']}\t{summary['p90_ms']}\t"
+                      f"{summary['p99_ms']}\t{summary['max_ms']}\n")
+        return 0
+
+    # search
+    paths = backend.search(" ".join(args.query), args.limit)
+    if args.json:
+        out.write(json.dumps(paths, ensure_ascii=False) + "\n")
+    else:
+        out.writelines(path + "\n" for path in paths)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="FileNoter.exe", description="FileNoter notlarını arayüzsüz okur ve yazar.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--json', action='store_true', help="Çıktıyı JSON olarak yaz")
+    common.add_argument('--direct', action='store_true', help="Sunucu çalışsa bile veritabanını doğrudan kullan")
+
+    get = commands.add_parser('get', parents=[common], help="Notları yazdır")
+    get.add_argument('paths', nargs='+', metavar='YOL', help="Dosya yolları ('-' ile stdin)")
+
+    set_ = commands.add_parser('set', parents=[common], help="Yollara aynı notu kaydet (boş not siler)")
+    set_.add_argument('paths', nargs='+', metavar='YOL', help="Dosya yolları ('-' ile stdin)")
+    text = set_.add_mutually_exclusive_group(required=True)
+    text.add_argument('--text', help="Not metni")
+    text.add_argument('--text-file', metavar='DOSYA', help="Not metnini UTF-8 dosyadan oku")
+
+    delete = commands.add_parser('delete', parents=[common], help="Notları sil")
+    delete.add_argument('paths', nargs='+', metavar='YOL', help="Dosya yolları ('-' ile stdin)")
+
+    list_ = commands.add_parser('list', parents=[common], help="Notlu yolları listele")
+    list_.add_argument('--folder', metavar='KLASÖR', help="Sadece bu klasör ağacındaki notlar")
+    list_.add_argument('--flat', action='store_true', help="--folder ile: alt klasörleri dahil etme")
+    list_.add_argument('--tag', action='append', metavar='ETİKET', help="Sadece bu etiketi taşıyan notlar (tekrarlanabilir)")
+    list_.add_argument('--any', action='store_true', help="--tag ile: etiketlerin hepsi yerine herhangi biri yeter")
+
+    search = commands.add_parser('search', parents=[common], help="Yol ve not metninde ara")
+    search.add_argument('query', nargs='+', metavar='SORGU')
+    search.add_argument('--limit', type=int, default=500, help="En fazla sonuç sayısı")
+
+    commands.add_parser('stats', parents=[common], help="Çalışan sunucunun süre ölçümlerini ve sayaçlarını yazdır")
+    return parser
+
+
+def main(argv):
+    """Komut satırı girişi (file_noter.py buraya yönlendirir); çıkış kodunu döndürür."""
+    args = build_parser().parse_args(argv)
+    out = sys.stdout
+    # Pencereli (console=False) exe'de yönlendirilmemiş stdout/stdin None olur
+    if out is None or (sys.stdin is None and "-" in getattr(args, 'paths', ())):
+        print("Hata: Çıktı/girdi yok; komut satırı kullanımında çıktıyı yönlendirin (örn. '> notlar.txt').",
+              file=sys.stderr)
+        return 2
+    out.reconfigure(encoding="utf-8") # Windows konsol kod sayfası yerine UTF-8
+    try:
+        backend = connect_backend(args.direct)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 2
+    try:
+        return run(args, backend, out)
+    except (CommandError, ConnectionError, OSError, ValueError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 2
+    finally:
+        backend.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Not sürümleri için satır tabanlı ters fark (delta) kodlaması.
+
+Eski sürüm, yeni metne göre saklanır: delta, yeni metnin hangi satır
+aralıklarının aynen kopyalanacağını ve araya hangi metnin yazılacağını
+söyler. Küçük bir düzeltme birkaç baytlık delta üretir; metnin tamamı
+değiştiyse delta, sıkıştırılmış eski metinden biraz büyüktür.
+
+Biçim: zlib ile sıkıştırılmış JSON listesi. [i, j] öğesi tabandaki
+i..j-1 satırlarını kopyalar, metin öğesi olduğu gibi eklenir.
+"""
+import json
+import zlib
+from difflib import SequenceMatcher
+
+DIFF_MAX_LINES = 20000 # Değişen kısmı bundan uzunsa satır eşleme yapılmaz, metin tam saklanır
+DIFF_MAX_BYTES = 1024 * 1024 # Değişen kısmın (iki taraf toplam, karakter) eşlenebilecek en büyük boyu
+
+
+def make_delta(base, text):
+    """
+    text'i base'den yeniden kurmaya yarayan sıkıştırılmış deltayı döndürür.
+    Ortak baş ve son satırlar doğrudan kopyalanır; yalnızca aradaki değişen kısım
+    difflib ile eşlenir. Çok tekrar eden satırlar (loglar) autojunk ile eşlemeye
+    alınmaz, değişen kısım DIFF_MAX_* sınırlarını aşarsa olduğu gibi yazılır; süre
+    böylece metnin içeriğinden bağımsız olarak sınırlı kalır.
+    """
+    base, text = base or "", text or ""
+    base_lines = base.splitlines(keepends=True)
+    text_lines = text.splitlines(keepends=True)
+    limit = min(len(base_lines), len(text_lines))
+    head = 0
+    while head < limit and base_lines[head] == text_lines[head]:
+        head += 1
+    tail = 0
+    while tail < limit - head and base_lines[-1 - tail] == text_lines[-1 - tail]:
+        tail += 1
+    base_end, text_end = len(base_lines) - tail, len(text_lines) - tail
+
+    ops = [[0, head]] if head else []
+    changed = text_lines[head:text_end]
+    if head == base_end or text_end - head > DIFF_MAX_LINES or base_end - head > DIFF_MAX_LINES \
+            or sum(map(len, changed)) + sum(map(len, base_lines[head:base_end])) > DIFF_MAX_BYTES:
+        if changed:
+            ops.append("".join(changed))
+    else:
+        matcher = SequenceMatcher(None, base_lines[head:base_end], changed)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                ops.append([head + i1, head + i2])
+            elif j1 < j2: # 'replace' / 'insert'; 'delete' için yazılacak bir şey yok
+                ops.append("".join(changed[j1:j2]))
+    if tail:
+        ops.append([base_end, len(base_lines)])
+    return zlib.compress(json.dumps(ops, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def apply_delta(base, delta):
+    """make_delta(base, text) çıktısından text'i geri kurar."""
+    base_lines = (base or "").splitlines(keepends=True)
+    parts = []
+    for op in json.loads(zlib.decompress(delta)):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return "".join(parts)
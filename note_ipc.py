@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+FileNoter süreçler arası iletişim (IPC) protokolü.
+
+Mesajlar satır sonu ile ayrılmış JSON nesneleridir (her satır bir mesaj).
+json.dumps çıktısı ham satır sonu içermediği için uzun UNC yolları veya
+toplu istekler bölünmeden taşınır. Her istek bir 'id' taşır, sunucu aynı
+'id' ile yanıt verir; bir bağlantı üzerinden art arda çok istek gönderilebilir.
+
+    İstek: {"id": 1, "action": "--has-note", "file_path": "C:\\..."}
+    Yanıt: {"id": 1, "ok": true, "result": true}
+    Hata:  {"id": 1, "ok": false, "error": "..."}
+"""
+import json
+import os
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+
+import note_stats
+
+# --- Ayarlar ---
+PORT = int(os.environ.get('FILENOTER_PORT', 61073)) # Uygulamanın iletişim kuracağı özel port (Başka uygulamanın kullanmadığından emin olun)
+HOST = '127.0.0.1' # Sadece yerel makinede çalışacak
+CONNECT_TIMEOUT = 0.5 # Sunucuya bağlanma denemesi için zaman aşımı (saniye)
+REPLY_TIMEOUT = 5.0 # Yanıt bekleme süresi (saniye)
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024 # Tek mesaj için üst sınır (bozuk istemcilere karşı)
+RECV_SIZE = 65536
+LISTEN_BACKLOG = 128 # Bekleyen bağlantı kuyruğu (Explorer çoklu seçimde aynı anda çok istemci başlatır)
+IDLE_TIMEOUT = 30.0 # Bu kadar sessiz kalan kalıcı bağlantılar kapatılır (saniye)
+
+
+class ProtocolError(Exception):
+    """Bozuk veya sınırı aşan mesaj."""
+
+
+def encode_message(message):
+    """Mesajı tek satırlık UTF-8 JSON olarak kodlar."""
+    return json.dumps(message).encode('utf-8') + b"\n"
+
+
+def decode_message(line):
+    """Tek satırı mesaja çevirir; nesne değilse ProtocolError verir."""
+    try:
+        message = json.loads(line.decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ProtocolError(f"Geçersiz mesaj: {e}") from None
+    if not isinstance(message, dict):
+        raise ProtocolError("Mesaj bir JSON nesnesi olmalı")
+    return message
+
+
+class MessageBuffer:
+    """Soketten gelen baytları biriktirip tamamlanan satırları mesaj olarak verir."""
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Yeni veriyi ekler ve tamamlanan mesajları döndürür."""
+        self._buffer += data
+        messages = []
+        while True:
+            end = self._buffer.find(b"\n")
+            if end == -1:
+                break
+            line = bytes(self._buffer[:end])
+            del self._buffer[:end + 1]
+            if line.strip():
+                messages.append(decode_message(line))
+        if len(self._buffer) > MAX_MESSAGE_BYTES:
+            raise ProtocolError("Mesaj boyut sınırını aşıyor")
+        return messages
+
+    def flush(self):
+        """
+        Bağlantı kapandığında kalan veriyi mesaj olarak döndürür. Satır sonu
+        göndermeden bağlantıyı kapatan eski istemciler bu yolla desteklenir.
+        """
+        line = bytes(self._buffer).strip()
+        self._buffer.clear()
+        return [decode_message(line)] if line else []
+
+
+def make_reply(request_id, result=None, error=None):
+    """İsteğe karşılık gelen yanıt mesajını oluşturur."""
+    if error is not None:
+        return {'id': request_id, 'ok': False, 'error': str(error)}
+    return {'id': request_id, 'ok': True, 'result': result}
+
+
+class IpcClient:
+    """
+    Sunucuya kalıcı bağlantı. request() tek istek gönderip yanıtını bekler;
+    request_many() istekleri art arda gönderip yanıtları toplu okur.
+    """
+    def __init__(self, host=HOST, port=PORT, connect_timeout=CONNECT_TIMEOUT, reply_timeout=REPLY_TIMEOUT):
+        self.sock = socket.create_connection((host, port), timeout=connect_timeout)
+        self.sock.settimeout(reply_timeout)
+        self._buffer = MessageBuffer()
+        self._pending = deque() # Okunmuş ama henüz eşleştirilmemiş yanıtlar
+        self._next_id = 1
+
+    def close(self):
+        try: self.sock.close()
+        except OSError: pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def request(self, action, **fields):
+        """Tek istek gönderir ve yanıt mesajını döndürür."""
+        return self.request_many([dict(fields, action=action)])[0]
+
+    def request_many(self, messages):
+        """Mesajları tek seferde gönderir; yanıtları aynı sırayla döndürür."""
+        ids = []
+        payload = bytearray()
+        for message in messages:
+            message = dict(message, id=self._next_id)
+            ids.append(self._next_id)
+            self._next_id += 1
+            payload += encode_message(message)
+        self.sock.sendall(payload)
+
+        replies = {}
+        wanted = set(ids)
+        while wanted:
+            if not self._pending:
+                data = self.sock.recv(RECV_SIZE)
+                if not data:
+                    raise ConnectionError("Sunucu bağlantıyı kapattı")
+                self._pending.extend(self._buffer.feed(data))
+                continue
+            reply = self._pending.popleft()
+            if reply.get('id') in wanted:
+                wanted.discard(reply['id'])
+                replies[reply['id']] = reply
+        return [replies[i] for i in ids]
+
+
+def notify(action, **fields):
+    """Sunucu çalışıyorsa tek bir istek gönderir; çalışmıyorsa sessizce geçer."""
+    try:
+        with IpcClient() as client:
+            client.request(action, **fields)
+    except OSError:
+        pass
+
+
+class _Connection:
+    """Sunucu tarafında tek istemcinin okuma/yazma tamponları."""
+    __slots__ = ('sock', 'addr', 'inbox', 'outbox', 'last_active', 'accepted_at', 'waiting', 'held')
+
+    def __init__(self, sock, addr):
+        self.sock = sock
+        self.addr = addr
+        self.inbox = MessageBuffer()
+        self.outbox = bytearray()
+        self.last_active = time.monotonic()
+        self.accepted_at = time.perf_counter() # İlk mesaj işlenince None olur
+        self.waiting = False # Sonucu bir Future'dan gelecek bir istek var
+        self.held = deque() # O sırada gelen mesajlar; sırayla, yanıttan sonra işlenir
+
+
+class IpcServer:
+    """
+    selectors tabanlı, tek thread'de çalışan olay güdümlü sunucu. Tüm soketler
+    bloklamayan modda tek döngüde izlenir; yüzlerce eş zamanlı istemci birbirini
+    beklemez. Her mesaj handler(mesaj) ile işlenir, dönen değer yanıtın 'result'
+    alanı olur; handler'ın verdiği hata 'error' olarak döner.
+    handler hızlı olmalıdır (GUI işleri kuyruğa bırakılır, beklenmez). Yazma veya
+    uzun sorgu gibi işlerde handler bir concurrent.futures.Future döndürür; yanıt
+    Future bitince gönderilir, döngü o sırada diğer istemcilere hizmet eder. Aynı
+    bağlantıdan sonra gelen mesajlar bu yanıttan sonra, sırayla işlenir.
+    """
+    def __init__(self, handler, host=HOST, port=PORT, backlog=LISTEN_BACKLOG, idle_timeout=IDLE_TIMEOUT):
+        self.handler = handler
+        self.address = (host, port)
+        self.backlog = backlog
+        self.idle_timeout = idle_timeout
+        self.selector = selectors.DefaultSelector()
+        self.listen_socket = None
+        self._connections = {}
+        self._stop = threading.Event()
+        self._wake_r, self._wake_w = socket.socketpair() # stop() ve biten Future'lar döngüyü hemen uyandırsın
+        self._finished = deque() # Biten Future'lar: (bağlantı, mesaj, başlangıç, Future)
+
+    def bind(self):
+        """Portu bağlar ve dinlemeye başlar (port kullanılıyorsa OSError verir)."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # SO_REUSEADDR portun hemen tekrar kullanılabilmesini sağlar (test için yararlı)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind(self.address)
+            sock.listen(self.backlog)
+        except OSError:
+            sock.close()
+            raise
+        sock.setblocking(False)
+        self.listen_socket = sock
+        self.address = sock.getsockname() # port=0 verildiyse atanan port
+        self.selector.register(sock, selectors.EVENT_READ, self._accept)
+        self._wake_r.setblocking(False)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+    def serve_forever(self):
+        """stop() çağrılana kadar olay döngüsünü çalıştırır."""
+        next_sweep = time.monotonic() + 1.0
+        while not self._stop.is_set():
+            for key, mask in self.selector.select(timeout=1.0):
+                if key.data is None: # Uyandırma soketi
+                    try: self._wake_r.recv(4096)
+                    except OSError: pass
+                    self._deliver_finished()
+                elif key.fileobj is self.listen_socket:
+                    self._accept()
+                else:
+                    conn = key.data
+                    if mask & selectors.EVENT_READ:
+                        self._read(conn)
+                    if mask & selectors.EVENT_WRITE and conn.sock.fileno() != -1:
+                        self._write(conn)
+            if time.monotonic() >= next_sweep:
+                self._close_idle()
+                next_sweep = time.monotonic() + 1.0
+        self._shutdown()
+
+    def stop(self):
+        """Döngüyü durdurur (başka thread'den çağrılabilir)."""
+        self._stop.set()
+        self._wake()
+
+    def _wake(self):
+        try: self._wake_w.send(b"x")
+        except OSError: pass # Kapanmış veya tampon dolu: döngü zaten uyanacak
+
+    def _accept(self):
+        # Kuyrukta biriken tüm bağlantıları tek seferde al
+        while True:
+            try:
+                sock, addr = self.listen_socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                print(f"Bağlantı kabul hatası: {e}")
+                return
+            sock.setblocking(False)
+            conn = _Connection(sock, addr)
+            self._connections[sock] = conn
+            note_stats.incr('ipc.connections')
+            self.selector.register(sock, selectors.EVENT_READ, conn)
+
+    def _read(self, conn):
+        try:
+            data = conn.sock.recv(RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._close(conn)
+            return
+        conn.last_active = time.monotonic()
+        try:
+            # Bağlantı kapandıysa satır sonu olmadan gelmiş son mesajı da işle (eski istemciler)
+            messages = conn.inbox.feed(data) if data else conn.inbox.flush()
+        except ProtocolError as e:
+            print(f"İstemci protokol hatası ({conn.addr}): {e}")
+            self._close(conn)
+            return
+        if messages and conn.accepted_at is not None:
+            # Kabulden ilk isteğin işlenmeye başlamasına kadar geçen süre
+            note_stats.record('ipc.accept_to_dispatch', time.perf_counter() - conn.accepted_at)
+            conn.accepted_at = None
+        conn.held.extend(messages)
+        self._run_held(conn)
+        if not data:
+            self._close(conn)
+        elif conn.outbox:
+            self._write(conn)
+
+    def _run_held(self, conn):
+        """Bağlantının bekleyen mesajlarını, sonucu Future'a kalan bir istek çıkana kadar işler."""
+        while conn.held and not conn.waiting:
+            self._dispatch(conn, conn.held.popleft())
+
+    def _dispatch(self, conn, message):
+        note_stats.incr('ipc.requests')
+        start = time.perf_counter()
+        try:
+            result = self.handler(message)
+        except Exception as e:
+            result = e
+        # concurrent.futures istemci tarafında yüklenmesin diye Future davranışından tanınır
+        if hasattr(result, 'add_done_callback'):
+            conn.waiting = True
+            result.add_done_callback(lambda future: self._finish_later(conn, message, start, future))
+        else:
+            self._reply(conn, message, start, result)
+
+    def _finish_later(self, conn, message, start, future):
+        # Future'ı bitiren thread'de çalışır; yanıt döngü thread'inde yazılır
+        self._finished.append((conn, message, start, future))
+        self._wake()
+
+    def _deliver_finished(self):
+        while self._finished:
+            conn, message, start, future = self._finished.popleft()
+            conn.waiting = False
+            self._reply(conn, message, start, future.exception() or future.result())
+            if conn.sock.fileno() == -1:
+                continue # İstemci yanıtı beklemeden kapandı
+            self._run_held(conn)
+            if conn.outbox:
+                self._write(conn)
+
+    def _reply(self, conn, message, start, result):
+        """İsteğin sonucunu (veya hatasını) ölçer ve id'si varsa yanıtını çıkış tamponuna ekler."""
+        request_id = message.get('id')
+        if isinstance(result, Exception):
+            print(f"İstek işlenemedi: {result}")
+            note_stats.incr('ipc.errors')
+            reply = make_reply(request_id, error=result)
+        else:
+            reply = make_reply(request_id, result=result)
+            # Eylem adı ancak işleyici kabul ettiyse ölçüm adı olur (bilinmeyen eylemler hata verir)
+            note_stats.record('ipc.' + str(message.get('action')).lstrip('-'), time.perf_counter() - start)
+        if request_id is not None and conn.sock.fileno() != -1:
+            conn.outbox += encode_message(reply)
+
+    def _write(self, conn):
+        try:
+            sent = conn.sock.send(conn.outbox)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._close(conn)
+            return
+        del conn.outbox[:sent]
+        # Gönderilemeyen veri kaldıysa soket yazılabilir olunca devam et
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if conn.outbox else 0)
+        self.selector.modify(conn.sock, events, conn)
+
+    def _close(self, conn):
+        self._connections.pop(conn.sock, None)
+        try: self.selector.unregister(conn.sock)
+        except (KeyError, ValueError): pass
+        try: conn.sock.close()
+        except OSError: pass
+
+    def _close_idle(self):
+        limit = time.monotonic() - self.idle_timeout
+        for conn in [c for c in self._connections.values() if c.last_active < limit]:
+            self._close(conn)
+
+    def _shutdown(self):
+        for conn in list(self._connections.values()):
+            self._close(conn)
+        for sock in (self.listen_socket, self._wake_r, self._wake_w):
+            if sock is None:
+                continue
+            try: self.selector.unregister(sock)
+            except (KeyError, ValueError): pass
+            try: sock.close()
+            except OSError: pass
+        self.selector.close()
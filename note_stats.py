@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+FileNoter çalışma zamanı ölçümleri.
+
+Sıcak yollardaki süreler (IPC kabulden işleyiciye, veritabanı işleri, liste
+yenileme, pencere açılışı) ada göre histogramlarda, olay sayıları sayaçlarda
+tutulur. Histogramlar sabit boyutludur (logaritmik kovalar), kayıt maliyeti
+bir kilit ve bir ikili aramadır. snapshot() sayaçları ve yüzdelikleri döndürür;
+sunucu bunu '--stats' IPC eylemiyle verir.
+
+İsteğe bağlı olarak (FILENOTER_LOG) döner bir günlük dosyası açılır: yavaş
+ölçümler ve dönemsel özetler JSON satırları olarak yazılır. pythonw/pencereli
+exe altında stdout olmadığından print() çıktıları da bu dosyaya yönlendirilir.
+"""
+import json
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+SLOW_MS = 250.0 # Günlük açıksa bundan uzun süren her ölçüm ayrıca yazılır
+LOG_MAX_BYTES = 1024 * 1024 # Günlük dosyası bu boyuta ulaşınca döndürülür
+LOG_BACKUPS = 3 # Saklanan eski günlük dosyası sayısı
+PERCENTILES = (50, 90, 99)
+
+# Kova üst sınırları (ms): 0.01 ms'den 60 sn'ye, her kova bir öncekinin 2^(1/4) katı (~%19)
+BUCKET_BOUNDS = []
+_bound = 0.01
+while _bound < 60000:
+    BUCKET_BOUNDS.append(_bound)
+    _bound *= 2 ** 0.25
+del _bound
+
+
+class Histogram:
+    """Süre histogramı (ms). Yüzdelikler kova sınırından okunur, en büyük değerle sınırlanır."""
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1) # Son kova: 60 sn üstü
+
+    def add(self, ms):
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = max(self.max, ms)
+        self.buckets[bisect_left(BUCKET_BOUNDS, ms)] += 1
+
+    def percentile(self, pct):
+        if not self.count:
+            return None
+        wanted = self.count * pct / 100
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= wanted and n:
+                bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        result = {'count': self.count,
+                  'mean_ms': round(self.total / self.count, 3) if self.count else None,
+                  'min_ms': round(self.min, 3) if self.min is not None else None,
+                  'max_ms': round(self.max, 3)}
+        for pct in PERCENTILES:
+            value = self.percentile(pct)
+            result[f'p{pct}_ms'] = round(value, 3) if value is not None else None
+        return result
+
+
+_lock = threading.Lock()
+_histograms = {} # ad -> Histogram
+_counters = {} # ad -> sayı
+_started_at = time.time()
+_logger = None
+
+
+def record(name, seconds):
+    """'name' ölçümüne bir süre (saniye) ekler."""
+    ms = seconds * 1000.0
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.add(ms)
+    if _logger is not None and ms >= SLOW_MS:
+        _log('slow', name=name, ms=round(ms, 3))
+
+
+def incr(name, amount=1):
+    """Sayacı artırır."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+@contextmanager
+def timer(name):
+    """with bloğunun süresini 'name' ölçümüne ekler (hata olsa da)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def snapshot():
+    """Tüm sayaçlar ve ölçümlerin özetleri (JSON'a çevrilebilir sözlük)."""
+    with _lock:
+        return {'uptime_s': round(time.time() - _started_at, 1),
+                'counters': dict(sorted(_counters.items())),
+                'timings': {name: histogram.summary() for name, histogram in sorted(_histograms.items())}}
+
+
+def reset():
+    """Tüm ölçümleri sıfırlar."""
+    global _started_at
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _started_at = time.time()
+
+
+class _LogWriter:
+    """print() çıktısını günlüğe satır satır yazan dosya benzeri nesne."""
+    def __init__(self):
+        self._buffer = ""
+
+    def write(self, text):
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                _log('print', message=line)
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def enable_log_file(path, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+    """Döner günlük dosyasını açar; stdout/stderr yoksa print() çıktısı da buraya gider."""
+    global _logger
+    import logging # Sadece günlük açılınca yüklenir (istemci başlangıcını yavaşlatmasın)
+    from logging.handlers import RotatingFileHandler
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger = logging.getLogger('filenoter.stats')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(handler)
+    _logger = logger
+    if sys.stdout is None:
+        sys.stdout = _LogWriter()
+    if sys.stderr is None:
+        sys.stderr = _LogWriter()
+
+
+def log_snapshot():
+    """Günlük açıksa o ana kadarki özetleri yazar."""
+    if _logger is not None:
+        _log('stats', **snapshot())
+
+
+def _log(event, **fields):
+    record = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'event': event}
+    record.update(fields)
+    _logger.info(json.dumps(record, ensure_ascii=False))
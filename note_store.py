@@ -0,0 +1,1492 @@
+# -*- coding: utf-8 -*-
+"""
+FileNoter not deposu.
+
+Sunucu süreci boyunca açık kalan SQLite bağlantılarını yönetir. Her thread
+kendi bağlantısını bir kez açar ve tekrar kullanır (küçük bir havuz);
+veritabanı WAL modunda çalışır, böylece okuyucular yazıcıları beklemez.
+SQL metinleri sabit tutulur ki sqlite3'ün bağlantı başına hazır ifade
+(prepared statement) önbelleği her çağrıda aynı ifadeyi yeniden kullansın.
+"""
+import codecs
+import ntpath
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+import note_delta
+
+# --- Ayarlar ---
+try:
+    # Veritabanını AppData'da sakla (önerilen)
+    APP_DATA_PATH = os.path.join(os.getenv('APPDATA'), 'FileNoter')
+    DB_PATH = os.path.join(APP_DATA_PATH, 'filenotes.db')
+    os.makedirs(APP_DATA_PATH, exist_ok=True) # Klasörü oluştur (varsa dokunma)
+except Exception as e:
+    # AppData kullanılamazsa programın yanına kaydet
+    print(f"Uyarı: AppData klasörü kullanılamıyor ({e}). Veritabanı program dizinine kaydedilecek.", file=sys.stderr)
+    APP_DATA_PATH = os.path.dirname(os.path.abspath(__file__))
+    DB_PATH = os.path.join(APP_DATA_PATH, 'filenotes.db')
+
+BUSY_TIMEOUT = 5.0 # Kilitli veritabanında bekleme süresi (saniye)
+STATEMENT_CACHE_SIZE = 64 # Bağlantı başına önbelleğe alınan hazır ifade sayısı
+
+# Her yeni bağlantıda uygulanan ayarlar
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",       # Okuyucular ve yazıcı birbirini kilitlemez
+    "PRAGMA synchronous=NORMAL",     # WAL ile güvenli, her commit'te fsync yok
+    "PRAGMA cache_size=-8192",       # ~8 MB sayfa önbelleği
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+
+SEARCH_LIMIT = 500 # Aramada döndürülen en fazla sonuç
+BODY_CACHE_BYTES = 16 * 1024 * 1024 # Listede gösterilen not metinleri için önbellek sınırı
+SCAN_WORKERS = 16 # Dosya varlık taramasında paralel okunan klasör sayısı
+SCAN_TIMEOUT = 30.0 # Taramanın toplam süre sınırı; yanıt vermeyen ağ klasörleri "bilinmiyor" kalır
+SEARCH_RANK_LIMIT = 2000 # Bundan fazla eşleşmede alaka sıralaması atlanır (çok genel önekler)
+TRANSFER_BATCH = 5000 # Dışa/içe aktarmada tek seferde okunan/yazılan satır (transaction başına)
+REVISION_LIMIT = 50 # Not başına saklanan en fazla eski sürüm
+REVISION_MAX_AGE_DAYS = 365 # Bundan eski sürümler silinir (0: süresiz)
+REVISION_MERGE_SECONDS = 60 # Bundan kısa süre geçerli kalan ara sürümler (art arda kayıtlar) atılır; silinen notun son metni hariç
+COMPRESS_THRESHOLD = 4096 # Bundan büyük (UTF-8 bayt) not metinleri sıkıştırılıp note_blob'da saklanır
+COMPRESS_CODEC = 'zlib' # Yeni sıkıştırılan notların biçimi: 'zlib' (hızlı) veya 'lzma' (daha küçük, yavaş)
+ZLIB_LEVEL = 6
+NOTE_CHUNK_BYTES = 256 * 1024 # Büyük notlar pencerelere bu boyda parçalar halinde okunur (NoteReader)
+
+# notes.codec değerleri: not metninin nasıl saklandığı
+CODEC_PLAIN = 0 # note_text'te düz metin
+CODEC_ZLIB = 1  # note_blob'da zlib ile sıkıştırılmış UTF-8
+CODEC_LZMA = 2  # note_blob'da lzma (xz) ile sıkıştırılmış UTF-8
+CODECS = {'zlib': CODEC_ZLIB, 'lzma': CODEC_LZMA}
+
+# --- Şema ---
+# İlk sürümlerin tablosu; yeni veritabanları da buradan başlayıp göç adımlarından geçer.
+SQL_CREATE_NOTES = '''
+    CREATE TABLE IF NOT EXISTS notes (
+        file_path TEXT PRIMARY KEY,
+        note_text TEXT
+    )
+'''
+
+# Şema göç adımları: MIGRATIONS[i], 'user_version' i iken çalışır ve onu i+1 yapar.
+MIGRATIONS = (
+    # 1: Sabit tamsayı anahtar (FTS dizini rowid'e bağlanır, VACUUM'da değişmemeli)
+    '''
+    CREATE TABLE notes_v1 (
+        id INTEGER PRIMARY KEY,
+        file_path TEXT NOT NULL UNIQUE,
+        note_text TEXT
+    );
+    INSERT INTO notes_v1 (file_path, note_text) SELECT file_path, note_text FROM notes;
+    DROP TABLE notes;
+    ALTER TABLE notes_v1 RENAME TO notes;
+    ''',
+    # 2: Liste için metni okumadan gösterilebilen boyut (UTF-8 bayt) ve değiştirme zamanı
+    '''
+    ALTER TABLE notes ADD COLUMN note_size INTEGER NOT NULL DEFAULT 0;
+    ALTER TABLE notes ADD COLUMN updated_at REAL NOT NULL DEFAULT 0;
+    UPDATE notes SET note_size = length(CAST(note_text AS BLOB)), updated_at = CAST(strftime('%s', 'now') AS REAL);
+    ''',
+    # 3: Dosya kimliği (cihaz:inode / NTFS dosya numarası); yeniden adlandırma ve taşımada değişmez
+    '''
+    ALTER TABLE notes ADD COLUMN file_id TEXT;
+    CREATE INDEX idx_notes_file_id ON notes (file_id) WHERE file_id IS NOT NULL;
+    ''',
+    # 4: Dosya varlık taramasının sonuçları (not silinince kendiliğinden silinir)
+    '''
+    CREATE TABLE path_status (
+        note_id INTEGER PRIMARY KEY REFERENCES notes (id) ON DELETE CASCADE,
+        file_exists INTEGER NOT NULL,
+        file_mtime REAL,
+        checked_at REAL NOT NULL
+    );
+    CREATE INDEX idx_path_status_missing ON path_status (file_exists) WHERE file_exists = 0;
+    ''',
+    # 5: Büyük/küçük harf duyarsız yol anahtarı; klasör sorguları dizinde aralık taramasıdır
+    '''
+    ALTER TABLE notes ADD COLUMN path_key TEXT;
+    UPDATE notes SET path_key = path_key(file_path);
+    CREATE INDEX idx_notes_path_key ON notes (path_key);
+    ''',
+    # 6: path_key kanonik anahtar olur (uzun yol öneki, '.'/'..' ve çift ayırıcılar çözülür) ve
+    # tekil dizine taşınır. Aynı dosyaya farklı yazımla kaydedilmiş notlar en yenisinde birleşir.
+    '''
+    UPDATE notes SET path_key = path_key(file_path);
+    CREATE TEMP TABLE path_key_keep AS
+        SELECT id FROM notes AS n WHERE NOT EXISTS (
+            SELECT 1 FROM notes AS m WHERE m.path_key = n.path_key
+            AND (m.updated_at > n.updated_at OR (m.updated_at = n.updated_at AND m.id > n.id)));
+    UPDATE notes SET note_text = note_text || (
+            SELECT group_concat(char(10) || char(10) || d.note_text, '') FROM notes AS d
+            WHERE d.path_key = notes.path_key AND d.id != notes.id AND d.note_text != notes.note_text)
+        WHERE id IN (SELECT id FROM path_key_keep) AND EXISTS (
+            SELECT 1 FROM notes AS d
+            WHERE d.path_key = notes.path_key AND d.id != notes.id AND d.note_text != notes.note_text);
+    UPDATE notes SET note_size = length(CAST(note_text AS BLOB))
+        WHERE path_key IN (SELECT path_key FROM notes GROUP BY path_key HAVING count(*) > 1);
+    DELETE FROM notes WHERE id NOT IN (SELECT id FROM path_key_keep);
+    DROP TABLE path_key_keep;
+    DROP INDEX idx_notes_path_key;
+    CREATE UNIQUE INDEX idx_notes_path_key ON notes (path_key);
+    ''',
+    # 7: Not geçmişi. Her eski sürüm, bir sonraki (daha yeni) sürüme göre ters delta olarak
+    # saklanır; zincir güncel nottan (not silinmişse boş metinden) geriye çözülür. Güncel
+    # notun okunması değişmez. Silinen notun geçmişi path_key ile korunur.
+    '''
+    CREATE TABLE note_revisions (
+        id INTEGER PRIMARY KEY,
+        path_key TEXT NOT NULL,
+        saved_at REAL NOT NULL,
+        replaced_at REAL NOT NULL,
+        delta BLOB NOT NULL
+    );
+    CREATE INDEX idx_note_revisions_key ON note_revisions (path_key, id);
+    CREATE TRIGGER notes_rev_au AFTER UPDATE OF note_text ON notes WHEN old.note_text IS NOT new.note_text BEGIN
+        INSERT INTO note_revisions (path_key, saved_at, replaced_at, delta)
+            VALUES (new.path_key, old.updated_at, new.updated_at, note_delta(new.note_text, old.note_text));
+    END;
+    CREATE TRIGGER notes_rev_ad AFTER DELETE ON notes BEGIN
+        INSERT INTO note_revisions (path_key, saved_at, replaced_at, delta)
+            VALUES (old.path_key, old.updated_at, (julianday('now') - 2440587.5) * 86400.0, note_delta('', old.note_text));
+    END;
+    CREATE TRIGGER notes_rev_ai AFTER INSERT ON notes
+        WHEN EXISTS (SELECT 1 FROM note_revisions WHERE path_key = new.path_key) BEGIN
+        INSERT INTO note_revisions (path_key, saved_at, replaced_at, delta)
+            SELECT new.path_key, replaced_at, new.updated_at, note_delta(new.note_text, '')
+            FROM note_revisions WHERE path_key = new.path_key ORDER BY id DESC LIMIT 1;
+    END;
+    CREATE TRIGGER notes_rev_ak AFTER UPDATE OF path_key ON notes WHEN old.path_key IS NOT new.path_key BEGIN
+        DELETE FROM note_revisions WHERE path_key = new.path_key;
+        UPDATE note_revisions SET path_key = new.path_key WHERE path_key = old.path_key;
+    END;
+    ''',
+    # 8: Etiketler. Ad büyük/küçük harf duyarsız tekildir (name_key); not silinince bağları da
+    # silinir. note_tags iki yönlü dizinlidir: etiketten notlara (süzgeç) ve nottan etiketlere.
+    '''
+    CREATE TABLE tags (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        name_key TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE note_tags (
+        tag_id INTEGER NOT NULL REFERENCES tags (id) ON DELETE CASCADE,
+        note_id INTEGER NOT NULL REFERENCES notes (id) ON DELETE CASCADE,
+        PRIMARY KEY (tag_id, note_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX idx_note_tags_note ON note_tags (note_id, tag_id);
+    ''',
+    # 9: Büyük notlar sıkıştırılmış saklanır (bkz. pack_note): codec 0 ise metin note_text'te,
+    # değilse note_blob'da. SQL'de düz metin note_plain(note_text, note_blob, codec) ile okunur;
+    # geçmiş tetikleyicileri buna göre yeniden kurulur. FTS dizini silinir, init_db mevcut büyük
+    # notları parça parça sıkıştırdıktan sonra _ensure_fts onu note_plain() ile yeniden kurar.
+    '''
+    ALTER TABLE notes ADD COLUMN note_blob BLOB;
+    ALTER TABLE notes ADD COLUMN codec INTEGER NOT NULL DEFAULT 0;
+    DROP TRIGGER notes_rev_au;
+    DROP TRIGGER notes_rev_ad;
+    DROP TRIGGER notes_rev_ai;
+    CREATE TRIGGER notes_rev_au AFTER UPDATE OF note_text, note_blob ON notes
+        WHEN note_plain(old.note_text, old.note_blob, old.codec) IS NOT note_plain(new.note_text, new.note_blob, new.codec)
+    BEGIN
+        INSERT INTO note_revisions (path_key, saved_at, replaced_at, delta)
+            VALUES (new.path_key, old.updated_at, new.updated_at,
+                    note_delta(note_plain(new.note_text, new.note_blob, new.codec),
+                               note_plain(old.note_text, old.note_blob, old.codec)));
+    END;
+    CREATE TRIGGER notes_rev_ad AFTER DELETE ON notes BEGIN
+        INSERT INTO note_revisions (path_key, saved_at, replaced_at, delta)
+            VALUES (old.path_key, old.updated_at, (julianday('now') - 2440587.5) * 86400.0,
+                    note_delta('', note_plain(old.note_text, old.note_blob, old.codec)));
+    END;
+    CREATE TRIGGER notes_rev_ai AFTER INSERT ON notes
+        WHEN EXISTS (SELECT 1 FROM note_revisions WHERE path_key = new.path_key) BEGIN
+        INSERT INTO note_revisions (path_key, saved_at, replaced_at, delta)
+            SELECT new.path_key, replaced_at, new.updated_at,
+                   note_delta(note_plain(new.note_text, new.note_blob, new.codec), '')
+            FROM note_revisions WHERE path_key = new.path_key ORDER BY id DESC LIMIT 1;
+    END;
+    DROP TRIGGER IF EXISTS notes_fts_ai;
+    DROP TRIGGER IF EXISTS notes_fts_ad;
+    DROP TRIGGER IF EXISTS notes_fts_au;
+    DROP TABLE IF EXISTS notes_fts;
+    ''',
+    # 10: Güncelleme tetikleyicisi fark hesaplamaz: eski metin tam (sıkıştırılmış) yazılır ve
+    # packed = 0 ile işaretlenir. Fark, yazma transaction'ı bittikten sonra pack_revisions ile
+    # kodlanır; kayıt sırasında yazma kilidi difflib süresince tutulmaz.
+    '''
+    ALTER TABLE note_revisions ADD COLUMN packed INTEGER NOT NULL DEFAULT 1;
+    DROP TRIGGER notes_rev_au;
+    CREATE TRIGGER notes_rev_au AFTER UPDATE OF note_text, note_blob ON notes
+        WHEN note_plain(old.note_text, old.note_blob, old.codec) IS NOT note_plain(new.note_text, new.note_blob, new.codec)
+    BEGIN
+        INSERT INTO note_revisions (path_key, saved_at, replaced_at, delta, packed)
+            VALUES (new.path_key, old.updated_at, new.updated_at,
+                    note_delta('', note_plain(old.note_text, old.note_blob, old.codec)), 0);
+    END;
+    ''',
+    # 11: Silme tetikleyicisinin yazdığı sürüm (notun kaybolmadan önceki son metni) deleted = 1
+    # ile işaretlenir; _plan_revisions bunları kısa ömürlü olsalar da birleştirmez. Mevcut
+    # veritabanlarında notu şu an olmayan anahtarların en yeni sürümü işaretlenir.
+    '''
+    ALTER TABLE note_revisions ADD COLUMN deleted INTEGER NOT NULL DEFAULT 0;
+    DROP TRIGGER notes_rev_ad;
+    CREATE TRIGGER notes_rev_ad AFTER DELETE ON notes BEGIN
+        INSERT INTO note_revisions (path_key, saved_at, replaced_at, delta, deleted)
+            VALUES (old.path_key, old.updated_at, (julianday('now') - 2440587.5) * 86400.0,
+                    note_delta('', note_plain(old.note_text, old.note_blob, old.codec)), 1);
+    END;
+    UPDATE note_revisions SET deleted = 1
+        WHERE id IN (SELECT MAX(id) FROM note_revisions GROUP BY path_key)
+        AND path_key NOT IN (SELECT path_key FROM notes);
+    ''',
+)
+COMPRESSION_VERSION = 9 # Bu sürüme geçen veritabanlarında mevcut büyük notlar sıkıştırılır
+
+# Tam metin arama dizini: 'notes' tablosunun içeriğini kopyalamadan dizinler,
+# tetikleyicilerle senkron tutulur. Türkçe karakterler için aksan duyarsız.
+# Dizine sıkıştırılmış notların düz metni (note_plain) yazılır; sıkıştırılmış
+# satırlarda notes.note_text boş olduğundan snippet()/highlight() kullanılmaz.
+SQL_CREATE_FTS = '''
+    CREATE VIRTUAL TABLE notes_fts USING fts5(
+        file_path, note_text,
+        content='notes', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3 4 5'
+    );
+    CREATE TRIGGER notes_fts_ai AFTER INSERT ON notes BEGIN
+        INSERT INTO notes_fts (rowid, file_path, note_text)
+            VALUES (new.id, new.file_path, note_plain(new.note_text, new.note_blob, new.codec));
+    END;
+    CREATE TRIGGER notes_fts_ad AFTER DELETE ON notes BEGIN
+        INSERT INTO notes_fts (notes_fts, rowid, file_path, note_text)
+            VALUES ('delete', old.id, old.file_path, note_plain(old.note_text, old.note_blob, old.codec));
+    END;
+    CREATE TRIGGER notes_fts_au AFTER UPDATE OF file_path, note_text, note_blob ON notes BEGIN
+        INSERT INTO notes_fts (notes_fts, rowid, file_path, note_text)
+            VALUES ('delete', old.id, old.file_path, note_plain(old.note_text, old.note_blob, old.codec));
+        INSERT INTO notes_fts (rowid, file_path, note_text)
+            VALUES (new.id, new.file_path, note_plain(new.note_text, new.note_blob, new.codec));
+    END;
+    INSERT INTO notes_fts (rowid, file_path, note_text)
+        SELECT id, file_path, note_plain(note_text, note_blob, codec) FROM notes;
+'''
+
+# --- SQL İfadeleri ---
+# Yol aramaları path_key üzerinden yapılır: "C:\Foo" ve "c:/foo/" aynı nottur
+# Metin sadece gösterilecekken açılır (note_plain); liste sorguları metne hiç dokunmaz
+SQL_GET_NOTE = "SELECT note_plain(note_text, note_blob, codec) FROM notes WHERE path_key = path_key(?)"
+SQL_GET_NOTE_BY_KEY = "SELECT note_plain(note_text, note_blob, codec) FROM notes WHERE path_key = ?"
+# Parça parça okuma (NoteReader): saklanan değer artımlı blob G/Ç ile okunur, metin SQL'de açılmaz
+SQL_NOTE_STORAGE = "SELECT id, codec, note_size, updated_at FROM notes WHERE path_key = path_key(?)"
+SQL_NOTE_VERSION = "SELECT updated_at FROM notes WHERE id = ?"
+# blobopen olmayan Python sürümleri (3.11 öncesi) için: parça SQLite içinde kesilir
+SQL_READ_STORED = {
+    'note_text': "SELECT substr(CAST(note_text AS BLOB), ?, ?), length(CAST(note_text AS BLOB)) FROM notes WHERE id = ?",
+    'note_blob': "SELECT substr(note_blob, ?, ?), length(note_blob) FROM notes WHERE id = ?",
+}
+SQL_HAS_NOTE = "SELECT 1 FROM notes WHERE path_key = path_key(?)"
+# Anahtarlar zaten kanonik (ancestor_keys); her biri path_key dizininde tek aramadır. Kökten yola doğru sıralı.
+SQL_ANCESTOR_NOTES = ("SELECT file_path, note_plain(note_text, note_blob, codec) FROM notes "
+                      "WHERE path_key IN ({}) ORDER BY length(path_key)")
+SQL_NOTE_ID = "SELECT id FROM notes WHERE path_key = path_key(?)"
+SQL_NOTE_TAGS = '''
+    SELECT tags.name FROM notes
+    JOIN note_tags ON note_tags.note_id = notes.id
+    JOIN tags ON tags.id = note_tags.tag_id
+    WHERE notes.path_key = path_key(?)
+    ORDER BY tags.name_key
+'''
+SQL_CLEAR_NOTE_TAGS = "DELETE FROM note_tags WHERE note_id = ?"
+SQL_INSERT_TAG = "INSERT INTO tags (name, name_key) VALUES (?, ?) ON CONFLICT (name_key) DO NOTHING"
+SQL_ADD_NOTE_TAG = "INSERT OR IGNORE INTO note_tags (tag_id, note_id) SELECT id, ? FROM tags WHERE name_key = ?"
+SQL_DELETE_UNUSED_TAGS = "DELETE FROM tags WHERE NOT EXISTS (SELECT 1 FROM note_tags WHERE note_tags.tag_id = tags.id)"
+# Etiket süzgeci: seçili etiketlerin notları note_tags birincil anahtarından (tag_id, note_id) bulunur,
+# notlara rowid ile bağlanır (CROSS JOIN sırayı sabitler; tüm notlar taranmaz). VE için bir not
+# tüm etiketleri (count = etiket sayısı), VEYA için en az birini taşımalıdır.
+_SQL_TAGGED_NOTES = (
+    "(SELECT note_id FROM note_tags WHERE tag_id IN (SELECT id FROM tags WHERE name_key IN ({})) "
+    "GROUP BY note_id HAVING count(*) >= ?) AS tagged CROSS JOIN notes ON notes.id = tagged.note_id")
+SQL_LIST_FILTERED_NOTES = '''
+    SELECT notes.file_path, notes.note_size, notes.updated_at, path_status.file_exists, notes.path_key
+    FROM {source} LEFT JOIN path_status ON path_status.note_id = notes.id
+    WHERE {where} AND notes.path_key > ?
+    ORDER BY notes.path_key
+    LIMIT ?
+'''
+SQL_TAG_COUNTS = '''
+    SELECT tags.name, count(*) FROM {source}
+    CROSS JOIN note_tags ON note_tags.note_id = notes.id
+    JOIN tags ON tags.id = note_tags.tag_id
+    WHERE {where}
+    GROUP BY tags.id
+    ORDER BY tags.name_key
+'''
+# Kapsam ve süzgeç yokken notlara hiç bakılmaz (bağlar not silinince silinir)
+SQL_ALL_TAG_COUNTS = '''
+    SELECT tags.name, count(*) FROM tags
+    JOIN note_tags ON note_tags.tag_id = tags.id
+    GROUP BY tags.id
+    ORDER BY tags.name_key
+'''
+SQL_GET_ALL_NOTES = "SELECT file_path, note_plain(note_text, note_blob, codec) FROM notes ORDER BY path_key"
+# Sıralama path_key dizininden gelir; anahtar, listenin ikili arama dizini için de döner.
+# Sayfalama anahtarla yapılır (path_key > son_anahtar LIMIT n); LIMIT -1 sınırsızdır.
+SQL_LIST_NOTES = '''
+    SELECT notes.file_path, notes.note_size, notes.updated_at, path_status.file_exists, notes.path_key
+    FROM notes LEFT JOIN path_status ON path_status.note_id = notes.id
+    WHERE notes.path_key > ?
+    ORDER BY notes.path_key
+    LIMIT ?
+'''
+# ?1 klasörün kendisi, [?2, ?3) altındaki yolların aralığı; ?4=0 ise sadece doğrudan içerik
+SQL_LIST_FOLDER_NOTES = '''
+    SELECT notes.file_path, notes.note_size, notes.updated_at, path_status.file_exists, notes.path_key
+    FROM notes LEFT JOIN path_status ON path_status.note_id = notes.id
+    WHERE (notes.path_key = ?1 OR (notes.path_key >= ?2 AND notes.path_key < ?3))
+      AND (?4 OR instr(substr(notes.path_key, length(?2) + 1), '\\') = 0)
+      AND notes.path_key > ?5
+    ORDER BY notes.path_key
+    LIMIT ?6
+'''
+_SQL_INSERT_NOTE = ("INSERT INTO notes (file_path, note_text, note_blob, codec, note_size, updated_at, file_id, "
+                    "path_key) VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, path_key(?1)) ")
+_SQL_SET_BODY = "note_text = excluded.note_text, note_blob = excluded.note_blob, codec = excluded.codec, "
+SQL_UPSERT_NOTE = _SQL_INSERT_NOTE + ("ON CONFLICT (path_key) DO UPDATE SET " + _SQL_SET_BODY +
+                                     "note_size = excluded.note_size, updated_at = excluded.updated_at, "
+                                     "file_id = COALESCE(excluded.file_id, notes.file_id)")
+SQL_EXPORT_NOTES = ("SELECT file_path, note_plain(note_text, note_blob, codec), updated_at "
+                    "FROM notes ORDER BY path_key")
+# İçe aktarmada çakışma (yolda zaten not var) politikaları. 'append' birleşik metni düz yazar;
+# import_notes ardından compress_notes() ile eşiği aşanları sıkıştırır.
+_SQL_OLD_PLAIN = "note_plain(notes.note_text, notes.note_blob, notes.codec)"
+_SQL_NEW_PLAIN = "note_plain(excluded.note_text, excluded.note_blob, excluded.codec)"
+SQL_IMPORT_NOTE = {
+    'skip': _SQL_INSERT_NOTE + "ON CONFLICT (path_key) DO NOTHING",
+    'overwrite': _SQL_INSERT_NOTE + ("ON CONFLICT (path_key) DO UPDATE SET " + _SQL_SET_BODY +
+                                     "note_size = excluded.note_size, updated_at = excluded.updated_at "
+                                     f"WHERE {_SQL_OLD_PLAIN} IS NOT {_SQL_NEW_PLAIN}"),
+    'append': _SQL_INSERT_NOTE + ("ON CONFLICT (path_key) DO UPDATE SET "
+                                  f"note_text = {_SQL_OLD_PLAIN} || char(10) || char(10) || {_SQL_NEW_PLAIN}, "
+                                  f"note_blob = NULL, codec = {CODEC_PLAIN}, "
+                                  "note_size = notes.note_size + 2 + excluded.note_size, "
+                                  "updated_at = max(notes.updated_at, excluded.updated_at) "
+                                  f"WHERE {_SQL_OLD_PLAIN} != {_SQL_NEW_PLAIN} "
+                                  f"AND instr({_SQL_OLD_PLAIN}, char(10) || char(10) || {_SQL_NEW_PLAIN}) = 0"),
+}
+# Sıkıştırma göçü: eşiği aşan düz metin notlar id sırasıyla parça parça okunur
+SQL_UNCOMPRESSED_NOTES = ("SELECT id, note_text FROM notes WHERE id > ? AND codec = 0 AND note_size > ? "
+                          "ORDER BY id LIMIT ?")
+SQL_SET_NOTE_BODY = "UPDATE notes SET note_text = ?, note_blob = ?, codec = ? WHERE id = ?"
+SQL_NOTE_IDENTITIES = "SELECT id, file_path, file_id FROM notes"
+SQL_SET_FILE_ID = "UPDATE notes SET file_id = ? WHERE id = ?"
+SQL_RELINK_NOTE = "UPDATE notes SET file_path = ?1, path_key = path_key(?1), file_id = ?2 WHERE id = ?3"
+SQL_NOTE_PATHS = "SELECT id, file_path FROM notes"
+SQL_NOTE_KEYS = "SELECT path_key FROM notes"
+SQL_SET_PATH_STATUS = ("INSERT OR REPLACE INTO path_status (note_id, file_exists, file_mtime, checked_at) "
+                       "VALUES (?, ?, ?, ?)")
+SQL_ORPHAN_PATHS = ("SELECT notes.file_path FROM path_status JOIN notes ON notes.id = path_status.note_id "
+                    "WHERE path_status.file_exists = 0")
+SQL_PURGE_ORPHANS = "DELETE FROM notes WHERE id IN (SELECT note_id FROM path_status WHERE file_exists = 0)"
+SQL_DELETE_NOTE = "DELETE FROM notes WHERE path_key = path_key(?)"
+# Zincirin başı olan güncel not ayrıca (SQL_GET_NOTE_BY_KEY) ve sadece gerekirse okunur
+SQL_NOTE_REVISIONS = ("SELECT id, saved_at, replaced_at, delta, packed, deleted FROM note_revisions "
+                      "WHERE path_key = ? ORDER BY id DESC")
+SQL_REVISION_IDS = "SELECT id FROM note_revisions WHERE path_key = ? ORDER BY id DESC"
+SQL_REVISION_KEYS = "SELECT DISTINCT path_key FROM note_revisions"
+SQL_UNPACKED_REVISION_KEYS = "SELECT DISTINCT path_key FROM note_revisions WHERE packed = 0"
+SQL_SET_REVISION_DELTA = "UPDATE note_revisions SET delta = ?, packed = 1 WHERE id = ?"
+SQL_DELETE_REVISION = "DELETE FROM note_revisions WHERE id = ?"
+SQL_SEARCH_NOTES = '''
+    SELECT notes.file_path FROM notes_fts
+    JOIN notes ON notes.id = notes_fts.rowid
+    WHERE notes_fts MATCH ?
+    ORDER BY notes_fts.rank
+    LIMIT ?
+'''
+SQL_SEARCH_NOTES_UNRANKED = '''
+    SELECT notes.file_path FROM notes
+    WHERE notes.id IN (SELECT rowid FROM notes_fts WHERE notes_fts MATCH ? LIMIT ?)
+'''
+SQL_COUNT_MATCHES = "SELECT count(*) FROM (SELECT rowid FROM notes_fts WHERE notes_fts MATCH ? LIMIT ?)"
+SQL_SEARCH_NOTES_LIKE = '''
+    SELECT file_path FROM notes
+    WHERE file_path LIKE ? ESCAPE '\\' OR note_plain(note_text, note_blob, codec) LIKE ? ESCAPE '\\'
+    ORDER BY path_key
+    LIMIT ?
+'''
+
+HAS_FTS = False # init_db() FTS5 dizinini kurabildiyse True
+
+# --- Bağlantı Havuzu ---
+_local = threading.local() # Thread başına bağlantı
+_pool_lock = threading.Lock()
+_connections = [] # Kapatma sırasında hepsini kapatabilmek için
+
+
+def _connect(db_path):
+    """Ayarları uygulanmış yeni bir bağlantı açar."""
+    conn = sqlite3.connect(
+        db_path,
+        timeout=BUSY_TIMEOUT,
+        isolation_level=None, # Otomatik commit; yazmalar transaction() ile gruplanır
+        check_same_thread=False, # close_all() başka thread'den kapatabilsin
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    conn.create_function('path_key', 1, path_key, deterministic=True)
+    conn.create_function('note_delta', 2, note_delta.make_delta, deterministic=True) # Geçmiş tetikleyicileri
+    conn.create_function('note_plain', 3, unpack_note, deterministic=True) # FTS ve geçmiş tetikleyicileri
+    return conn
+
+
+def get_connection():
+    """Çağıran thread'e ait kalıcı bağlantıyı döndürür (yoksa açar)."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.db_path == DB_PATH:
+        return conn
+    conn = _connect(DB_PATH)
+    _local.conn = conn
+    _local.db_path = DB_PATH
+    with _pool_lock:
+        _connections.append(conn)
+    return conn
+
+
+def release_connection():
+    """Çağıran thread'in bağlantısını kapatır (kısa ömürlü thread'ler bitmeden çağırmalı)."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        return
+    with _pool_lock:
+        if conn in _connections:
+            _connections.remove(conn)
+    _local.__dict__.clear()
+    try: conn.close()
+    except sqlite3.Error: pass
+
+
+def close_all():
+    """Havuzdaki tüm bağlantıları kapatır (sunucu kapanırken çağrılır)."""
+    with _pool_lock:
+        conns = list(_connections)
+        _connections.clear()
+    for conn in conns:
+        try: conn.close()
+        except sqlite3.Error: pass
+    _local.__dict__.clear()
+
+
+def set_db_path(db_path):
+    """Farklı bir veritabanı dosyasına geçer (benchmark ve araçlar için)."""
+    global DB_PATH
+    close_all()
+    DB_PATH = db_path
+
+
+@contextmanager
+def transaction():
+    """Tek bir yazma transaction'ı açar; hata olursa geri alır."""
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE") # Yazma kilidini baştan al, yükseltme çakışması olmasın
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
+
+
+# --- Not İşlemleri ---
+# Hatalar (sqlite3.Error) çağırana bırakılır; GUI tarafı kullanıcıya gösterir.
+
+def init_db():
+    """Veritabanını oluşturur ve şemayı son sürüme taşır."""
+    with transaction() as conn:
+        conn.execute(SQL_CREATE_NOTES)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for step in range(version, len(MIGRATIONS)):
+            print(f"Veritabanı şeması güncelleniyor: sürüm {step} -> {step + 1}", file=sys.stderr)
+            for statement in _split_script(MIGRATIONS[step]):
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {step + 1}")
+    if version < COMPRESSION_VERSION:
+        # Sürüm 0 da dahil: ilk sürümün veritabanında da notlar vardır (yeni veritabanında işlem yapılmaz).
+        # FTS dizini henüz yokken: sıkıştırılan satırlar yeniden dizinlenmez, dizin bir kez kurulur
+        compressed = compress_notes()
+        if compressed:
+            print(f"{compressed} büyük not sıkıştırıldı.", file=sys.stderr)
+    with transaction() as conn:
+        _ensure_fts(conn)
+
+
+def _split_script(script):
+    """Çok ifadeli SQL metnini tek tek çalıştırılabilir ifadelere böler (tetikleyiciler dahil)."""
+    statements, current = [], ""
+    for line in script.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ""
+    if current.strip():
+        statements.append(current.strip())
+    return statements
+
+
+def _ensure_fts(conn):
+    """FTS5 dizinini (yoksa) oluşturup mevcut notlardan doldurur."""
+    global HAS_FTS
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'notes_fts'").fetchone()
+    if not exists:
+        try:
+            for statement in _split_script(SQL_CREATE_FTS):
+                conn.execute(statement)
+        except sqlite3.OperationalError as e:
+            # FTS5'siz SQLite derlemesi: arama LIKE ile (yavaş) çalışır
+            print(f"Uyarı: FTS5 dizini oluşturulamadı ({e}). Arama LIKE ile yapılacak.", file=sys.stderr)
+            HAS_FTS = False
+            return
+    HAS_FTS = True
+
+
+def path_key(file_path):
+    """
+    Yolun kanonik anahtarı (notlar bununla aranır ve sıralanır): ayırıcılar '\\',
+    çift ayırıcı ve '.'/'..' yok, sonda ayırıcı yok, büyük/küçük harf duyarsız.
+    Uzun yol önekleri atılır: "\\\\?\\C:\\a" -> "c:\\a", "\\\\?\\UNC\\srv\\x" -> "\\\\srv\\x".
+    """
+    path = file_path.replace('/', '\\')
+    if path[:8].upper() == '\\\\?\\UNC\\':
+        path = '\\\\' + path[8:]
+    elif path.startswith('\\\\?\\'):
+        path = path[4:]
+    return ntpath.normpath(path).rstrip('\\').casefold() if path else ""
+
+
+def ancestor_keys(file_path):
+    """
+    Yolu içeren klasörlerin path_key'leri, kökten yola doğru (yolun kendisi hariç):
+    "C:\\a\\b\\f.txt" -> ["c:", "c:\\a", "c:\\a\\b"]. UNC yollarında en üst klasör paylaşımdır.
+    """
+    key = path_key(file_path)
+    drive = ntpath.splitdrive(key)[0]
+    keys = []
+    index = key.rfind('\\')
+    while index > 0 and index >= len(drive):
+        keys.append(key[:index])
+        index = key.rfind('\\', 0, index)
+    keys.reverse()
+    return keys
+
+
+def _folder_range(folder):
+    """Klasörün anahtarı ve altındaki yolları kapsayan [alt, üst) anahtar aralığı."""
+    key = path_key(folder)
+    return key, key + '\\', key + ']' # ']' == chr(ord('\\') + 1)
+
+
+def path_in_folder(file_path, folder, recursive=True):
+    """Yol, klasörün kendisi veya (recursive ise alt klasörler dahil) içeriği mi?"""
+    key, prefix, _ = _folder_range(folder)
+    candidate = path_key(file_path)
+    if candidate == key:
+        return True
+    if not candidate.startswith(prefix):
+        return False
+    return recursive or '\\' not in candidate[len(prefix):]
+
+
+def note_row(file_path, note_text, updated_at=None, file_id=None):
+    """SQL_UPSERT_NOTE parametreleri: saklanacak biçimiyle metin (pack_note), boyut, zaman ve dosya kimliği."""
+    data = note_text.encode('utf-8')
+    return (file_path, *pack_note(note_text, data), len(data),
+            time.time() if updated_at is None else updated_at, file_id)
+
+
+def pack_note(note_text, data=None):
+    """
+    Notun saklanacağı biçim: (note_text, note_blob, codec). COMPRESS_THRESHOLD'dan
+    büyük metinler COMPRESS_CODEC ile sıkıştırılır; kazanç yoksa düz kalır.
+    data, metnin zaten hesaplanmış UTF-8 karşılığıdır.
+    """
+    if data is None:
+        data = note_text.encode('utf-8')
+    if len(data) <= COMPRESS_THRESHOLD:
+        return note_text, None, CODEC_PLAIN
+    codec = CODECS[COMPRESS_CODEC]
+    if codec == CODEC_LZMA:
+        import lzma # Sadece seçilirse yüklenir
+        blob = lzma.compress(data)
+    else:
+        blob = zlib.compress(data, ZLIB_LEVEL)
+    if len(blob) >= len(data):
+        return note_text, None, CODEC_PLAIN
+    return None, blob, codec
+
+
+def unpack_note(note_text, note_blob, codec):
+    """pack_note'un tersi: saklanan biçimden düz metin. SQL'de note_plain() olarak kayıtlıdır."""
+    if not codec:
+        return note_text
+    if codec == CODEC_ZLIB:
+        data = zlib.decompress(note_blob)
+    elif codec == CODEC_LZMA:
+        import lzma
+        data = lzma.decompress(note_blob)
+    else:
+        raise ValueError(f"Bilinmeyen not sıkıştırma biçimi: {codec}")
+    return data.decode('utf-8')
+
+
+def file_identity(file_path):
+    """
+    Dosyanın yeniden adlandırma/taşımada değişmeyen kimliği ("cihaz:inode").
+    Windows'ta bu birim seri numarası ve NTFS dosya numarasıdır.
+    Dosyaya ulaşılamıyorsa None döner.
+    """
+    try:
+        st = os.stat(file_path)
+    except (OSError, ValueError):
+        return None
+    return _identity(st.st_dev, st.st_ino)
+
+
+def _identity(device, inode):
+    return f"{device:x}:{inode:x}" if inode else None
+
+
+def save_note(file_path, note_text):
+    """
+    Notu kaydeder veya günceller; note_text boşsa kaydı siler.
+    Not silindiyse False, kaydedildiyse True döndürür.
+    """
+    save_note_texts({file_path: note_text})
+    return bool(note_text)
+
+
+def save_note_texts(notes, tags=None):
+    """
+    Farklı yollara farklı notları ({dosya_yolu: not_metni}) tek transaction'da
+    yazar; boş metin o yolun notunu siler. Bekleyen yazmaları toplu kaydetmek için.
+    tags ({dosya_yolu: [etiket, ...]}) verilirse aynı transaction'da, metinlerden
+    sonra bu yolların etiketleri değiştirilir (notu olmayan yola etiket konmaz).
+    """
+    # Satırlar (ve file_identity'nin os.stat'ı) yazma kilidi alınmadan hazırlanır:
+    # ağ paylaşımındaki yavaş bir stat diğer yazanları BUSY_TIMEOUT'a kadar bekletmesin
+    rows = [note_row(file_path, note_text, file_id=file_identity(file_path))
+            for file_path, note_text in notes.items() if note_text]
+    deleted = [(file_path,) for file_path, note_text in notes.items() if not note_text]
+    with transaction() as conn:
+        conn.executemany(SQL_UPSERT_NOTE, rows)
+        conn.executemany(SQL_DELETE_NOTE, deleted)
+        if tags:
+            for file_path, names in tags.items():
+                _set_note_tags(conn, file_path, names)
+            conn.execute(SQL_DELETE_UNUSED_TAGS)
+    noted_paths.add(path for path, note_text in notes.items() if note_text)
+    noted_paths.discard(path for path, note_text in notes.items() if not note_text)
+    pack_revisions({path_key(path) for path in notes}) # Art arda kayıtların ara halleri birikmesin
+
+
+def get_note(file_path):
+    """Dosya yolunun notunu döndürür (yoksa boş string)."""
+    row = get_connection().execute(SQL_GET_NOTE, (file_path,)).fetchone()
+    return row[0] if row else ""
+
+
+def has_note(file_path):
+    """Dosya yolunun kayıtlı bir notu var mı? (noted_paths yüklüyse veritabanına gidilmez)"""
+    if noted_paths.loaded:
+        return file_path in noted_paths
+    return get_connection().execute(SQL_HAS_NOTE, (file_path,)).fetchone() is not None
+
+
+def open_note_reader(file_path, note_text=None, size=NOTE_CHUNK_BYTES):
+    """
+    Not için NoteReader açar ve ilk parçayı okur (pencereler için tek DB işi):
+    (reader, ilk_parça). Küçük notlarda reader.done zaten True'dur.
+    """
+    reader = NoteReader(file_path, note_text)
+    return reader, reader.read_chunk(size)
+
+
+def ancestor_notes(file_path):
+    """
+    Yolu içeren klasörlere bırakılmış notlar, kökten yola doğru [(klasör_yolu, not_metni), ...].
+    Tüm atalar tek sorguyla aranır; noted_paths yüklüyse notu olmayan atalar
+    sorguya hiç girmez (hiçbirinin notu yoksa veritabanına gidilmez).
+    """
+    keys = ancestor_keys(file_path)
+    if noted_paths.loaded:
+        keys = noted_paths.select_keys(keys)
+    if not keys:
+        return []
+    return get_connection().execute(SQL_ANCESTOR_NOTES.format(", ".join("?" * len(keys))), keys).fetchall()
+
+
+def tag_key(name):
+    """Etiketin karşılaştırma anahtarı: boşluklar sadeleşir, büyük/küçük harf duyarsız."""
+    return " ".join(name.split()).casefold()
+
+
+def parse_tags(text):
+    """
+    Virgülle ayrılmış etiket metnini (veya ad listesini) temiz ve tekrarsız bir
+    listeye çevirir: "#proje, Acil ,acil" -> ["proje", "Acil"].
+    """
+    parts = text.split(",") if isinstance(text, str) else text
+    names, seen = [], set()
+    for part in parts:
+        name = " ".join(part.split()).lstrip("#").strip()
+        if name and tag_key(name) not in seen:
+            seen.add(tag_key(name))
+            names.append(name)
+    return names
+
+
+def get_note_tags(file_path):
+    """Notun etiketleri, ada göre sıralı (not yoksa boş liste)."""
+    return [row[0] for row in get_connection().execute(SQL_NOTE_TAGS, (file_path,))]
+
+
+def set_note_tags(file_path, names):
+    """Notun etiketlerini verilen adlarla değiştirir; not yoksa False döndürür."""
+    with transaction() as conn:
+        found = _set_note_tags(conn, file_path, names)
+        conn.execute(SQL_DELETE_UNUSED_TAGS)
+    return found
+
+
+def _set_note_tags(conn, file_path, names):
+    row = conn.execute(SQL_NOTE_ID, (file_path,)).fetchone()
+    if row is None:
+        return False
+    conn.execute(SQL_CLEAR_NOTE_TAGS, (row[0],))
+    for name in parse_tags(names):
+        conn.execute(SQL_INSERT_TAG, (name, tag_key(name)))
+        conn.execute(SQL_ADD_NOTE_TAG, (row[0], tag_key(name)))
+    return True
+
+
+def _note_filter(folder, recursive, tags, match_all):
+    """
+    Liste ve etiket sayımı sorguları için (FROM kaynağı, WHERE koşulu, parametreler).
+    Etiket seçiliyse notlara note_tags'ten ulaşılır; klasör kapsamı path_key
+    aralığıdır (list_folder_notes ile aynı koşul).
+    """
+    source, clauses, params = "notes", [], []
+    keys = sorted({tag_key(name) for name in tags})
+    if keys:
+        source = _SQL_TAGGED_NOTES.format(", ".join("?" * len(keys)))
+        params += keys
+        params.append(len(keys) if match_all else 1)
+    if folder:
+        key, prefix, upper = _folder_range(folder)
+        clauses.append("(notes.path_key = ? OR (notes.path_key >= ? AND notes.path_key < ?))")
+        params += [key, prefix, upper]
+        if not recursive:
+            clauses.append("instr(substr(notes.path_key, ?), '\\') = 0")
+            params.append(len(prefix) + 1)
+    return source, " AND ".join(clauses) or "1", params
+
+
+def list_filtered_notes(folder=None, recursive=True, tags=(), match_all=True, after="", limit=-1):
+    """
+    list_notes() / list_folder_notes() gibi, ama sadece etiketleri süzgece uyan notlar:
+    match_all ise tüm etiketleri, değilse en az birini taşıyanlar.
+    """
+    source, where, params = _note_filter(folder, recursive, tags, match_all)
+    sql = SQL_LIST_FILTERED_NOTES.format(source=source, where=where)
+    return get_connection().execute(sql, params + [after, limit]).fetchall()
+
+
+def tag_facets(folder=None, recursive=True, tags=(), match_all=True):
+    """
+    Etiket paneli için kapsamdaki tüm etiketler, ada göre sıralı: [(ad, sayı), ...].
+    Sayı, etiketi taşıyan notlardan süzülmüş listede (kapsam + seçili etiketler)
+    bulunanlardır; etiket seçili değilse kapsamdaki not sayısıdır.
+    """
+    conn = get_connection()
+
+    def counts(selected):
+        if not folder and not selected:
+            return conn.execute(SQL_ALL_TAG_COUNTS).fetchall()
+        source, where, params = _note_filter(folder, recursive, selected, match_all)
+        return conn.execute(SQL_TAG_COUNTS.format(source=source, where=where), params).fetchall()
+
+    scope = counts(())
+    if not tags:
+        return scope
+    listed = dict(counts(tags))
+    return [(name, listed.get(name, 0)) for name, _ in scope]
+
+
+def has_notes(file_paths):
+    """has_note() yol listesi için: [True/False, ...]."""
+    if noted_paths.loaded:
+        return noted_paths.contains_many(file_paths)
+    return [has_note(path) for path in file_paths]
+
+
+def get_all_notes():
+    """Tüm notları {dosya_yolu: not_metni} sözlüğü olarak döndürür."""
+    return dict(get_connection().execute(SQL_GET_ALL_NOTES).fetchall())
+
+
+def list_notes(after="", limit=-1):
+    """
+    Tüm notların (dosya_yolu, boyut_bayt, değiştirme_zamanı, dosya_var_mı, path_key) listesi;
+    metinler okunmaz. dosya_var_mı son taramanın sonucudur (1/0, taranmadıysa None).
+    Sayfa sayfa okumak için: after=önceki sayfanın son path_key'i, limit=sayfa boyu.
+    """
+    return get_connection().execute(SQL_LIST_NOTES, (after, limit)).fetchall()
+
+
+def list_folder_notes(folder, recursive=True, after="", limit=-1):
+    """
+    list_notes() gibi, ama sadece klasörün kendisi ve altındaki notlar. Satırlar
+    path_key dizininde aralık taramasıyla bulunur; süre toplam not sayısından bağımsızdır.
+    """
+    key, prefix, upper = _folder_range(folder)
+    return get_connection().execute(SQL_LIST_FOLDER_NOTES,
+                                    (key, prefix, upper, int(recursive), after, limit)).fetchall()
+
+
+def delete_note(file_path):
+    """Dosya yolunun notunu siler."""
+    with transaction() as conn:
+        conn.execute(SQL_DELETE_NOTE, (file_path,))
+    noted_paths.discard((file_path,))
+    pack_revisions((path_key(file_path),))
+
+
+def save_notes(file_paths, note_text):
+    """
+    Aynı notu birden çok dosya yoluna tek transaction içinde uygular.
+    note_text boşsa bu yolların notları silinir.
+    """
+    if note_text:
+        # os.stat'lar (file_identity) yazma kilidi alınmadan yapılır
+        rows = [note_row(path, note_text, file_id=file_identity(path)) for path in file_paths]
+    with transaction() as conn:
+        if not note_text:
+            conn.executemany(SQL_DELETE_NOTE, [(path,) for path in file_paths])
+        else:
+            conn.executemany(SQL_UPSERT_NOTE, rows)
+    (noted_paths.add if note_text else noted_paths.discard)(file_paths)
+    pack_revisions({path_key(path) for path in file_paths})
+    return bool(note_text)
+
+
+def delete_notes(file_paths):
+    """Birden çok yolun notlarını tek transaction'da siler; silinen not sayısını döndürür."""
+    with transaction() as conn:
+        deleted = conn.executemany(SQL_DELETE_NOTE, [(path,) for path in file_paths]).rowcount
+    noted_paths.discard(file_paths)
+    pack_revisions({path_key(path) for path in file_paths})
+    return deleted
+
+
+def iter_notes(batch_size=TRANSFER_BATCH):
+    """
+    Tüm notları path_key sırasıyla (dosya_yolu, not_metni, değiştirme_zamanı)
+    olarak üretir. Satırlar imleçten parça parça okunur; bellek kullanımı not
+    sayısından bağımsızdır.
+    """
+    cursor = get_connection().execute(SQL_EXPORT_NOTES)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def import_notes(rows, on_conflict='skip', batch_size=TRANSFER_BATCH):
+    """
+    (dosya_yolu, not_metni, değiştirme_zamanı veya None) satırlarını içe aktarır.
+    Satırlar batch_size'lık gruplar halinde, grup başına tek transaction ve
+    executemany ile yazılır; girdi bir üreteç olabilir, tamamı belleğe alınmaz.
+
+    on_conflict, yolda zaten not varsa ne yapılacağını belirler:
+      skip      mevcut not korunur
+      overwrite mevcut not içe aktarılanla değiştirilir
+      append    içe aktarılan metin mevcut notun sonuna eklenir (daha önce eklenmişse tekrar eklenmez)
+
+    (okunan, yazılan) satır sayılarını döndürür; boş notlar atlanır.
+    """
+    sql = SQL_IMPORT_NOTE[on_conflict] # Bilinmeyen politika KeyError verir
+    read = written = 0
+    batch = []
+
+    def flush():
+        nonlocal written
+        with transaction() as conn:
+            written += conn.executemany(sql, batch).rowcount
+        noted_paths.add(row[0] for row in batch) # Atlanan yolların da zaten notu var
+        batch.clear()
+
+    for file_path, note_text, updated_at in rows:
+        read += 1
+        if not file_path or not note_text:
+            continue
+        batch.append(note_row(file_path, note_text, updated_at))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    if on_conflict == 'append' and written:
+        compress_notes(batch_size) # Birleştirilen metinler düz yazıldı
+    if on_conflict != 'skip' and written:
+        pack_revisions([row[0] for row in get_connection().execute(SQL_UNPACKED_REVISION_KEYS)])
+    return read, written
+
+
+def compress_notes(batch_size=TRANSFER_BATCH):
+    """
+    COMPRESS_THRESHOLD'dan büyük düz metin notları sıkıştırır (göç 9, 'append'
+    içe aktarma). Notlar id sırasıyla batch_size'lık gruplar halinde okunur ve
+    grup başına bir transaction'da yazılır; sıkıştırılan not sayısını döndürür.
+    """
+    conn = get_connection()
+    compressed, last_id = 0, 0
+    while True:
+        rows = conn.execute(SQL_UNCOMPRESSED_NOTES, (last_id, COMPRESS_THRESHOLD, batch_size)).fetchall()
+        if not rows:
+            return compressed
+        last_id = rows[-1][0]
+        updates = [(*pack_note(note_text), note_id) for note_id, note_text in rows]
+        updates = [row for row in updates if row[2] != CODEC_PLAIN] # Sıkışmayan metin düz kalır
+        if updates:
+            with transaction():
+                conn.executemany(SQL_SET_NOTE_BODY, updates)
+        compressed += len(updates)
+
+
+def _fts_query(text):
+    """
+    Kullanıcı metnini FTS5 sorgusuna çevirir. Tüm kelimeler eşleşmelidir; yazılmakta
+    olan son kelime önek olarak aranır ("rapor 20" -> "rapor" "20"*). Tamamlanmış
+    kelimeler tam eşleşir, böylece uzun önekler için sözlük taraması yapılmaz.
+    """
+    terms = [term.replace('"', '') for term in text.split()]
+    terms = [term for term in terms if term]
+    if not terms:
+        return ""
+    parts = [f'"{term}"' for term in terms[:-1]]
+    if text[-1:].isspace():
+        parts.append(f'"{terms[-1]}"') # Son kelime de bitti (arkasında boşluk var)
+    else:
+        parts.append(f'"{terms[-1]}"*')
+    return " ".join(parts)
+
+
+def search_notes(text, limit=SEARCH_LIMIT):
+    """Dosya yolu ve not metninde arama yapar; yolları alaka sırasıyla döndürür."""
+    conn = get_connection()
+    if HAS_FTS:
+        query = _fts_query(text)
+        if not query:
+            return []
+        # bm25 sıralaması tüm eşleşmeleri puanlar; "ra" gibi milyonlarca satıra uyan
+        # öneklerde bu saniyeler sürer. Eşleşme çoksa dizin sırasıyla ilk sonuçlar döner.
+        matches = conn.execute(SQL_COUNT_MATCHES, (query, SEARCH_RANK_LIMIT + 1)).fetchone()[0]
+        sql = SQL_SEARCH_NOTES if matches <= SEARCH_RANK_LIMIT else SQL_SEARCH_NOTES_UNRANKED
+        return [row[0] for row in conn.execute(sql, (query, limit))]
+    pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return [row[0] for row in conn.execute(SQL_SEARCH_NOTES_LIKE, (pattern, pattern, limit))]
+
+
+def note_history(file_path):
+    """
+    Notun eski sürümlerini yeniden eskiye [(kayıt_zamanı, değiştirilme_zamanı, metin), ...]
+    olarak döndürür. Boş metin, notun silinmiş olduğu aralıktır; güncel not listede yoktur.
+    """
+    conn = get_connection()
+    key = path_key(file_path)
+    rows = conn.execute(SQL_NOTE_REVISIONS, (key,)).fetchall()
+    if not rows:
+        return []
+    return [(saved_at, replaced_at, text)
+            for (_, saved_at, replaced_at, *_), text in _revision_texts(rows, _current_text(conn, key))]
+
+
+def _current_text(conn, key):
+    """Anahtarın güncel not metni (not silinmişse boş); geçmiş zincirinin başı."""
+    row = conn.execute(SQL_GET_NOTE_BY_KEY, (key,)).fetchone()
+    return row[0] if row else ""
+
+
+def _revision_texts(rows, text):
+    """SQL_NOTE_REVISIONS satırlarını (satır, metin) olarak üretir; zincir güncel nottan (text) geriye çözülür."""
+    for row in rows:
+        text = note_delta.apply_delta(text, row[3])
+        yield row, text
+
+
+def compact_revisions(file_path=None):
+    """
+    Geçmişi REVISION_* ayarlarına göre küçültür (file_path verilmezse tüm notlar için);
+    silinen sürüm sayısını döndürür. Bkz. pack_revisions.
+    """
+    if file_path:
+        keys = [path_key(file_path)]
+    else:
+        keys = [row[0] for row in get_connection().execute(SQL_REVISION_KEYS)]
+    return pack_revisions(keys)
+
+
+def pack_revisions(keys, now=None):
+    """
+    Verilen path_key'lerin geçmişini düzenler: tetikleyicinin tam yazdığı (packed = 0)
+    sürümleri yeni komşularına göre fark olarak kodlar ve _plan_revisions'ın atılacak
+    bulduğu sürümleri siler; silinen sürüm sayısını döndürür.
+
+    Kayıt transaction'ından sonra çağrılır. Zincir bir okuma anlık görüntüsünden
+    okunur, farklar kilitsiz hesaplanır; yazma kilidi yalnızca sonuçları yazarken
+    alınır. Bu arada geçmiş başka bir yazmayla küçüldüyse (veya not taşındıysa) o
+    anahtar atlanır, sonraki kayıtta yeniden denenir. Yalnızca yeni sürüm eklendiyse
+    hesap geçerlidir: tetikleyici eski metni olduğu gibi yazdığından, "güncel not"a
+    göre kodlanan sürümün yeni komşusu tam o metindir.
+    """
+    now = time.time() if now is None else now
+    conn = get_connection()
+    removed = 0
+    for key in keys:
+        conn.execute("BEGIN") # Zincir ve güncel not aynı anlık görüntüden okunsun
+        try:
+            rows = conn.execute(SQL_NOTE_REVISIONS, (key,)).fetchall()
+            plan = _plan_revisions(conn, key, rows, now) if rows else None
+        finally:
+            conn.execute("COMMIT")
+        if not plan:
+            continue
+        updates, deletes = plan
+        with transaction() as conn:
+            ids = [row[0] for row in conn.execute(SQL_REVISION_IDS, (key,))]
+            if ids[len(ids) - len(rows):] != [row[0] for row in rows]:
+                continue
+            conn.executemany(SQL_SET_REVISION_DELTA, updates)
+            conn.executemany(SQL_DELETE_REVISION, [(rev_id,) for rev_id in deletes])
+        removed += len(deletes)
+    return removed
+
+
+def _plan_revisions(conn, key, rows, now):
+    """
+    Bir notun geçmişi için (yeni deltalar [(delta, id), ...], silinecek id'ler) döndürür;
+    yapılacak bir şey yoksa None. REVISION_MERGE_SECONDS'tan kısa süre geçerli kalmış
+    ara sürümler, REVISION_MAX_AGE_DAYS'ten eskiler ve REVISION_LIMIT'i aşan en eskiler
+    silinir. Silmenin kaydettiği sürüm (notun son metni) ne kadar kısa yaşamış olursa
+    olsun birleştirilmez; yalnızca yaş ve sayı sınırlarıyla silinir. Yeni komşusu silinen veya henüz kodlanmamış sürümler kalan yeni komşusuna
+    göre kodlanır (en eskiler silinince zincirde başka bir şey değişmez). Zincir yalnızca
+    kodlanacak en eski sürüme kadar çözülür.
+    """
+    min_time = now - REVISION_MAX_AGE_DAYS * 86400 if REVISION_MAX_AGE_DAYS else None
+    kept = set()
+    for rev_id, saved_at, replaced_at, _, _, deleted in rows:
+        merged = not deleted and replaced_at - saved_at < REVISION_MERGE_SECONDS
+        if merged or (min_time and replaced_at < min_time):
+            continue
+        if len(kept) < REVISION_LIMIT:
+            kept.add(rev_id)
+
+    needs_delta = set()
+    gap = False
+    for rev_id, _, _, _, packed, _ in rows:
+        if rev_id not in kept:
+            gap = True
+            continue
+        if gap or not packed:
+            needs_delta.add(rev_id)
+        gap = False
+    deletes = [row[0] for row in rows if row[0] not in kept]
+    if not needs_delta and not deletes:
+        return None
+
+    updates = []
+    if needs_delta:
+        current = _current_text(conn, key)
+        newer_text = current
+        for (rev_id, *_), text in _revision_texts(rows, current):
+            if rev_id in needs_delta:
+                updates.append((note_delta.make_delta(newer_text, text), rev_id))
+                if len(updates) == len(needs_delta):
+                    break
+            if rev_id in kept:
+                newer_text = text
+    return updates, deletes
+
+
+class NoteChangedError(Exception):
+    """Not parça parça okunurken değişti veya silindi (okuma baştan yapılmalı)."""
+
+
+class NoteReader:
+    """
+    Notu parça parça okur: saklanan değer SQLite artımlı blob G/Ç ile (blobopen)
+    okunur, sıkıştırılmış notlar akış halinde açılır, UTF-8 parça sınırlarında
+    bölünmez. Metnin tamamı hiçbir zaman tek seferde Python'a kopyalanmaz.
+    Her read_chunk() ayrı bir kısa okumadır (açık blob tutulmaz); arada not
+    değişirse NoteChangedError verilir. note_text verilirse (henüz yazılmamış
+    metin) veritabanı yerine o okunur. Tek thread'de (DB thread'i) kullanılır.
+    """
+    def __init__(self, file_path, note_text=None):
+        self.position = 0 # Verilen düz metin (UTF-8 bayt)
+        self._offset = 0 # Saklanan değerde okunan bayt
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._decompressor = None
+        if note_text is not None:
+            self._source = note_text.encode('utf-8')
+            self.note_id, self.updated_at, self.size = None, None, len(self._source)
+            self.done = not self._source
+            return
+        self._source = None
+        row = get_connection().execute(SQL_NOTE_STORAGE, (file_path,)).fetchone()
+        self.note_id, codec, self.size, self.updated_at = row if row else (None, CODEC_PLAIN, 0, None)
+        self.done = row is None
+        if codec == CODEC_ZLIB:
+            self._decompressor = zlib.decompressobj()
+        elif codec == CODEC_LZMA:
+            import lzma
+            self._decompressor = lzma.LZMADecompressor()
+
+    def read_chunk(self, size=NOTE_CHUNK_BYTES):
+        """Sonraki en fazla ~size baytlık metin parçası; bitmişse boş string."""
+        if self.done:
+            return ""
+        if self._source is not None:
+            data = self._source[self._offset:self._offset + size]
+            self._offset += len(data)
+            self.done = self._offset >= len(self._source)
+        else:
+            conn = get_connection()
+            row = conn.execute(SQL_NOTE_VERSION, (self.note_id,)).fetchone()
+            if row is None or row[0] != self.updated_at:
+                raise NoteChangedError("Not okunurken değişti")
+            data = self._read_plain(conn, size) if self._decompressor is None else self._inflate(conn, size)
+        self.position += len(data)
+        return self._decoder.decode(data, final=self.done)
+
+    def _read_plain(self, conn, size):
+        data, total = self._read_stored(conn, 'note_text', size)
+        self.done = self._offset >= total
+        return data
+
+    def _inflate(self, conn, size):
+        """Sıkıştırılmış değeri en fazla size bayt açılacak kadar okur (açılmış boyut sınırlı)."""
+        decompressor, parts, produced = self._decompressor, [], 0
+        while produced < size and not decompressor.eof:
+            data = getattr(decompressor, 'unconsumed_tail', b"") # zlib: sınır yüzünden bekleyen girdi
+            if not data and getattr(decompressor, 'needs_input', True):
+                data, _ = self._read_stored(conn, 'note_blob', size)
+            part = decompressor.decompress(data, size - produced)
+            if not part and not data: # Girdi bitti ama akış bitmedi
+                raise NoteChangedError("Sıkıştırılmış not eksik")
+            parts.append(part)
+            produced += len(part)
+        self.done = decompressor.eof
+        return b"".join(parts)
+
+    def _read_stored(self, conn, column, size):
+        """Saklanan değerden okuma konumundaki sonraki parça ve değerin toplam boyu."""
+        if hasattr(conn, 'blobopen'):
+            with conn.blobopen('notes', column, self.note_id, readonly=True) as blob:
+                blob.seek(self._offset)
+                data, total = blob.read(size), len(blob)
+        else:
+            data, total = conn.execute(SQL_READ_STORED[column], (self._offset + 1, size, self.note_id)).fetchone()
+        self._offset += len(data)
+        return data, total
+
+
+class BodyCache:
+    """
+    Not metinleri için LRU önbellek. Sınır kayıt sayısı değil toplam bayttır;
+    sığmayan en eski kayıtlar atılır, tek başına sınırı aşan metin tutulmaz.
+    """
+    def __init__(self, max_bytes=BODY_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items = OrderedDict() # dosya_yolu -> (metin, bayt)
+
+    def get(self, file_path):
+        item = self._items.get(file_path)
+        if item is None:
+            return None
+        self._items.move_to_end(file_path)
+        return item[0]
+
+    def put(self, file_path, note_text):
+        self.discard(file_path)
+        nbytes = len(note_text.encode('utf-8'))
+        if nbytes > self.max_bytes:
+            return
+        self._items[file_path] = (note_text, nbytes)
+        self.size += nbytes
+        while self.size > self.max_bytes:
+            _, (_, old_bytes) = self._items.popitem(last=False)
+            self.size -= old_bytes
+
+    def discard(self, file_path):
+        item = self._items.pop(file_path, None)
+        if item is not None:
+            self.size -= item[1]
+
+    def clear(self):
+        self._items.clear()
+        self.size = 0
+
+
+class NotedPathSet:
+    """
+    Notu olan yolların bellekteki kümesi (path_key'ler). Sunucu açılışta load()
+    ile doldurur; not yazan işlevler commit'ten sonra add()/discard() çağırır
+    (küme yüklenmemişse bunlar bir şey yapmaz). "Notu var mı?" sorusu böylece
+    veritabanına gitmeden tek bir hash araması ile yanıtlanır; Explorer simge/
+    sütun eklentileri bir klasörün binlerce dosyasını tek istekte sorabilir.
+    """
+    def __init__(self):
+        self._keys = None
+        self._lock = threading.Lock() # load() sırasında yapılan güncellemeler kaybolmasın
+
+    @property
+    def loaded(self):
+        return self._keys is not None
+
+    def __len__(self):
+        return len(self._keys or ())
+
+    def __contains__(self, file_path):
+        return path_key(file_path) in self._keys
+
+    def contains_many(self, file_paths):
+        keys = self._keys
+        return [path_key(path) in keys for path in file_paths]
+
+    def select_keys(self, keys):
+        """Verilen path_key'lerden notu olanlar (sıra korunur)."""
+        known = self._keys
+        return [key for key in keys if key in known]
+
+    def load(self):
+        """Kümeyi veritabanından (path_key dizininden) yeniden kurar; not sayısını döndürür."""
+        with self._lock:
+            self._keys = {row[0] for row in get_connection().execute(SQL_NOTE_KEYS)}
+            return len(self._keys)
+
+    def add(self, file_paths):
+        with self._lock:
+            if self._keys is not None:
+                self._keys.update(map(path_key, file_paths))
+
+    def discard(self, file_paths):
+        with self._lock:
+            if self._keys is not None:
+                self._keys.difference_update(map(path_key, file_paths))
+
+
+noted_paths = NotedPathSet() # Sunucu yükler; komut satırı araçlarında boş kalır
+
+
+def _scan_directory(directory, subdirs=None):
+    """
+    Klasördeki girdileri tek scandir çağrısıyla okur: {ad: kimlik}.
+    subdirs bir liste ise alt klasörlerin yolları da ona eklenir (is_dir ek
+    stat gerektirmez). Klasör yoksa {}, ulaşılamıyorsa None döner.
+    """
+    try:
+        device = os.stat(directory).st_dev
+        listing = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                listing[entry.name] = _identity(device, entry.inode())
+                if subdirs is not None and entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+        return listing
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+    except (OSError, ValueError):
+        return None
+
+
+def _scan_directories(directories, workers, deadline, subdirs=None):
+    """
+    Klasörleri paralel olarak _scan_directory ile okur: {klasör: girdiler veya None}.
+    deadline'a (time.monotonic) kadar bitmeyenler (örn. kapalı ağ paylaşımı) None olur.
+    """
+    if not directories:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="path-scan")
+    futures = {executor.submit(_scan_directory, directory, subdirs): directory for directory in directories}
+    done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+    executor.shutdown(wait=False, cancel_futures=True) # Takılan klasörleri bekleme
+    return {directory: future.result() if future in done else None for future, directory in futures.items()}
+
+
+def relink_moved_notes(search_dirs=(), max_depth=3, workers=SCAN_WORKERS, timeout=SCAN_TIMEOUT):
+    """
+    Yeniden adlandırılan veya taşınan dosyaların notlarını yeni yollarına bağlar.
+
+    Dosya sistemi baştan sona taranmaz: sadece notlu dosyaların bulunduğu
+    klasörler, kayıp notların üst klasörleri ile bunların alt klasörleri (kardeş
+    klasöre taşıma: a\\b\\f -> a\\c\\f) ve isteğe bağlı search_dirs (en fazla
+    max_depth derinlikte) okunur; her klasör bir kez scandir edilir. Klasörler
+    scan_note_paths gibi paralel ve toplam 'timeout' saniyelik sınırla okunur;
+    yanıt vermeyenler ulaşılamıyor sayılır. Adlar büyük/küçük harf duyarsız
+    karşılaştırılır (path_key gibi). Kayıp notların kimliği bu girdilerde aranır
+    ve eşleşenler tek transaction ile güncellenir. Kimliği olmayan eski
+    kayıtların kimlikleri de doldurulur.
+
+    [(eski_yol, yeni_yol), ...] döndürür.
+    """
+    deadline = time.monotonic() + timeout
+    notes = get_connection().execute(SQL_NOTE_IDENTITIES).fetchall()
+    noted_keys = {path_key(path) for _, path, _ in notes}
+
+    # 1) Notlu klasörleri, sonra kayıp notların üst klasörlerini birer kez tara
+    located = [] # (id, yol, kimlik, klasör, ad)
+    for note_id, path, file_id in notes:
+        directory, name = os.path.split(path.rstrip("\\/"))
+        if directory and name:
+            located.append((note_id, path, file_id, directory, name.casefold()))
+    listings = _scan_directories({item[3] for item in located}, workers, deadline)
+    folded = {directory: {name.casefold(): identity for name, identity in listing.items()}
+              for directory, listing in listings.items() if listing is not None}
+
+    missing = [] # (id, yol, kimlik)
+    backfill = [] # (kimlik, id)
+    parents = set() # Kayıp notların üst klasörleri (aynı ağaçta taşınan dosyalar)
+    for note_id, path, file_id, directory, name in located:
+        entries = folded.get(directory)
+        if entries is None:
+            continue # Klasör ulaşılamıyor (ağ paylaşımı kapalı olabilir)
+        if name in entries:
+            if file_id is None and entries[name]:
+                backfill.append((entries[name], note_id))
+        elif file_id:
+            missing.append((note_id, path, file_id))
+            parents.add(os.path.dirname(directory))
+    siblings = [] # Üst klasörlerin alt klasörleri; aynı süre sınırı içinde bir seviye inilir
+    listings.update(_scan_directories(parents - listings.keys(), workers, deadline, siblings))
+    listings.update(_scan_directories(set(siblings) - listings.keys(), workers, deadline))
+
+    # 2) Ek arama klasörleri (kullanıcının verdiği kökler)
+    for root in search_dirs:
+        base_depth = root.rstrip("\\/").count(os.sep)
+        for directory, subdirs, _ in os.walk(root):
+            if time.monotonic() > deadline:
+                break
+            if directory not in listings:
+                listings[directory] = _scan_directory(directory)
+            if directory.count(os.sep) - base_depth >= max_depth:
+                subdirs.clear()
+
+    # 3) Kimlik -> yeni yol eşlemesi ve toplu güncelleme
+    moved = []
+    if missing:
+        by_identity = {}
+        for directory, listing in listings.items():
+            for name, identity in (listing or {}).items():
+                if identity:
+                    by_identity.setdefault(identity, os.path.join(directory, name))
+        for note_id, path, file_id in missing:
+            new_path = by_identity.get(file_id)
+            if new_path and path_key(new_path) not in noted_keys:
+                noted_keys.add(path_key(new_path))
+                moved.append((note_id, path, new_path, file_id))
+
+    if moved or backfill:
+        with transaction() as conn:
+            conn.executemany(SQL_SET_FILE_ID, backfill)
+            conn.executemany(SQL_RELINK_NOTE, [(new_path, file_id, note_id)
+                                               for note_id, _, new_path, file_id in moved])
+        noted_paths.discard(path for _, path, _, _ in moved)
+        noted_paths.add(new_path for _, _, new_path, _ in moved)
+    return [(path, new_path) for _, path, new_path, _ in moved]
+
+
+def _stat_directory(directory, names):
+    """
+    Bir klasördeki notlu girdilerin değiştirme zamanlarını tek scandir ile okur.
+    names ve dönen {ad: mtime} anahtarları casefold edilmiş adlardır (Windows dosya
+    sistemleri ve path_key büyük/küçük harf duyarsızdır). Klasör yoksa {} (hepsi
+    kayıp), ulaşılamıyorsa None döner.
+    """
+    found = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name.casefold()
+                if name in names:
+                    try:
+                        found[name] = entry.stat().st_mtime # Windows'ta ek çağrı gerekmez
+                    except OSError:
+                        found[name] = None
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+    except (OSError, ValueError):
+        return None
+    return found
+
+
+def scan_note_paths(workers=SCAN_WORKERS, timeout=SCAN_TIMEOUT):
+    """
+    Tüm notlu yolların hâlâ var olup olmadığını kontrol edip path_status'a yazar.
+
+    Yollar klasörlerine göre gruplanır; her klasör bir kez ve paralel olarak
+    okunur. Süre sınırında bitmeyen (örn. kapalı ağ paylaşımı) klasörlerin
+    sonuçları yazılmaz, önceki durumları korunur.
+    {'checked': n, 'missing': n, 'unreachable': n} döndürür.
+    """
+    by_directory = {}
+    for note_id, path in get_connection().execute(SQL_NOTE_PATHS):
+        directory, name = os.path.split(path.rstrip("\\/"))
+        if directory and name:
+            by_directory.setdefault(directory, []).append((note_id, name.casefold()))
+
+    now = time.time()
+    rows, unreachable = [], 0
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="path-scan")
+    futures = {executor.submit(_stat_directory, directory, {name for _, name in items}): directory
+               for directory, items in by_directory.items()}
+    done, not_done = wait(futures, timeout=timeout)
+    executor.shutdown(wait=False, cancel_futures=True) # Takılan klasörleri bekleme
+
+    for future in done:
+        items = by_directory[futures[future]]
+        found = future.result()
+        if found is None:
+            unreachable += len(items)
+            continue
+        for note_id, name in items:
+            exists = name in found
+            rows.append((note_id, int(exists), found.get(name), now))
+    unreachable += sum(len(by_directory[futures[future]]) for future in not_done)
+
+    with transaction() as conn:
+        conn.executemany(SQL_SET_PATH_STATUS, rows)
+    return {'checked': len(rows), 'missing': sum(1 for row in rows if not row[1]),
+            'unreachable': unreachable}
+
+
+def list_orphan_paths():
+    """Son taramada dosyası bulunamayan notların yolları."""
+    return [row[0] for row in get_connection().execute(SQL_ORPHAN_PATHS)]
+
+
+def purge_orphans():
+    """Dosyası bulunamayan tüm notları tek transaction ile siler; silinen yolları döndürür."""
+    with transaction() as conn:
+        paths = [row[0] for row in conn.execute(SQL_ORPHAN_PATHS)]
+        conn.execute(SQL_PURGE_ORPHANS)
+    noted_paths.discard(paths)
+    return paths
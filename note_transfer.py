@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+FileNoter notlarını dışa/içe aktarma (--export / --import).
+
+Notlar JSONL (satır başına bir JSON nesnesi) veya CSV olarak akış halinde
+yazılır ve okunur: okuyucular ve yazıcılar üreteçtir, veritabanı tarafı da
+parça parça okuyup toplu transaction'larla yazar. Bu yüzden bellek kullanımı
+dosyadaki not sayısından bağımsızdır. Arayüz (Tk) yüklenmez; sunucu
+çalışırken de kullanılabilir (WAL).
+
+    FileNoter.exe --export notlar.jsonl
+    FileNoter.exe --import notlar.csv --on-conflict append
+"""
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+import time
+
+import note_ipc
+import note_store
+
+FORMATS = ("jsonl", "csv")
+CONFLICT_POLICIES = ("skip", "overwrite", "append")
+FIELDS = ("file_path", "note_text", "updated_at")
+
+
+def detect_format(path):
+    """Dosya uzantısından biçimi tahmin eder (bilinmiyorsa jsonl)."""
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def write_jsonl(rows, stream):
+    """(dosya_yolu, not_metni, değiştirme_zamanı) satırlarını JSONL olarak yazar; satır sayısını döndürür."""
+    count = 0
+    for file_path, note_text, updated_at in rows:
+        stream.write(json.dumps({'file_path': file_path, 'note_text': note_text, 'updated_at': updated_at},
+                                ensure_ascii=False))
+        stream.write("\n")
+        count += 1
+    return count
+
+
+def read_jsonl(stream):
+    """JSONL satırlarını (dosya_yolu, not_metni, değiştirme_zamanı) olarak üretir."""
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            yield record['file_path'], record.get('note_text') or "", _timestamp(record.get('updated_at'))
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"{line_no}. satır okunamadı: {e}") from None
+
+
+def write_csv(rows, stream):
+    """Satırları başlıklı CSV olarak yazar (çok satırlı notlar tırnak içinde); satır sayısını döndürür."""
+    writer = csv.writer(stream)
+    writer.writerow(FIELDS)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def read_csv(stream):
+    """Başlıklı CSV'yi (dosya_yolu, not_metni, değiştirme_zamanı) olarak üretir."""
+    csv.field_size_limit(2 ** 31 - 1) # Uzun notlar varsayılan 128 KB alan sınırını aşabilir
+    reader = csv.DictReader(stream)
+    if not reader.fieldnames or 'file_path' not in reader.fieldnames:
+        raise ValueError("CSV başlığında 'file_path' sütunu yok")
+    for record in reader:
+        try:
+            yield record['file_path'], record.get('note_text') or "", _timestamp(record.get('updated_at'))
+        except ValueError as e:
+            raise ValueError(f"{reader.line_num}. satır okunamadı: {e}") from None
+
+
+def _timestamp(value):
+    """Boş değerleri None'a, diğerlerini Unix zamanına (float) çevirir."""
+    return float(value) if value not in (None, "") else None
+
+
+WRITERS = {'jsonl': write_jsonl, 'csv': write_csv}
+READERS = {'jsonl': read_jsonl, 'csv': read_csv}
+
+
+def _open(path, mode):
+    """'-' için stdin/stdout, diğerleri için UTF-8 dosya (CSV'de Excel için BOM'lu)."""
+    if path == "-":
+        stream = sys.stdout if mode == "w" else sys.stdin
+        stream.reconfigure(encoding="utf-8", newline="") # Windows konsol kod sayfası yerine UTF-8
+        return stream
+    # utf-8-sig okurken BOM varsa atlar, yoksa düz UTF-8 gibi davranır
+    return open(path, mode, encoding="utf-8-sig" if path.lower().endswith(".csv") else "utf-8", newline="")
+
+
+def export_notes(path, fmt=None):
+    """Tüm notları dosyaya yazar; yazılan not sayısını döndürür."""
+    fmt = fmt or detect_format(path)
+    stream = _open(path, "w")
+    try:
+        return WRITERS[fmt](note_store.iter_notes(), stream)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+
+def import_notes(path, fmt=None, on_conflict="skip", batch_size=note_store.TRANSFER_BATCH):
+    """Dosyadaki notları veritabanına aktarır; (okunan, yazılan) döndürür."""
+    fmt = fmt or detect_format(path)
+    stream = _open(path, "r")
+    try:
+        return note_store.import_notes(READERS[fmt](stream), on_conflict, batch_size)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def main(argv):
+    """--export/--import komut satırı eylemleri; çıkış kodunu döndürür."""
+    parser = argparse.ArgumentParser(prog="FileNoter.exe", description="FileNoter notlarını dışa/içe aktarır.")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--export', metavar='DOSYA', help="Tüm notları dosyaya yaz ('-' ile stdout)")
+    action.add_argument('--import', dest='import_path', metavar='DOSYA', help="Dosyadaki notları ekle ('-' ile stdin)")
+    parser.add_argument('--format', choices=FORMATS, help="Dosya biçimi (varsayılan: uzantıdan, .csv dışı jsonl)")
+    parser.add_argument('--on-conflict', choices=CONFLICT_POLICIES, default="skip",
+                        help="Yolda zaten not varsa: koru (skip), değiştir (overwrite) veya sona ekle (append)")
+    parser.add_argument('--batch-size', type=int, default=note_store.TRANSFER_BATCH,
+                        help="Transaction başına satır sayısı")
+    args = parser.parse_args(argv)
+    # Pencereli (console=False) exe'de yönlendirilmemiş stdout/stdin None olur
+    if (args.export == "-" and sys.stdout is None) or (args.import_path == "-" and sys.stdin is None):
+        print("Hata: '-' için stdout/stdin yok; çıktıyı/girdiyi yönlendirin (örn. '> notlar.jsonl').",
+              file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        note_store.init_db()
+        if args.export:
+            count = export_notes(args.export, args.format)
+            summary = f"{count} not dışa aktarıldı"
+        else:
+            read, written = import_notes(args.import_path, args.format, args.on_conflict, args.batch_size)
+            summary = f"{read} satır okundu, {written} not yazıldı ({args.on_conflict})"
+            note_ipc.notify("--notes-changed") # Çalışan sunucu notlu yol kümesini yenilesin
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    finally:
+        note_store.close_all()
+    # Özet stderr'e: '--export -' çıktısı bozulmasın
+    print(f"{summary}, {time.perf_counter() - start:.2f} sn.", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Testler için ortak yardımcılar: depo kökünü içe aktarma yoluna ekler ve her
+testi boş, geçici bir veritabanında çalıştıran StoreTestCase'i sağlar.
+
+Çalıştırma (depo kökünden):
+    python -m pytest -q tests
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+import note_store
+
+# Testlerin değiştirebildiği ayarlar; her testten sonra geri yüklenir
+STORE_SETTINGS = ('COMPRESS_THRESHOLD', 'COMPRESS_CODEC', 'REVISION_MERGE_SECONDS', 'REVISION_LIMIT')
+
+
+class StoreTestCase(unittest.TestCase):
+    """
+    note_store'u geçici bir veritabanı dosyasına yönlendirir. init_db() çağrılmaz:
+    göç testleri veritabanını eski şemayla kendileri kurar; diğerleri open_store()
+    kullanır.
+    """
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self._tmp.name, 'test.db')
+        self._settings = {name: getattr(note_store, name) for name in STORE_SETTINGS}
+        self._noted_paths = note_store.noted_paths
+        note_store.noted_paths = note_store.NotedPathSet()
+        note_store.set_db_path(self.db_path)
+
+    def tearDown(self):
+        note_store.close_all()
+        for name, value in self._settings.items():
+            setattr(note_store, name, value)
+        note_store.noted_paths = self._noted_paths
+        self._tmp.cleanup()
+
+    def open_store(self):
+        """Son şemayla boş bir veritabanı kurar; bağlantıyı döndürür."""
+        note_store.init_db()
+        return note_store.get_connection()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Şema göçleri: ilk sürümün (user_version 0) veritabanından son sürüme tam zincir,
+aynı dosyanın farklı yazımlarının birleştirilmesi (göç 6), büyük notların
+sıkıştırılması (göç 9) ve silinen notların son sürümünün işaretlenmesi (göç 11).
+"""
+import sqlite3
+import unittest
+
+import support
+import note_store
+
+
+def create_baseline(db_path, rows):
+    """İlk sürümün şemasıyla (sadece file_path/note_text) bir veritabanı kurar."""
+    conn = sqlite3.connect(db_path)
+    conn.execute(note_store.SQL_CREATE_NOTES)
+    conn.executemany("INSERT INTO notes (file_path, note_text) VALUES (?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def migrate_to(version):
+    """Boş veritabanını init_db gibi, ama yalnızca 'version' sürümüne kadar taşır."""
+    with note_store.transaction() as conn:
+        conn.execute(note_store.SQL_CREATE_NOTES)
+        for step in range(version):
+            for statement in note_store._split_script(note_store.MIGRATIONS[step]):
+                conn.execute(statement)
+        conn.execute(f"PRAGMA user_version = {version}")
+
+
+class BaselineMigrationTest(support.StoreTestCase):
+    def user_version(self):
+        return note_store.get_connection().execute("PRAGMA user_version").fetchone()[0]
+
+    def test_new_database_gets_latest_schema(self):
+        self.open_store()
+        self.assertEqual(self.user_version(), len(note_store.MIGRATIONS))
+
+    def test_full_chain_keeps_notes(self):
+        rows = [("C:\\Belgeler\\rapor.docx", "Çeyrek raporu\nikinci satır"), ("D:\\x.txt", "kısa")]
+        create_baseline(self.db_path, rows)
+        note_store.init_db()
+        self.assertEqual(self.user_version(), len(note_store.MIGRATIONS))
+        for file_path, text in rows:
+            self.assertEqual(note_store.get_note(file_path), text)
+        conn = note_store.get_connection()
+        self.assertEqual(dict(conn.execute("SELECT file_path, path_key FROM notes")),
+                         {path: note_store.path_key(path) for path, _ in rows})
+        self.assertEqual(dict(conn.execute("SELECT file_path, note_size FROM notes")),
+                         {path: len(text.encode('utf-8')) for path, text in rows})
+        self.assertEqual(note_store.search_notes("çeyrek"), [rows[0][0]])
+
+    def test_duplicate_path_keys_are_merged(self):
+        create_baseline(self.db_path, [
+            ("C:\\Proje\\a.txt", "eski yazım"),
+            ("\\\\?\\C:\\proje\\.\\A.txt", "aynı metin"),
+            ("c:/proje/a.txt", "en yeni"),
+            ("c:\\PROJE\\A.TXT", "aynı metin"),
+            ("C:\\Proje\\b.txt", "ayrı dosya"),
+        ])
+        note_store.init_db()
+        rows = note_store.get_connection().execute("SELECT file_path, note_text FROM notes ORDER BY id").fetchall()
+        self.assertEqual(len(rows), 2)
+        kept = dict(rows)
+        self.assertEqual(kept["C:\\Proje\\b.txt"], "ayrı dosya")
+        # Eşitlikte en son eklenen kalır; farklı metinler ona eklenir (aynı metin bir kez)
+        merged = kept["c:\\PROJE\\A.TXT"]
+        self.assertTrue(merged.startswith("aynı metin"))
+        for text in ("eski yazım", "en yeni"):
+            self.assertIn(text, merged)
+        self.assertEqual(merged.count("aynı metin"), 1)
+        self.assertEqual(note_store.get_note("C:\\proje\\A.txt"), merged)
+
+    def test_large_notes_are_compressed(self):
+        threshold = 1024
+        note_store.COMPRESS_THRESHOLD = threshold
+        long_text = "Eski sürümden kalma uzun not satırı\n" * (threshold // 16 + 1)
+        rows = [("C:\\eski\\uzun.txt", long_text), ("C:\\eski\\kisa.txt", "kısa not")]
+        create_baseline(self.db_path, rows)
+        note_store.init_db()
+        codecs = dict(note_store.get_connection().execute("SELECT file_path, codec FROM notes"))
+        self.assertNotEqual(codecs[rows[0][0]], note_store.CODEC_PLAIN, "büyük not sıkıştırılmadı")
+        self.assertEqual(codecs[rows[1][0]], note_store.CODEC_PLAIN, "kısa not sıkıştırıldı")
+        for file_path, text in rows:
+            self.assertEqual(note_store.get_note(file_path), text)
+        self.assertEqual(note_store.search_notes("kalma"), [rows[0][0]])
+
+    def test_history_works_after_migration(self):
+        note_store.REVISION_MERGE_SECONDS = 0 # Göç 2 updated_at'i şimdiye ayarlar; eski metin az önce kaydedilmiş sayılır
+        create_baseline(self.db_path, [("C:\\a.txt", "ilk")])
+        note_store.init_db()
+        note_store.save_note_texts({"C:\\a.txt": "ikinci"})
+        self.assertEqual([text for _, _, text in note_store.note_history("C:\\a.txt")], ["ilk"])
+
+
+class DeletedRevisionMigrationTest(support.StoreTestCase):
+    def test_last_revision_of_deleted_note_is_flagged(self):
+        migrate_to(10)
+        with note_store.transaction() as conn:
+            conn.executemany(note_store.SQL_UPSERT_NOTE, [note_store.note_row("C:\\silinen.txt", "son metin"),
+                                                          note_store.note_row("C:\\duran.txt", "v1")])
+            conn.execute(note_store.SQL_UPSERT_NOTE, note_store.note_row("C:\\duran.txt", "v2"))
+            conn.execute(note_store.SQL_DELETE_NOTE, ("C:\\silinen.txt",))
+        note_store.init_db()
+        flags = dict(conn.execute("SELECT path_key, deleted FROM note_revisions"))
+        self.assertEqual(flags, {"c:\\silinen.txt": 1, "c:\\duran.txt": 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""note_delta: make_delta/apply_delta gidiş-dönüşleri ve boyut sınırları."""
+import random
+import unittest
+from unittest import mock
+
+import support # Depo kökünü içe aktarma yoluna ekler
+import note_delta
+from note_delta import apply_delta, make_delta
+
+
+class DeltaRoundTripTest(unittest.TestCase):
+    def assertRoundTrip(self, base, text):
+        self.assertEqual(apply_delta(base, make_delta(base, text)), text or "")
+
+    def test_empty_sides(self):
+        for base, text in (("", ""), ("", "yeni not\n"), ("eski not\n", ""), (None, "x"), ("x", None)):
+            self.assertRoundTrip(base, text)
+
+    def test_identical(self):
+        text = "satır 1\nsatır 2\n"
+        self.assertRoundTrip(text, text)
+
+    def test_changes_at_head_middle_and_tail(self):
+        base = "".join(f"satır {i}\n" for i in range(100))
+        lines = base.splitlines(keepends=True)
+        self.assertRoundTrip(base, "yeni baş\n" + base)
+        self.assertRoundTrip(base, base + "yeni son\n")
+        self.assertRoundTrip(base, "".join(lines[:40] + ["değişti\n"] + lines[41:]))
+        self.assertRoundTrip(base, "".join(lines[:10] + lines[60:]))
+
+    def test_line_endings_and_missing_final_newline(self):
+        self.assertRoundTrip("a\r\nb\r\nc", "a\r\nB\r\nc")
+        self.assertRoundTrip("a\nb\n", "a\nb")
+        self.assertRoundTrip("a\rb\rc\r", "a\rx\rc\r")
+
+    def test_unicode(self):
+        self.assertRoundTrip("Çalışma notu: ğüşiöç\n😀\n", "Çalışma notu: ĞÜŞİÖÇ\n😀\n")
+
+    def test_random_edits(self):
+        rng = random.Random(7)
+        words = ["rapor", "fatura", "proje", "müşteri", "", "toplantı"]
+        for _ in range(50):
+            base = [rng.choice(words) + "\n" for _ in range(rng.randrange(0, 60))]
+            text = list(base)
+            for _ in range(rng.randrange(1, 6)):
+                position = rng.randrange(0, len(text) + 1)
+                if text and rng.random() < 0.5:
+                    del text[position - 1]
+                else:
+                    text.insert(position, rng.choice(words) + " yeni\n")
+            self.assertRoundTrip("".join(base), "".join(text))
+
+    def test_small_edit_gives_small_delta(self):
+        base = "".join(f"uzun bir not satırı {i}\n" for i in range(5000))
+        text = base.replace("satırı 2500\n", "satırı 2500 (düzeltildi)\n")
+        delta = make_delta(base, text)
+        self.assertLess(len(delta), 100)
+        self.assertEqual(apply_delta(base, delta), text)
+
+
+class DeltaLimitTest(unittest.TestCase):
+    """Değişen kısım DIFF_MAX_* sınırını aşınca metin eşlenmeden olduğu gibi yazılır."""
+    def test_line_limit(self):
+        base = "".join(f"a{i}\n" for i in range(50))
+        text = "".join(f"a{i}\n" if i % 2 else f"b{i}\n" for i in range(50))
+        with mock.patch.object(note_delta, 'DIFF_MAX_LINES', 10), \
+                mock.patch.object(note_delta, 'SequenceMatcher') as matcher:
+            delta = make_delta(base, text)
+        matcher.assert_not_called()
+        self.assertEqual(apply_delta(base, delta), text)
+
+    def test_byte_limit(self):
+        base = "x\n" + "a" * 1000 + "\ny\n"
+        text = "x\n" + "b" * 1000 + "\ny\n"
+        with mock.patch.object(note_delta, 'DIFF_MAX_BYTES', 100), \
+                mock.patch.object(note_delta, 'SequenceMatcher') as matcher:
+            delta = make_delta(base, text)
+        matcher.assert_not_called()
+        self.assertEqual(apply_delta(base, delta), text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""IPC çerçeveleme (MessageBuffer) ve IpcServer'ın Future yanıtlarında sıra koruması."""
+import threading
+import time
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest import mock
+
+import support # Depo kökünü içe aktarma yoluna ekler
+import note_ipc
+from note_ipc import MessageBuffer, ProtocolError, encode_message
+
+
+class MessageBufferTest(unittest.TestCase):
+    def test_message_split_across_reads(self):
+        data = encode_message({'action': '--view', 'file_path': "C:\\Çalışma\\not.txt"})
+        buffer = MessageBuffer()
+        for i in range(len(data) - 1):
+            self.assertEqual(buffer.feed(data[i:i + 1]), [])
+        self.assertEqual(buffer.feed(data[-1:]), [{'action': '--view', 'file_path': "C:\\Çalışma\\not.txt"}])
+
+    def test_several_messages_in_one_read(self):
+        messages = [{'id': i, 'action': '--has-note'} for i in range(5)]
+        data = b"".join(map(encode_message, messages))
+        buffer = MessageBuffer()
+        self.assertEqual(buffer.feed(data[:-3]), messages[:4])
+        self.assertEqual(buffer.feed(data[-3:]), messages[4:])
+
+    def test_blank_lines_are_ignored(self):
+        self.assertEqual(MessageBuffer().feed(b"\n  \n" + encode_message({'a': 1})), [{'a': 1}])
+
+    def test_invalid_messages(self):
+        for line in (b"{bozuk\n", b"[1, 2]\n", b"\xff\xfe\n"):
+            with self.assertRaises(ProtocolError):
+                MessageBuffer().feed(line)
+
+    def test_size_limit(self):
+        with mock.patch.object(note_ipc, 'MAX_MESSAGE_BYTES', 100):
+            buffer = MessageBuffer()
+            buffer.feed(b'{"a": "' + b"x" * 50)
+            with self.assertRaises(ProtocolError):
+                buffer.feed(b"x" * 60)
+
+    def test_flush_returns_unterminated_message(self):
+        buffer = MessageBuffer()
+        self.assertEqual(buffer.feed(b'{"action": "--view-all"}'), [])
+        self.assertEqual(buffer.flush(), [{'action': '--view-all'}])
+        self.assertEqual(buffer.flush(), [])
+
+
+class IpcServerTest(unittest.TestCase):
+    """Handler Future döndürdüğünde yanıt iş bitince ve istek sırasıyla gönderilir."""
+    def setUp(self):
+        self.pool = ThreadPoolExecutor(max_workers=4)
+        self.gate = threading.Event()
+        self.server = note_ipc.IpcServer(self.handle, port=0)
+        self.server.bind()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.gate.set()
+        self.server.stop()
+        self.thread.join(5)
+        self.pool.shutdown()
+
+    def handle(self, message):
+        action = message['action']
+        if action == 'slow':
+            return self.pool.submit(lambda: (self.gate.wait(5), 'slow')[1])
+        if action == 'fail':
+            future = Future()
+            future.set_exception(ValueError("iş başarısız"))
+            return future
+        if action == 'boom':
+            raise RuntimeError("işleyici hatası")
+        return action
+
+    def client(self):
+        return note_ipc.IpcClient(*self.server.address, reply_timeout=5)
+
+    def test_replies_keep_request_order(self):
+        threading.Timer(0.2, self.gate.set).start()
+        actions = ['slow', 'fast', 'slow', 'fast']
+        with self.client() as client:
+            client.sock.sendall(b"".join(encode_message({'id': i, 'action': action})
+                                         for i, action in enumerate(actions)))
+            buffer, replies = MessageBuffer(), []
+            while len(replies) < len(actions): # Yanıtlar bağlantıdan geldiği sırayla
+                replies.extend(buffer.feed(client.sock.recv(note_ipc.RECV_SIZE)))
+        self.assertEqual([(reply['id'], reply['result']) for reply in replies], list(enumerate(actions)))
+
+    def test_other_clients_are_served_while_a_future_runs(self):
+        with self.client() as slow:
+            slow.sock.sendall(encode_message({'id': 1000, 'action': 'slow'})) # İstemcinin kendi id'leriyle çakışmasın
+            started = time.perf_counter()
+            with self.client() as fast:
+                self.assertEqual(fast.request('fast')['result'], 'fast')
+            self.assertLess(time.perf_counter() - started, 2.0)
+            self.gate.set()
+            self.assertEqual(slow.request('fast')['result'], 'fast')
+
+    def test_errors_are_replied(self):
+        with self.client() as client:
+            failed, raised, ok = client.request_many([{'action': 'fail'}, {'action': 'boom'}, {'action': 'x'}])
+        self.assertEqual((failed['ok'], failed['error']), (False, "iş başarısız"))
+        self.assertEqual((raised['ok'], raised['error']), (False, "işleyici hatası"))
+        self.assertEqual(ok['result'], 'x')
+
+
+if __name__ == '__main__':
+    unittest.main()
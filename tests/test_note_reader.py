@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Sıkıştırılmış notlar (pack_note/unpack_note) ve parça parça okuma (NoteReader)."""
+import unittest
+
+import support
+import note_store
+
+
+def read_all(file_path, size, note_text=None):
+    """Notu NoteReader ile 'size' baytlık parçalarla okur: (metin, parça sayısı)."""
+    reader, chunk = note_store.open_note_reader(file_path, note_text, size)
+    parts = [chunk]
+    while not reader.done:
+        parts.append(reader.read_chunk(size))
+    return "".join(parts), len(parts)
+
+
+class PackNoteTest(unittest.TestCase):
+    def test_short_note_stays_plain(self):
+        self.assertEqual(note_store.pack_note("kısa"), ("kısa", None, note_store.CODEC_PLAIN))
+
+    def test_round_trip_for_each_codec(self):
+        text = "Sıkıştırılacak tekrar eden satır ğüşiöç\n" * 500
+        saved = note_store.COMPRESS_CODEC
+        try:
+            for codec in note_store.CODECS:
+                note_store.COMPRESS_CODEC = codec
+                packed = note_store.pack_note(text)
+                self.assertIsNone(packed[0])
+                self.assertEqual(packed[2], note_store.CODECS[codec])
+                self.assertEqual(note_store.unpack_note(*packed), text)
+        finally:
+            note_store.COMPRESS_CODEC = saved
+
+
+class NoteReaderTest(support.StoreTestCase):
+    # Çok baytlı karakterler parça sınırlarına denk gelsin
+    TEXT = "".join(f"{i}: Çalışma notu ğüşİÖÇ 😀\n" for i in range(3000))
+
+    def setUp(self):
+        super().setUp()
+        self.open_store()
+        note_store.COMPRESS_THRESHOLD = 4096
+
+    def test_plain_note_in_chunks(self):
+        note_store.COMPRESS_THRESHOLD = 10 ** 9
+        note_store.save_note_texts({"C:\\düz.txt": self.TEXT})
+        text, chunks = read_all("C:\\düz.txt", 1000)
+        self.assertEqual(text, self.TEXT)
+        self.assertGreater(chunks, 10)
+
+    def test_compressed_note_in_chunks(self):
+        note_store.save_note_texts({"C:\\sıkışık.txt": self.TEXT})
+        codec = note_store.get_connection().execute("SELECT codec FROM notes").fetchone()[0]
+        self.assertNotEqual(codec, note_store.CODEC_PLAIN)
+        text, chunks = read_all("C:\\sıkışık.txt", 777)
+        self.assertEqual(text, self.TEXT)
+        self.assertGreater(chunks, 10)
+        self.assertEqual(note_store.get_note("C:\\sıkışık.txt"), self.TEXT)
+
+    def test_unsaved_text_is_read_instead_of_database(self):
+        note_store.save_note_texts({"C:\\a.txt": "kayıtlı"})
+        self.assertEqual(read_all("C:\\a.txt", 5, "yazılmamış ğ metin")[0], "yazılmamış ğ metin")
+
+    def test_missing_note(self):
+        reader, chunk = note_store.open_note_reader("C:\\yok.txt")
+        self.assertTrue(reader.done)
+        self.assertEqual(chunk, "")
+
+    def test_change_during_read_is_detected(self):
+        note_store.save_note_texts({"C:\\a.txt": self.TEXT})
+        reader, _ = note_store.open_note_reader("C:\\a.txt", size=1000)
+        note_store.save_note_texts({"C:\\a.txt": self.TEXT + "ek"})
+        with self.assertRaises(note_store.NoteChangedError):
+            reader.read_chunk(1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
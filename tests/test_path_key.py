@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""path_key (kanonik yol anahtarı), ancestor_keys ve path_in_folder."""
+import unittest
+
+import support # Depo kökünü içe aktarma yoluna ekler
+import note_store
+from note_store import ancestor_keys, path_key
+
+
+class PathKeyTest(unittest.TestCase):
+    def test_case_and_separators(self):
+        self.assertEqual(path_key("C:\\Proje\\Rapor.TXT"), "c:\\proje\\rapor.txt")
+        self.assertEqual(path_key("C:/Proje/Rapor.txt"), "c:\\proje\\rapor.txt")
+        self.assertEqual(path_key("C:\\Proje/alt\\f.txt"), "c:\\proje\\alt\\f.txt")
+
+    def test_turkish_letters_are_case_insensitive(self):
+        self.assertEqual(path_key("C:\\ŞUBAT\\ÖZET.txt"), path_key("c:\\şubat\\özet.txt"))
+
+    def test_redundant_parts_are_resolved(self):
+        self.assertEqual(path_key("C:\\a\\\\b\\.\\c\\..\\f.txt"), "c:\\a\\b\\f.txt")
+        self.assertEqual(path_key("C:\\a\\b\\"), "c:\\a\\b")
+
+    def test_long_path_prefixes(self):
+        self.assertEqual(path_key("\\\\?\\C:\\a\\f.txt"), "c:\\a\\f.txt")
+        self.assertEqual(path_key("\\\\?\\UNC\\sunucu\\paylaşım\\f.txt"), "\\\\sunucu\\paylaşım\\f.txt")
+        self.assertEqual(path_key("\\\\?\\unc\\Sunucu\\x"), path_key("\\\\sunucu\\X"))
+
+    def test_unc_path(self):
+        self.assertEqual(path_key("\\\\Sunucu\\Paylaşım\\Klasör\\"), "\\\\sunucu\\paylaşım\\klasör")
+
+    def test_empty(self):
+        self.assertEqual(path_key(""), "")
+
+    def test_idempotent(self):
+        for path in ("C:\\a\\B.txt", "\\\\?\\UNC\\s\\p\\x", "c:/x/../y/"):
+            self.assertEqual(path_key(path_key(path)), path_key(path))
+
+
+class AncestorKeysTest(unittest.TestCase):
+    def test_drive_path(self):
+        self.assertEqual(ancestor_keys("C:\\A\\b\\f.txt"), ["c:", "c:\\a", "c:\\a\\b"])
+
+    def test_unc_path_stops_at_share(self):
+        self.assertEqual(ancestor_keys("\\\\srv\\share\\a\\f.txt"), ["\\\\srv\\share", "\\\\srv\\share\\a"])
+
+    def test_root_file(self):
+        self.assertEqual(ancestor_keys("C:\\f.txt"), ["c:"])
+
+
+class PathInFolderTest(unittest.TestCase):
+    def test_recursive_and_flat(self):
+        self.assertTrue(note_store.path_in_folder("C:\\Proje\\alt\\f.txt", "c:\\proje", True))
+        self.assertFalse(note_store.path_in_folder("C:\\Proje\\alt\\f.txt", "c:\\proje", False))
+        self.assertTrue(note_store.path_in_folder("C:\\Proje\\f.txt", "c:\\proje\\", False))
+
+    def test_prefix_is_not_a_parent(self):
+        self.assertFalse(note_store.path_in_folder("C:\\Proje2\\f.txt", "C:\\Proje", True))
+
+
+if __name__ == '__main__':
+    unittest.main()
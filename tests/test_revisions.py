@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Not geçmişi: kısa ömürlü sürümlerin birleştirilmesi, silinen notun son metni ve paketleme."""
+import unittest
+
+import support
+import note_store
+
+PATH = "C:\\Proje\\not.txt"
+
+
+class RevisionTest(support.StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.conn = self.open_store()
+
+    def history(self, file_path=PATH):
+        return [text for _, _, text in note_store.note_history(file_path)]
+
+    def test_history_is_newest_first(self):
+        note_store.REVISION_MERGE_SECONDS = 0
+        for text in ("v1", "v2\nikinci satır", "v3"):
+            note_store.save_note_texts({PATH: text})
+        self.assertEqual(self.history(), ["v2\nikinci satır", "v1"])
+        self.assertEqual(note_store.get_note(PATH), "v3")
+
+    def test_quick_edits_are_merged(self):
+        for text in ("v1", "v2", "v3"):
+            note_store.save_note_texts({PATH: text})
+        self.assertEqual(self.history(), [])
+
+    def test_last_text_of_deleted_note_is_kept(self):
+        for text in ("v1", "v2", "son metin"):
+            note_store.save_note_texts({PATH: text})
+        note_store.delete_note(PATH)
+        note_store.compact_revisions()
+        self.assertEqual(self.history(), ["son metin"])
+
+    def test_deleted_note_history_survives_recreation(self):
+        note_store.save_note_texts({PATH: "ilk hali"})
+        note_store.delete_notes([PATH])
+        note_store.save_note_texts({PATH: "yeniden"})
+        note_store.compact_revisions()
+        self.assertEqual(self.history(), ["ilk hali"])
+
+    def test_batch_writes_are_packed(self):
+        note_store.REVISION_MERGE_SECONDS = 0
+        paths = [f"C:\\toplu\\{i}.txt" for i in range(20)]
+        note_store.save_notes(paths, "ortak not\n" * 100)
+        note_store.save_notes(paths, "ortak not\n" * 100 + "ek satır\n")
+        note_store.delete_notes(paths[:10])
+        unpacked = self.conn.execute("SELECT count(*) FROM note_revisions WHERE packed = 0").fetchone()[0]
+        self.assertEqual(unpacked, 0)
+        self.assertEqual(self.history(paths[0]), ["ortak not\n" * 100 + "ek satır\n", "ortak not\n" * 100])
+        self.assertEqual(self.history(paths[15]), ["ortak not\n" * 100])
+
+    def test_revision_limit(self):
+        note_store.REVISION_MERGE_SECONDS = 0
+        note_store.REVISION_LIMIT = 3
+        for i in range(6):
+            note_store.save_note_texts({PATH: f"sürüm {i}"})
+        self.assertEqual(self.history(), ["sürüm 4", "sürüm 3", "sürüm 2"])
+
+
+if __name__ == '__main__':
+    unittest.main()